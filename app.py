@@ -15,16 +15,38 @@ Changes from last year:
 @author: MPlantz
 """
 
+import time
+_RUN_STARTED = time.perf_counter()  # for the startup timing report (see "Startup")
+
 import streamlit as st
-import pandas as pd
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import sqlite3
 import threading
 import uuid
 import os
+import csv
+import io
 import json
+import logging
 import re
-import time
+import shutil
+import sys
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import repository as repo
+from formats import SkinsEngine, StrokePlayEngine
+from scoring import (bounds_status, clinch_status, day1_format_bounds,
+                     day1_format_outcomes, hole_difficulty, merge_tallies, replay_all_skins,
+                     replay_group_skins, skins_group_bounds, skins_group_outcomes, tally_score,
+                     team_points_from_skins)
+
+logger = logging.getLogger(__name__)
 
 # Page configuration
 st.set_page_config(
@@ -62,6 +84,47 @@ DAY1_COURSE = {
 # with the correct par/yardage per hole (same format as DAY1_COURSE).
 DAY2_COURSE = DAY1_COURSE
 
+# Field configuration. Everything above is the Cup itself; a spin-off event
+# with a different field can point GCUP_FIELD_CONFIG at a JSON file instead:
+#   {"teams": ["A", "B", "C", "D"], "groups": 8, "day1_holes": 9,
+#    "day2_holes": 18, "day1_point_values": [30, 22, 15, 8],
+#    "reveal_order": ["D", "C", "B", "A"]}
+# Anything left out keeps the Cup's value. Holes are taken from the front of
+# the course dicts, so a 9-hole day plays holes 1-9.
+FIELD_CONFIG_PATH = os.environ.get("GCUP_FIELD_CONFIG", "")
+R1_REVEAL_ORDER = ["Young Guns", "Mids", "OGs"]   # Grand Reveal: Round 1 teams in this order
+
+
+def _load_field_config(path):
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    teams = config.get('teams', TEAMS)
+    if len(teams) < 2 or len(set(teams)) != len(teams):
+        raise ValueError(f"{path}: need at least 2 distinct team names")
+    if sorted(config.get('reveal_order', teams)) != sorted(teams):
+        raise ValueError(f"{path}: reveal_order must list every team exactly once")
+    for key, course in (('day1_holes', DAY1_COURSE), ('day2_holes', DAY2_COURSE)):
+        if not 1 <= config.get(key, 1) <= len(course):
+            raise ValueError(f"{path}: {key} must be between 1 and {len(course)}")
+    return config
+
+
+_field = _load_field_config(FIELD_CONFIG_PATH)
+if _field:
+    TEAMS = list(_field.get('teams', TEAMS))
+    GROUPS = list(range(1, int(_field.get('groups', len(GROUPS))) + 1))
+    HOLES = sorted(DAY1_COURSE)[:int(_field.get('day1_holes', len(HOLES)))]
+    DAY2_HOLES = sorted(DAY2_COURSE)[:int(_field.get('day2_holes', len(DAY2_HOLES)))]
+    DAY1_POINT_VALUES = list(_field.get('day1_point_values', DAY1_POINT_VALUES))
+    R1_REVEAL_ORDER = list(_field.get('reveal_order',
+                                      R1_REVEAL_ORDER if set(R1_REVEAL_ORDER) == set(TEAMS) else TEAMS[::-1]))
+
+# Day 1 roles swap at the turn: the first half of the holes played is the
+# "front", the rest the "back" (front 9 / back 9 for the Cup).
+DAY1_FRONT_HOLES = HOLES[:(len(HOLES) + 1) // 2]
+
 # ---------------------------------------------------------------------------
 # Storage: local SQLite database (replaces Google Sheets)
 # ---------------------------------------------------------------------------
@@ -76,114 +139,378 @@ DAY2_COURSE = DAY1_COURSE
 # used, but a reboot/redeploy of the app wipes it. For a single tournament
 # weekend this is generally fine (don't redeploy mid-event), but use the
 # "Backup & Data" panel in the sidebar to download a copy whenever you want
-# extra peace of mind, and definitely right after the tournament ends.
+# extra peace of mind, and definitely right after the tournament ends. (Or
+# set GCUP_REPLICA_DIR - see "Continuous replication" - to recover on its own.)
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tournament_data.db")
-_db_lock = threading.Lock()  # serializes writes across concurrent users
 
 # Past-year results live as plain JSON files checked into the repo (not the
 # database), so they survive redeploys/reboots forever - see history/README.
 HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")
+# Compact sidecars built from those files (see archive.py) - a cache, safe to delete.
+HISTORY_CACHE_DIR = os.environ.get("GCUP_HISTORY_CACHE_DIR", os.path.join(HISTORY_DIR, ".compact"))
+
+
+# Storage profile applied to every connection. Each value can be overridden
+# with GCUP_SQLITE_<NAME>, e.g. GCUP_SQLITE_CACHE_SIZE=-32000.
+#   cache_size -16000        ~16 MB page cache (negative = KiB)
+#   mmap_size 64 MB          reads come straight from the OS page cache
+#   temp_store MEMORY        sorts / temp b-trees never touch disk
+#   busy_timeout 5000        wait up to 5s for a lock instead of failing
+#   wal_autocheckpoint 10000 pages (~40 MB) - only a backstop; normally the
+#                            background checkpointer below keeps the WAL
+#                            short, so no save ever pays for a checkpoint
+#   journal_size_limit 4 MB  WAL file is trimmed back to this once checkpointed
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',      # lets reads happen alongside writes
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+    'wal_autocheckpoint': 10000,
+    'journal_size_limit': 4 * 1024 * 1024,
+}
+SQLITE_PRAGMAS = {name: os.environ.get(f"GCUP_SQLITE_{name.upper()}", value)
+                  for name, value in SQLITE_PRAGMAS.items()}
+
+
+def _apply_pragmas(conn):
+    for name, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+
+
+# ---------------------------------------------------------------------------
+# Events: several tournaments on one server
+# ---------------------------------------------------------------------------
+# Each event is its own SQLite file - the Cup keeps DB_PATH, any other event
+# is EVENTS_DIR/<event>.db - so events never share rows, locks or a WAL.
+# Everything hanging off a database is keyed by event as well: the shared
+# connection and its lock, per-thread write connections, the verifier /
+# replica / checkpointer state and threads, and every cached result.
+#
+#   GCUP_EVENTS=member-guest streamlit run app.py
+#
+# The Cup plus the events listed there (and any event database already on
+# disk or in the replica) appear in the sidebar's event selector; ?event=<id>
+# in the URL opens one directly. Which event a call works on is
+# current_event(): this tab's selection on the script thread, or whatever
+# event_scope() set on a worker thread. All events share the field
+# configuration above (teams, groups, holes).
+DEFAULT_EVENT = "cup"
+EVENTS_DIR = os.environ.get("GCUP_EVENTS_DIR",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), "events"))
+_EVENT_ID_RE = re.compile(r"[a-z0-9][a-z0-9_-]{0,39}")
+
+
+def event_db_path(event):
+    return DB_PATH if event == DEFAULT_EVENT else os.path.join(EVENTS_DIR, f"{event}.db")
+
+
+def list_events():
+    """Every event this server hosts: the Cup, GCUP_EVENTS, then any found on disk."""
+    events = [DEFAULT_EVENT] + [e.strip() for e in os.environ.get("GCUP_EVENTS", "").split(",")]
+    found = set()
+    if os.path.isdir(EVENTS_DIR):
+        found |= {name[:-3] for name in os.listdir(EVENTS_DIR) if name.endswith(".db")}
+    if REPLICA_DIR and os.path.isdir(os.path.join(REPLICA_DIR, "events")):
+        found |= set(os.listdir(os.path.join(REPLICA_DIR, "events")))
+    events += sorted(found)
+    return [e for i, e in enumerate(events) if _EVENT_ID_RE.fullmatch(e) and e not in events[:i]]
 
 
 @st.cache_resource
+def _event_local():
+    """Per-thread event override set by event_scope() (survives reruns)."""
+    return threading.local()
+
+
+@contextmanager
+def event_scope(event):
+    """Point get_db() and friends at `event` on this thread for the block."""
+    local = _event_local()
+    previous = getattr(local, 'event', None)
+    local.event = event
+    try:
+        yield event
+    finally:
+        local.event = previous
+
+
+def current_event():
+    """The event this call works on (see the Events note above)."""
+    event = getattr(_event_local(), 'event', None)
+    if event:
+        return event
+    if get_script_run_ctx() is not None:
+        return st.session_state.get('event_id', DEFAULT_EVENT)
+    return DEFAULT_EVENT
+
+
+@st.cache_resource
+def _event_registry():
+    """{event: shared connection} for every event opened in this process."""
+    return {}
+
+
+@st.cache_resource
+def _event_lock(event):
+    return threading.Lock()
+
+
+def _db_lock():
+    """Serializes writes on the current event's shared connection (score
+    writes use _write_conn instead)."""
+    return _event_lock(current_event())
+
+
 def get_db():
-    """Create (once, shared across all users) the SQLite connection + schema."""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL")     # lets reads happen alongside writes
-    conn.execute("PRAGMA synchronous=NORMAL")
+    """The current event's SQLite connection, shared across all users."""
+    return _open_event_db(current_event())
+
+
+# Bump whenever _create_schema changes: a database already stamped with this
+# version (PRAGMA user_version) skips the CREATE / ALTER pass on open.
+SCHEMA_VERSION = 1
+
+
+@st.cache_resource
+def _open_event_db(event):
+    """Create (once per event) the SQLite connection + schema.
+
+    If the database file is gone (redeploy) and a replica is configured, it's
+    rebuilt from the replica first - see "Continuous replication" below."""
+    path = event_db_path(event)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _replica_state(event)['restored'] = _restore_from_replica(event)
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=repo.STATEMENT_CACHE_SIZE)
+    _apply_pragmas(conn)
     conn.row_factory = sqlite3.Row
 
-    with _db_lock:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS day1_scores (
-                team TEXT NOT NULL,
-                hole INTEGER NOT NULL,
-                scramble_score INTEGER,
-                alt_shot_score INTEGER,
-                timestamp TEXT,
-                PRIMARY KEY (team, hole)
-            )
-        """)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS day2_scores (
-                group_num INTEGER NOT NULL,
-                hole INTEGER NOT NULL,
-                team TEXT NOT NULL,
-                score INTEGER,
-                golfer TEXT,
-                timestamp TEXT,
-                PRIMARY KEY (group_num, hole, team)
-            )
-        """)
-        # Migration: add golfer to any pre-existing day2_scores table that
-        # lacks it, so each skins score carries the individual who made it
-        # (stamped at save time from the Day 2 group assignment).
-        d2cols = [r['name'] for r in conn.execute("PRAGMA table_info(day2_scores)").fetchall()]
-        if 'golfer' not in d2cols:
-            conn.execute("ALTER TABLE day2_scores ADD COLUMN golfer TEXT")
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS day2_skins (
-                group_num INTEGER NOT NULL,
-                hole INTEGER NOT NULL,
-                winner TEXT,
-                winning_score INTEGER,
-                points_value INTEGER,
-                PRIMARY KEY (group_num, hole)
-            )
-        """)
-        # Team rosters, Round 1 (Scramble/Alt Shot) partnerships, and Round 2
-        # (Skins) group assignments - powers the Team Setup page.
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS roster (
-                team TEXT NOT NULL,
-                golfer TEXT NOT NULL,
-                PRIMARY KEY (team, golfer)
-            )
-        """)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS day1_roles (
-                team TEXT NOT NULL,
-                slot TEXT NOT NULL,
-                golfer TEXT,
-                PRIMARY KEY (team, slot)
-            )
-        """)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS day2_assignments (
-                team TEXT NOT NULL,
-                golfer TEXT NOT NULL,
-                group_num INTEGER,
-                PRIMARY KEY (team, golfer)
-            )
-        """)
-        # Small key-value store for app-wide flags (e.g. the reveal state).
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS meta (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
-
-        # Write-ahead log (this is the "nice to have" from #4). Every save
-        # attempt is recorded here BEFORE it's applied. If the save completes
-        # normally it's immediately marked synced; if something interrupts it
-        # mid-write (e.g. a hiccup on Streamlit Cloud), it's left unsynced and
-        # gets automatically retried the next time anyone loads the app -
-        # so an entry never just silently vanishes.
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS write_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT,
-                action TEXT,
-                payload TEXT,
-                timestamp TEXT,
-                synced INTEGER DEFAULT 0
-            )
-        """)
+    with _event_lock(event):
+        found = conn.execute("PRAGMA user_version").fetchone()[0]
+        if found < SCHEMA_VERSION:
+            _create_schema(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
+    _startup_state(event)['schema'] = "current" if found >= SCHEMA_VERSION else f"upgraded from v{found}"
+    _event_registry()[event] = conn
     return conn
 
 
+def _create_schema(conn):
+    """Create every table / index / view and run the column migrations.
+    All of it is idempotent - an older database is brought up to date."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS day1_scores (
+            team TEXT NOT NULL,
+            hole INTEGER NOT NULL,
+            scramble_score INTEGER,
+            alt_shot_score INTEGER,
+            timestamp TEXT,
+            PRIMARY KEY (team, hole)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS day2_scores (
+            group_num INTEGER NOT NULL,
+            hole INTEGER NOT NULL,
+            team TEXT NOT NULL,
+            score INTEGER,
+            golfer TEXT,
+            timestamp TEXT,
+            PRIMARY KEY (group_num, hole, team)
+        )
+    """)
+    # Migration: add golfer to any pre-existing day2_scores table that
+    # lacks it, so each skins score carries the individual who made it
+    # (stamped at save time from the Day 2 group assignment).
+    d2cols = [r['name'] for r in conn.execute("PRAGMA table_info(day2_scores)").fetchall()]
+    if 'golfer' not in d2cols:
+        conn.execute("ALTER TABLE day2_scores ADD COLUMN golfer TEXT")
+    # Migration: per-row version numbers for compare-and-set score saves
+    # (see repository.cas_upsert) - bumped by one on every write to the row.
+    for table in ('day1_scores', 'day2_scores'):
+        cols = [r['name'] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+        if 'version' not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS day2_skins (
+            group_num INTEGER NOT NULL,
+            hole INTEGER NOT NULL,
+            winner TEXT,
+            winning_score INTEGER,
+            points_value INTEGER,
+            PRIMARY KEY (group_num, hole)
+        )
+    """)
+    # Team rosters, Round 1 (Scramble/Alt Shot) partnerships, and Round 2
+    # (Skins) group assignments - powers the Team Setup page.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS roster (
+            team TEXT NOT NULL,
+            golfer TEXT NOT NULL,
+            PRIMARY KEY (team, golfer)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS day1_roles (
+            team TEXT NOT NULL,
+            slot TEXT NOT NULL,
+            golfer TEXT,
+            PRIMARY KEY (team, slot)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS day2_assignments (
+            team TEXT NOT NULL,
+            golfer TEXT NOT NULL,
+            group_num INTEGER,
+            PRIMARY KEY (team, golfer)
+        )
+    """)
+    # Small key-value store for app-wide flags (e.g. the reveal state).
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+    # Golfer identity: one id per person, every spelling of their name an
+    # alias of it, and one pre-added row per golfer / season / team that
+    # the golfer_careers view sums (see "Golfer careers").
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS golfers (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS golfer_aliases (
+            alias TEXT PRIMARY KEY COLLATE NOCASE,
+            golfer_id INTEGER NOT NULL REFERENCES golfers(id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_golfer_aliases_golfer ON golfer_aliases (golfer_id)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS golfer_seasons (
+            golfer_id INTEGER NOT NULL REFERENCES golfers(id),
+            year INTEGER NOT NULL,
+            team TEXT NOT NULL,
+            skins INTEGER NOT NULL DEFAULT 0,
+            team_points REAL,
+            champion INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (golfer_id, year, team)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_golfer_seasons_year ON golfer_seasons (year)")
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS golfer_careers AS
+        SELECT g.id AS golfer_id, g.name, COUNT(DISTINCT s.year) AS seasons,
+               SUM(s.skins) AS skins, SUM(s.team_points) AS team_points,
+               SUM(s.champion) AS titles, MIN(s.year) AS first_year, MAX(s.year) AS last_year,
+               GROUP_CONCAT(DISTINCT s.team) AS teams
+        FROM golfers g JOIN golfer_seasons s ON s.golfer_id = g.id
+        GROUP BY g.id
+    """)
+
+    # Write-ahead log (this is the "nice to have" from #4). Every save
+    # attempt is recorded here BEFORE it's applied. If the save completes
+    # normally it's immediately marked synced; if something interrupts it
+    # mid-write (e.g. a hiccup on Streamlit Cloud), it's left unsynced and
+    # gets automatically retried the next time anyone loads the app -
+    # so an entry never just silently vanishes.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS write_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT,
+            action TEXT,
+            payload TEXT,
+            timestamp TEXT,
+            synced INTEGER DEFAULT 0
+        )
+    """)
+    # Migration: idempotency key per save, so a double-tapped or
+    # resubmitted save is recognised and skipped (see _write_logged).
+    wlcols = [r['name'] for r in conn.execute("PRAGMA table_info(write_log)").fetchall()]
+    if 'idem_key' not in wlcols:
+        conn.execute("ALTER TABLE write_log ADD COLUMN idem_key TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_write_log_idem_key ON write_log (idem_key)")
+
+
+# ---------------------------------------------------------------------------
+# Background WAL checkpointing
+# ---------------------------------------------------------------------------
+# In WAL mode every commit appends to tournament_data.db-wal, and something
+# has to copy those pages back into the main file. Left to SQLite, that's
+# whichever request happens to push the WAL past wal_autocheckpoint - i.e. a
+# random scorer's Save stalls. Instead this thread watches for writes and
+# checkpoints once they pause: PASSIVE (never blocks anyone) after a short
+# lull, and TRUNCATE (resets the WAL file to zero bytes) after a long quiet
+# spell, i.e. once a round or the whole event is over.
+CHECKPOINT_POLL_SECONDS = float(os.environ.get("GCUP_CHECKPOINT_POLL", "2"))
+CHECKPOINT_IDLE_SECONDS = float(os.environ.get("GCUP_CHECKPOINT_IDLE", "10"))
+CHECKPOINT_TRUNCATE_IDLE_SECONDS = float(os.environ.get("GCUP_CHECKPOINT_TRUNCATE_IDLE", "1800"))
+
+
+@st.cache_resource
+def _checkpointer_state(event):
+    """Shared record of an event's most recent checkpoint (see scripts/bench_storage.py)."""
+    return {'last': None, 'count': 0, 'error': None}
+
+
+def checkpoint_wal(mode="PASSIVE", conn=None):
+    """Run one WAL checkpoint on the current event now.
+    Returns {mode, busy, wal_pages, checkpointed, seconds}."""
+    conn = conn or _write_conn()
+    started = time.perf_counter()
+    busy, wal_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    result = {'mode': mode, 'busy': busy, 'wal_pages': wal_pages, 'checkpointed': checkpointed,
+              'seconds': round(time.perf_counter() - started, 4),
+              'at': datetime.now().isoformat(timespec='seconds')}
+    state = _checkpointer_state(current_event())
+    state['last'] = result
+    state['count'] += 1
+    return result
+
+
+def _checkpointer_loop(event):
+    with event_scope(event):
+        _checkpoint_forever(event)
+
+
+def _checkpoint_forever(event):
+    conn = _write_conn()
+    seen_version, last_write = None, time.monotonic()
+    dirty, truncated = False, True
+    while True:
+        time.sleep(CHECKPOINT_POLL_SECONDS)
+        try:
+            # data_version changes whenever another connection commits.
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            now = time.monotonic()
+            if version != seen_version:
+                seen_version, last_write, dirty, truncated = version, now, True, False
+                continue
+            idle = now - last_write
+            if dirty and idle >= CHECKPOINT_IDLE_SECONDS:
+                checkpoint_wal("PASSIVE", conn)
+                dirty = False
+            elif not truncated and idle >= CHECKPOINT_TRUNCATE_IDLE_SECONDS:
+                checkpoint_wal("TRUNCATE", conn)
+                truncated = True
+            _checkpointer_state(event)['error'] = None
+        except Exception as e:
+            _checkpointer_state(event)['error'] = str(e)  # e.g. busy - try again next tick
+
+
+@st.cache_resource
+def start_checkpointer(event):
+    """Start an event's background checkpointer once per process."""
+    threading.Thread(target=_checkpointer_loop, args=(event,), name=f"wal-checkpointer-{event}",
+                     daemon=True).start()
+    return True
+
+
 def get_session_id():
     """Stable id per browser tab, used to tag write-log entries by session."""
     if 'session_id' not in st.session_state:
@@ -191,231 +518,455 @@ def get_session_id():
     return st.session_state.session_id
 
 
-def _log_write(action, payload):
-    """Record a pending write before attempting it. Returns the log row id."""
-    conn = get_db()
+def _log_write(action, payload, session_id=None, conn=None, idem_key=None):
+    """Record a pending write before attempting it. Returns the log row id.
+
+    Pass session_id when calling off the script thread (no session state
+    there), and conn to log on a per-thread write connection instead of the
+    shared one. With an idem_key that's already logged nothing is inserted
+    and None is returned."""
     ts = datetime.now().isoformat()
-    with _db_lock:
-        cur = conn.execute(
-            "INSERT INTO write_log (session_id, action, payload, timestamp, synced) VALUES (?, ?, ?, ?, 0)",
-            (get_session_id(), action, json.dumps(payload), ts)
-        )
+    args = (session_id or get_session_id(), action, json.dumps(payload), ts, idem_key)
+    if conn is not None:
+        return repo.log_write(conn, *args)
+    conn = get_db()
+    with _db_lock():
+        log_id = repo.log_write(conn, *args)
         conn.commit()
-        return cur.lastrowid
+        return log_id
 
 
-def _mark_synced(log_id):
-    conn = get_db()
-    with _db_lock:
-        conn.execute("UPDATE write_log SET synced = 1 WHERE id = ?", (log_id,))
-        conn.commit()
+# write_log.synced values
+LOG_PENDING, LOG_SYNCED, LOG_REJECTED = 0, 1, -1   # rejected = lost a compare-and-set
 
 
-def _apply_day1_score(team, hole, scramble_score, alt_shot_score, timestamp):
+def _mark_synced(log_id, conn=None, status=LOG_SYNCED):
+    if conn is not None:
+        repo.mark_synced(conn, log_id, status)
+        return
     conn = get_db()
-    with _db_lock:
-        conn.execute("""
-            INSERT INTO day1_scores (team, hole, scramble_score, alt_shot_score, timestamp)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(team, hole) DO UPDATE SET
-                scramble_score = excluded.scramble_score,
-                alt_shot_score = excluded.alt_shot_score,
-                timestamp = excluded.timestamp
-        """, (team, hole, scramble_score, alt_shot_score, timestamp))
+    with _db_lock():
+        repo.mark_synced(conn, log_id, status)
         conn.commit()
 
 
-def _apply_day2_score(group, hole, team, score, timestamp, golfer=None):
-    conn = get_db()
-    with _db_lock:
-        conn.execute("""
-            INSERT INTO day2_scores (group_num, hole, team, score, golfer, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(group_num, hole, team) DO UPDATE SET
-                score = excluded.score,
-                golfer = excluded.golfer,
-                timestamp = excluded.timestamp
-        """, (group, hole, team, score, golfer, timestamp))
-        conn.commit()
+# ---------------------------------------------------------------------------
+# Score writes: per-row versions + compare-and-set
+# ---------------------------------------------------------------------------
+# Every day1_scores / day2_scores row carries a version number that goes up
+# by one on each write. A scorer's save says "I'm replacing version N"; if
+# another phone got there first the save is rejected and both values are
+# shown to the second scorer instead of silently overwriting. Because
+# correctness comes from the version check, score writes don't need the
+# app-wide _db_lock: each worker thread has its own connection and a short
+# BEGIN IMMEDIATE transaction, and SQLite itself orders the commits.
+@st.cache_resource
+def _thread_local():
+    """Per-thread slots that survive reruns (this script re-executes each run)."""
+    return threading.local()
+
+
+class SaveConflict(Exception):
+    """A score changed since it was loaded, so the compare-and-set save was refused.
+
+    `conflicts` is a list of {'key', 'mine', 'theirs', 'version'} - one per row,
+    where `version` is the stored row's current version."""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(f"{len(conflicts)} score(s) were changed by someone else")
+
+
+def _write_conn():
+    """This thread's own connection for score writes to the current event
+    (created on first use)."""
+    event = current_event()
+    local = _thread_local()
+    if not hasattr(local, 'conns'):
+        local.conns = {}
+    conn = local.conns.get(event)
+    if conn is None:
+        get_db()  # make sure the schema exists
+        conn = sqlite3.connect(event_db_path(event), timeout=10, isolation_level=None,
+                               check_same_thread=False, cached_statements=repo.STATEMENT_CACHE_SIZE)
+        _apply_pragmas(conn)
+        conn.row_factory = sqlite3.Row
+        local.conns[event] = conn
+    return conn
 
 
-def _apply_skin_result(group, hole, winner, winning_score, points_value):
-    conn = get_db()
-    with _db_lock:
-        if winner:
-            conn.execute("""
-                INSERT INTO day2_skins (group_num, hole, winner, winning_score, points_value)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(group_num, hole) DO UPDATE SET
-                    winner = excluded.winner,
-                    winning_score = excluded.winning_score,
-                    points_value = excluded.points_value
-            """, (group, hole, winner, winning_score, points_value))
-        else:
-            conn.execute("DELETE FROM day2_skins WHERE group_num = ? AND hole = ?", (group, hole))
-        conn.commit()
+@contextmanager
+def _transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT on a write connection (ROLLBACK on error)."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _apply_day1_score(team, hole, scramble_score, alt_shot_score, timestamp,
+                      expected_version=None, conn=None):
+    """Write one Day 1 row inside the caller's transaction. Returns a conflict or None."""
+    return repo.cas_upsert(
+        conn, 'day1_scores', {'team': team, 'hole': hole},
+        {'scramble_score': scramble_score, 'alt_shot_score': alt_shot_score, 'timestamp': timestamp},
+        ('scramble_score', 'alt_shot_score'), expected_version)
+
+
+def _apply_day2_score(group, hole, team, score, timestamp, golfer=None,
+                      expected_version=None, conn=None):
+    """Write one Day 2 row inside the caller's transaction. Returns a conflict or None."""
+    return repo.cas_upsert(
+        conn, 'day2_scores', {'group_num': group, 'hole': hole, 'team': team},
+        {'score': score, 'golfer': golfer, 'timestamp': timestamp},
+        ('score',), expected_version)
+
+
+_APPLIERS = {'day1_score': _apply_day1_score, 'day2_score': _apply_day2_score}
+
+
+def _conflict_entry(action, payload, conflict):
+    if action == 'day1_score':
+        key = f"{payload['team']}_{payload['hole']}"
+        mine = {'scramble': payload['scramble_score'], 'alt_shot': payload['alt_shot_score']}
+        theirs = {'scramble': conflict['theirs']['scramble_score'],
+                  'alt_shot': conflict['theirs']['alt_shot_score']}
+    else:
+        key = f"{payload['group']}_{payload['hole']}_{payload['team']}"
+        mine, theirs = {'score': payload['score']}, {'score': conflict['theirs']['score']}
+    return {'action': action, 'key': key, 'payload': payload, 'mine': mine,
+            'theirs': theirs, 'version': conflict['version']}
+
+
+def _write_logged(action, payloads, session_id, idem_key=None, derive=None):
+    """Write-log then compare-and-set a batch of score rows as one unit.
+
+    Either every row lands (log entries marked synced) or, if any row lost
+    its compare-and-set, none do (entries marked rejected) and SaveConflict
+    is raised. Runs on this thread's own connection - no app-wide lock.
+
+    derive(conn), if given, rewrites data derived from the new rows (stored
+    skins) in the same transaction, which also moves data_version() - so
+    the scores, their skins and the version all commit together.
+
+    idem_key identifies the save (see _save_token): if it's already in the
+    write log this is a repeat of a save we've seen, so nothing is written
+    and None is returned. Otherwise returns the connection used."""
+    conn = _write_conn()
+    log_ids = [_log_write(action, p, session_id, conn=conn,
+                          idem_key=f"{idem_key}/{i}" if idem_key else None)
+               for i, p in enumerate(payloads)]
+    if idem_key and all(log_id is None for log_id in log_ids):
+        return None
+    log_ids = [log_id for log_id in log_ids if log_id is not None]
+    conflicts = []
+    try:
+        with _transaction(conn):
+            for payload in payloads:
+                conflict = _APPLIERS[action](**payload, conn=conn)
+                if conflict:
+                    conflicts.append(_conflict_entry(action, payload, conflict))
+            if conflicts:
+                raise SaveConflict(conflicts)
+            if derive is not None:
+                derive(conn)
+            repo.bump_data_version(conn)
+            for log_id in log_ids:
+                _mark_synced(log_id, conn=conn)
+        _replica_state(current_event())['wakeup'].set()
+        try:
+            _update_hole_tally(conn, action, payloads)
+        except Exception:
+            pass  # the tally dropped itself and is rebuilt on the next read
+    except SaveConflict:
+        with _transaction(conn):
+            for log_id in log_ids:
+                _mark_synced(log_id, conn=conn, status=LOG_REJECTED)
+        raise
+    return conn
+
+
+# Saves run in the background (see queue_day1_save), so a just-logged entry
+# may still be mid-flight. Only entries older than this are treated as
+# interrupted, so a replay can never land on top of a newer save.
+FLUSH_GRACE_SECONDS = 30
 
 
 def flush_pending_writes():
     """Retry any writes that were logged but never confirmed - run at startup."""
     conn = get_db()
-    with _db_lock:
-        pending = conn.execute("SELECT * FROM write_log WHERE synced = 0 ORDER BY id").fetchall()
+    cutoff = datetime.fromtimestamp(time.time() - FLUSH_GRACE_SECONDS).isoformat()
+    with _db_lock():
+        pending = repo.get_log_entries(conn, LOG_PENDING, before_timestamp=cutoff)
+    replayed_day2 = False
+    wconn = _write_conn() if pending else None
     for row in pending:
         try:
             payload = json.loads(row['payload'])
-            if row['action'] == 'day1_score':
-                _apply_day1_score(**payload)
-            elif row['action'] == 'day2_score':
-                _apply_day2_score(**payload)
-            _mark_synced(row['id'])
+            with _transaction(wconn):
+                # Replays still honour the version check, so an old
+                # interrupted save can't clobber a newer one.
+                conflict = _APPLIERS[row['action']](**payload, conn=wconn)
+                if not conflict:
+                    repo.bump_data_version(wconn)
+                _mark_synced(row['id'], conn=wconn, status=LOG_REJECTED if conflict else LOG_SYNCED)
+            if row['action'] == 'day2_score' and not conflict:
+                replayed_day2 = True
         except Exception:
             pass  # still unsynced - will retry again on the next load
 
+    # Replayed Day 2 scores never went through the skins recalculation, so
+    # bring the stored skins back in line now rather than on every read.
+    if pending:
+        reset_hole_tally()
+    if replayed_day2:
+        reset_skins_engine()
+        verify_skins()
+
 
 # ---------------------------------------------------------------------------
-# Save functions (public API used by the pages below)
+# Background (optimistic) saves
 # ---------------------------------------------------------------------------
-def save_day1_score(team, hole, scramble_score, alt_shot_score):
-    """Save Day 1 scores"""
-    timestamp = datetime.now().isoformat()
-    payload = {'team': team, 'hole': hole, 'scramble_score': scramble_score,
-               'alt_shot_score': alt_shot_score, 'timestamp': timestamp}
-    log_id = _log_write('day1_score', payload)
-    try:
-        _apply_day1_score(**payload)
-        _mark_synced(log_id)
-
-        # Update local cache for UI responsiveness
-        if 'day1_scores' not in st.session_state:
-            st.session_state.day1_scores = {}
-        score_id = f"{team}_{hole}"
-        st.session_state.day1_scores[score_id] = {
-            'team': team, 'hole': hole,
-            'scramble': scramble_score, 'alt_shot': alt_shot_score,
-            'timestamp': timestamp
-        }
-    except Exception as e:
-        st.error(f"Error saving score, will retry automatically: {e}")
-
-
-def save_day2_score(group, hole, team, score):
-    """Save Day 2 (skins) scores, stamping the individual golfer from the
-    team's group assignment so per-golfer stats survive later reassignments."""
-    timestamp = datetime.now().isoformat()
-    golfer = get_golfer_for_team_group(team, group)  # may be None if unassigned
-    payload = {'group': group, 'hole': hole, 'team': team, 'score': score,
-               'timestamp': timestamp, 'golfer': golfer}
-    log_id = _log_write('day2_score', payload)
-    try:
-        _apply_day2_score(**payload)
-        _mark_synced(log_id)
-
-        # Update local cache for UI responsiveness
-        if 'day2_scores' not in st.session_state:
-            st.session_state.day2_scores = {}
-        score_id = f"{group}_{hole}_{team}"
-        st.session_state.day2_scores[score_id] = {
-            'group': group, 'hole': hole, 'team': team, 'score': score,
-            'golfer': golfer, 'timestamp': timestamp
-        }
-    except Exception as e:
-        st.error(f"Error saving score, will retry automatically: {e}")
-
-    # Calculate skins for this hole and recalculate subsequent holes if needed
-    recalculate_group_skins_from_hole(group, hole)
+# The scoring pages don't wait on the database. Save Scores updates this tab's
+# cached scores straight away, hands the write to a small worker pool, and
+# reruns immediately - no request thread ever sleeps. A polling fragment then
+# confirms each save with a toast, or shows an error and drops the optimistic
+# values if it failed. (A save that merely failed is still in the write log,
+# so it keeps getting retried like before; one that lost a compare-and-set is
+# shown to the scorer as a conflict instead.) Every save carries an
+# idempotency token (_save_token), so double-taps and resubmits are dropped
+# here and again in the write log before any table write or skins replay.
+@st.cache_resource
+def _save_executor():
+    """Shared worker pool that applies score writes off the request threads."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="score-save")
 
 
-def save_skin_result(group, hole, winner, winning_score, points_value):
-    """Save skin calculation results. Skins are derived from scores, so these
-    aren't write-logged individually - they get rebuilt from day2_scores
-    automatically on load if anything is ever out of sync."""
-    try:
-        _apply_skin_result(group, hole, winner, winning_score, points_value)
-    except Exception as e:
-        st.error(f"Error saving skin result: {e}")
+def _persist_scores(event, action, payloads, session_id, idem_key, group=None):
+    def derive(conn):
+        if group is not None:
+            _update_stored_skins(conn, [(p['group'], p['hole'], p['team']) for p in payloads])
 
+    with event_scope(event):
+        try:
+            _write_logged(action, payloads, session_id, idem_key=idem_key, derive=derive)
+        except SaveConflict:
+            raise  # refused before anything was derived
+        except BaseException:
+            if group is not None:
+                reset_skins_engine()  # it may have seen rows that were rolled back
+            raise
 
-def recalculate_group_skins_from_hole(group, start_hole):
-    """Recalculate all skins for a group starting from a specific hole"""
-    # Clear existing team points for this group to recalculate
-    if 'team_day2_points' not in st.session_state:
-        st.session_state.team_day2_points = {team: 0 for team in TEAMS}
 
-    # Remove points from this group and recalculate from scratch
-    for hole in DAY2_HOLES:
-        skin_key = f"{group}_{hole}"
-        if skin_key in st.session_state.get('day2_skins', {}):
-            old_skin = st.session_state.day2_skins[skin_key]
-            if old_skin.get('winner') and not old_skin.get('tied'):
-                # Remove old points
-                old_points = old_skin.get('points_value', 1)
-                st.session_state.team_day2_points[old_skin['winner']] -= old_points
-
-    # Clear existing skins for this group
-    for hole in DAY2_HOLES:
-        skin_key = f"{group}_{hole}"
-        if skin_key in st.session_state.get('day2_skins', {}):
-            del st.session_state.day2_skins[skin_key]
+def _save_token(form_key, values):
+    """Idempotency key for a save from one scoring form.
 
-    # Now recalculate all skins for this group in hole order
-    if 'day2_skins' not in st.session_state:
-        st.session_state.day2_skins = {}
+    Minted in this browser session and kept for as long as the form's values
+    stay the same, so a double-tap, a rerun that resubmits, or pressing Save
+    again on an unchanged form all carry the same key and are only applied
+    once. Editing the values (or resolving a conflict) mints a new one."""
+    tokens = st.session_state.setdefault('save_tokens', {})
+    values = json.dumps(values, sort_keys=True, default=str)
+    if form_key not in tokens or tokens[form_key][0] != values:
+        tokens[form_key] = (values, uuid.uuid4().hex)
+    return tokens[form_key][1]
 
-    for hole in DAY2_HOLES:
-        # Get all scores for this hole in this group
-        hole_scores = {}
-        for team in TEAMS:
-            key = f"{group}_{hole}_{team}"
-            if key in st.session_state.get('day2_scores', {}):
-                score = st.session_state.day2_scores[key]['score']
-                if score and score > 0:  # Valid score
-                    hole_scores[team] = score
 
-        # Need at least 2 scores to determine winner
-        if len(hole_scores) < 2:
-            continue
+def queue_day1_save(team, hole, scramble_score, alt_shot_score, expected_version=None):
+    """Optimistically save Day 1 scores: local cache now, database in the background.
 
-        # Determine winner (lowest score wins)
-        min_score = min(hole_scores.values())
-        winners = [team for team, score in hole_scores.items() if score == min_score]
+    Returns False if this exact save was already submitted (double-tap)."""
+    timestamp = datetime.now().isoformat()
+    payload = {'team': team, 'hole': hole, 'scramble_score': scramble_score,
+               'alt_shot_score': alt_shot_score, 'timestamp': timestamp,
+               'expected_version': expected_version}
+    token = _save_token(f"day1_{team}_{hole}", [scramble_score, alt_shot_score])
+    return _submit_save('day1_score', [payload], f"{team} - Hole {hole}", token)
 
-        # Calculate points value based on carryover from previous holes in this group
-        points_value = calculate_hole_points_value(group, hole)
 
-        skin_key = f"{group}_{hole}"
+def queue_day2_saves(group, hole, scores, expected_versions=None):
+    """Optimistically save one hole's skins scores ({team: score}) for a group.
 
-        if len(winners) == 1:  # Clear winner
-            winner = winners[0]
-            skin_result = {
-                'group': group, 'hole': hole, 'winner': winner,
-                'score': min_score, 'tied': False, 'points_value': points_value
-            }
-            st.session_state.day2_skins[skin_key] = skin_result
-            save_skin_result(group, hole, winner, min_score, points_value)
+    expected_versions: {team: version the scorer was looking at}. Returns
+    False if this exact save was already submitted (double-tap)."""
+    timestamp = datetime.now().isoformat()
+    expected_versions = expected_versions or {}
+    lineup = group_lineups().get(group, {})
+    payloads = []
+    for team, score in scores.items():
+        golfer = lineup.get(team)  # may be None if unassigned
+        payloads.append({'group': group, 'hole': hole, 'team': team, 'score': score,
+                         'timestamp': timestamp, 'golfer': golfer,
+                         'expected_version': expected_versions.get(team)})
+    token = _save_token(f"day2_{group}_{hole}", scores)
+    return _submit_save('day2_score', payloads, f"Group {group} - Hole {hole}", token, group=group)
+
+
+def _submit_save(action, payloads, label, token, group=None):
+    """Hand a save to the worker pool. Returns False (and does nothing) if
+    this token was already submitted from this tab."""
+    submitted = st.session_state.setdefault('submitted_tokens', set())
+    if token in submitted:
+        return False
+    submitted.add(token)
+    day1, day2 = {}, {}
+    for p in payloads:
+        version = (p['expected_version'] or 0) + 1
+        if action == 'day1_score':
+            day1[f"{p['team']}_{p['hole']}"] = {
+                'team': p['team'], 'hole': p['hole'], 'scramble': p['scramble_score'],
+                'alt_shot': p['alt_shot_score'], 'timestamp': p['timestamp'], 'version': version}
+        else:
+            day2[f"{p['group']}_{p['hole']}_{p['team']}"] = {
+                'group': p['group'], 'hole': p['hole'], 'team': p['team'], 'score': p['score'],
+                'golfer': p['golfer'], 'timestamp': p['timestamp'], 'version': version}
+    event = current_event()
+    future = _save_executor().submit(_persist_scores, event, action, payloads, get_session_id(),
+                                     token, group)
+    st.session_state.setdefault('pending_saves', []).append(
+        {'future': future, 'label': label, 'action': action, 'payloads': payloads,
+         'day1': day1, 'day2': day2, 'group': group, 'event': event})
+    _overlay_pending_saves(_own_live_data())
+    return True
+
+
+def _overlay_pending_saves(data):
+    """Lay this tab's not-yet-confirmed saves over freshly loaded data, so a
+    rerun that beats the background write doesn't flash the old scores."""
+    event = current_event()
+    pending = [p for p in st.session_state.get('pending_saves', [])
+               if not p['future'].done() and p['event'] == event]
+    if not pending:
+        return
+    day1 = data.setdefault('day1_scores', {})
+    day2 = data.setdefault('day2_scores', {})
+    skins = data.setdefault('day2_skins', {})
+    groups = set()
+    for p in pending:
+        day1.update(p['day1'])
+        day2.update(p['day2'])
+        if p['group'] is not None:
+            groups.add(p['group'])
+    for group in groups:
+        for key in [k for k, s in skins.items() if s['group'] == group]:
+            del skins[key]
+        skins.update(replay_group_skins(group, day2, TEAMS, DAY2_HOLES))
+    data['team_day2_points'] = team_points_from_skins(skins, TEAMS)
+
+
+@st.fragment(run_every=1)
+def _pending_save_status():
+    """Polls this tab's background saves: toast on success, error (and
+    fall back to what's actually stored) on failure."""
+    pending = st.session_state.get('pending_saves', [])
+    still_running, settled_badly = [], False
+    for p in pending:
+        if not p['future'].done():
+            still_running.append(p)
+            continue
+        error = p['future'].exception()
+        # Not isinstance(): app.py is re-executed every run, so the class that
+        # raised may be an older SaveConflict than the one in scope now.
+        if getattr(error, 'conflicts', None):
+            settled_badly = True
+            st.session_state.setdefault('save_conflicts', []).append(
+                {'label': p['label'], 'action': p['action'], 'payloads': p['payloads'],
+                 'group': p['group'], 'conflicts': error.conflicts})
+        elif error is not None:
+            settled_badly = True
+            st.session_state.setdefault('failed_saves', []).append(
+                f"Couldn't save {p['label']} ({error}). It will be retried "
+                "automatically - check the scorecard before re-entering.")
+        else:
+            st.toast(f"✅ Saved {p['label']}")
+    st.session_state.pending_saves = still_running
+    if still_running:
+        st.caption(f"⏳ Saving {', '.join(p['label'] for p in still_running)}…")
+    if settled_badly:
+        st.rerun()  # full rerun so the page shows what's really stored
+
+
+def _seen_version(widget_key, current):
+    """Version of a score row as it stood when its input was first shown.
+
+    Inputs keep whatever the scorer typed across reruns, so this - not the
+    version loaded on the rerun that handles Save - is what a save replaces."""
+    seen = st.session_state.setdefault('seen_versions', {})
+    if widget_key not in st.session_state or widget_key not in seen:
+        seen[widget_key] = current
+    return seen[widget_key]
+
+
+def _reset_score_inputs(action, payloads):
+    """Forget typed values + seen versions so inputs reload from the database."""
+    for p in payloads:
+        if action == 'day1_score':
+            keys = [f"scramble_{p['team']}_{p['hole']}", f"alt_shot_{p['team']}_{p['hole']}"]
+            st.session_state.get('save_tokens', {}).pop(f"day1_{p['team']}_{p['hole']}", None)
+        else:
+            keys = [f"score_{p['group']}_{p['hole']}_{p['team']}"]
+            st.session_state.get('save_tokens', {}).pop(f"day2_{p['group']}_{p['hole']}", None)
+        for k in keys:
+            st.session_state.pop(k, None)
+            st.session_state.get('seen_versions', {}).pop(k, None)
+
+
+def _describe_score(action, key, values):
+    if action == 'day1_score':
+        return f"scramble {values['scramble']} / alt shot {values['alt_shot']}"
+    return f"{key.split('_', 2)[2]} {values['score']}"
+
+
+def _render_save_conflicts():
+    """Both values side by side for every save that lost a compare-and-set."""
+    conflicts = st.session_state.get('save_conflicts', [])
+    for i, c in enumerate(list(conflicts)):
+        theirs = ", ".join(_describe_score(c['action'], x['key'], x['theirs']) for x in c['conflicts'])
+        mine = ", ".join(_describe_score(c['action'], x['key'], x['mine']) for x in c['conflicts'])
+        st.warning(f"⚠️ **{c['label']}** was just saved from another phone as **{theirs}**, "
+                   f"but you entered **{mine}**. Which is right?")
+        col_mine, col_theirs = st.columns(2)
+        if col_mine.button("Keep mine", key=f"conflict_mine_{i}", use_container_width=True):
+            latest = {x['key']: x['version'] for x in c['conflicts']}
+            payloads = []
+            for p in c['payloads']:
+                key = (f"{p['team']}_{p['hole']}" if c['action'] == 'day1_score'
+                       else f"{p['group']}_{p['hole']}_{p['team']}")
+                payloads.append(dict(p, timestamp=datetime.now().isoformat(),
+                                     expected_version=latest.get(key, p['expected_version'])))
+            conflicts.remove(c)
+            _submit_save(c['action'], payloads, c['label'], uuid.uuid4().hex, group=c['group'])
+            _reset_score_inputs(c['action'], payloads)
+            st.rerun()
+        if col_theirs.button("Use theirs", key=f"conflict_theirs_{i}", use_container_width=True):
+            conflicts.remove(c)
+            _reset_score_inputs(c['action'], c['payloads'])
+            st.rerun()
 
-            # Award points to the winning team
-            st.session_state.team_day2_points[winner] += points_value
 
-        else:  # Tie - skin carries over
-            skin_result = {
-                'group': group, 'hole': hole, 'winner': None,
-                'score': min_score, 'tied': True, 'points_value': points_value
-            }
-            st.session_state.day2_skins[skin_key] = skin_result
-            # Ties aren't persisted - only wins are stored
-            save_skin_result(group, hole, None, None, None)
+def show_save_status():
+    """Call near the top of a scoring page: reports failed / conflicting saves
+    and starts the confirmation poller while any save is in flight."""
+    for message in st.session_state.pop('failed_saves', []):
+        st.error(message)
+    _render_save_conflicts()
+    if st.session_state.get('pending_saves'):
+        _pending_save_status()
 
 
 def calculate_hole_points_value(group, hole):
     """Calculate points value for a hole based on carryover from previous ties"""
     points_value = 1  # Base value for current hole
+    data = live_data()
 
     # Look backwards from current hole to count consecutive ties
     for prev_hole in range(hole - 1, 0, -1):  # Go backwards from hole-1 to 1
         prev_skin_key = f"{group}_{prev_hole}"
-        if prev_skin_key in st.session_state.get('day2_skins', {}):
-            prev_skin = st.session_state.day2_skins[prev_skin_key]
+        if prev_skin_key in data['day2_skins']:
+            prev_skin = data['day2_skins'][prev_skin_key]
             if prev_skin.get('tied', False):
                 points_value += 1  # Add 1 for each consecutive tie
             else:
@@ -425,8 +976,8 @@ def calculate_hole_points_value(group, hole):
             has_scores = False
             for team in TEAMS:
                 score_key = f"{group}_{prev_hole}_{team}"
-                if score_key in st.session_state.get('day2_scores', {}):
-                    score = st.session_state.day2_scores[score_key].get('score')
+                if score_key in data['day2_scores']:
+                    score = data['day2_scores'][score_key].get('score')
                     if score and score > 0:
                         has_scores = True
                         break
@@ -439,71 +990,630 @@ def calculate_hole_points_value(group, hole):
     return points_value
 
 
+def _read_live_data(conn):
+    """Read the live tournament state straight from SQLite - no side effects.
+
+    Won skins come from the stored day2_skins rows. Ties aren't persisted, so
+    the tie/carryover markers are filled in from an in-memory replay of
+    day2_scores (pure and cheap - nothing is written). Keeping stored rows
+    in step with the scores is the skins verifier's job, not the reader's.
+    """
+    day1_scores = {}
+    for row in repo.get_day1_rows(conn):
+        key = f"{row['team']}_{row['hole']}"
+        day1_scores[key] = {
+            'team': row['team'], 'hole': row['hole'],
+            'scramble': row['scramble_score'], 'alt_shot': row['alt_shot_score'],
+            'timestamp': row['timestamp'], 'version': row['version']
+        }
+
+    day2_scores = {}
+    for row in repo.get_day2_rows(conn):
+        key = f"{row['group_num']}_{row['hole']}_{row['team']}"
+        day2_scores[key] = {
+            'group': row['group_num'], 'hole': row['hole'], 'team': row['team'],
+            'score': row['score'], 'golfer': row['golfer'], 'timestamp': row['timestamp'],
+            'version': row['version']
+        }
+
+    day2_skins = {}
+    for row in repo.get_won_skin_rows(conn):
+        key = f"{row['group_num']}_{row['hole']}"
+        day2_skins[key] = {
+            'group': row['group_num'], 'hole': row['hole'], 'winner': row['winner'],
+            'score': row['winning_score'], 'tied': False, 'points_value': row['points_value']
+        }
+    for key, skin in replay_all_skins(day2_scores, TEAMS, GROUPS, DAY2_HOLES).items():
+        if skin['tied'] and key not in day2_skins:
+            day2_skins[key] = skin
+
+    return {
+        'day1_scores': day1_scores,
+        'day2_scores': day2_scores,
+        'day2_skins': day2_skins,
+        'team_day2_points': team_points_from_skins(day2_skins, TEAMS),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Per-tab live data (shared snapshots + idle eviction)
+# ---------------------------------------------------------------------------
+# Every tab used to hold its own full copy of the scores and skins in
+# st.session_state. Now there's one read-only snapshot per event + data
+# version, shared by every tab; a tab's session state only holds a small
+# "slot" pointing at it. A tab copies the dicts (copy-on-write) only when
+# it lays its own unconfirmed saves over them, and goes back to the shared
+# snapshot on its next load. Slots of tabs idle for SESSION_IDLE_SECONDS
+# drop their data - and so any old snapshot they were the last to hold -
+# and reload it if the tab comes back. Slots of tabs Streamlit has closed
+# are dropped on the same sweep, even with idle eviction off.
+SESSION_IDLE_SECONDS = int(os.environ.get("GCUP_SESSION_IDLE_SECONDS", "1800"))  # 0 = never evict
+SESSION_SWEEP_SECONDS = 60
+_LIVE_KEYS = ('day1_scores', 'day2_scores', 'day2_skins', 'team_day2_points')
+
+
+@st.cache_resource(max_entries=8)
+def _shared_live_data(event, version):
+    """One event's live data at one version - shared by every tab, never mutated."""
+    with event_scope(event):
+        return _read_live_data(get_db())
+
+
+@st.cache_resource
+def _session_registry():
+    """Every tab's slot, by session id (process-wide, for eviction + the memory report)."""
+    return {'lock': threading.Lock(), 'slots': {}, 'swept_at': 0.0, 'evicted': 0, 'closed': 0}
+
+
+def _session_slot():
+    """This tab's slot: {'data', 'owned', 'event', 'last_seen', 'runtime_session'}.
+    data is None until loaded (or after eviction); owned means it's a private
+    copy; runtime_session is Streamlit's id for the tab (None in bare mode)."""
+    slot = st.session_state.get('live_slot')
+    if slot is None or slot['event'] != current_event():
+        ctx = get_script_run_ctx()
+        slot = st.session_state.live_slot = {'data': None, 'owned': False, 'event': current_event(),
+                                             'last_seen': 0.0,
+                                             'runtime_session': ctx.session_id if ctx else None}
+    registry, now = _session_registry(), time.time()
+    slot['last_seen'] = now
+    with registry['lock']:
+        registry['slots'][get_session_id()] = slot
+    if now - registry['swept_at'] > SESSION_SWEEP_SECONDS:
+        evict_idle_sessions(now)
+    return slot
+
+
+def _session_closed(slot):
+    """True once Streamlit no longer has the slot's tab (closed, or its
+    reconnect window ran out). Always False in bare mode."""
+    if slot.get('runtime_session') is None or not runtime.exists():
+        return False
+    return not runtime.get_instance().is_active_session(slot['runtime_session'])
+
+
+def evict_idle_sessions(now=None):
+    """Drop the slots of closed tabs, and the data held by tabs idle for
+    SESSION_IDLE_SECONDS. Returns how many slots were dropped."""
+    registry = _session_registry()
+    now = time.time() if now is None else now
+    with registry['lock']:
+        registry['swept_at'] = now
+        closed = {sid for sid, slot in registry['slots'].items() if _session_closed(slot)}
+        idle = set()
+        if SESSION_IDLE_SECONDS:
+            idle = {sid for sid, slot in registry['slots'].items()
+                    if sid not in closed and now - slot['last_seen'] > SESSION_IDLE_SECONDS}
+        for sid in closed | idle:
+            slot = registry['slots'].pop(sid)
+            slot['data'], slot['owned'] = None, False
+        registry['closed'] += len(closed)
+        registry['evicted'] += len(idle)
+    return len(closed) + len(idle)
+
+
+def live_data():
+    """This tab's live data ({day1_scores, day2_scores, day2_skins,
+    team_day2_points}) as of its last load - read-only unless owned."""
+    slot = _session_slot()
+    if slot['data'] is None:
+        load_all_data()
+    return slot['data']
+
+
+def _own_live_data():
+    """This tab's live data as a private copy it may change (copy-on-write)."""
+    slot = _session_slot()
+    if slot['data'] is None:
+        load_all_data()
+    if not slot['owned']:
+        slot['data'] = {key: dict(slot['data'].get(key, {})) for key in _LIVE_KEYS}
+        slot['owned'] = True
+    return slot['data']
+
+
 def load_all_data():
-    """Load all data from SQLite into session state"""
-    conn = get_db()
+    """Point this tab at the current shared snapshot (read-only), plus its
+    own unconfirmed saves if it has any."""
+    slot = _session_slot()
     try:
-        # Day 1 scores
-        st.session_state.day1_scores = {}
-        for row in conn.execute("SELECT * FROM day1_scores").fetchall():
-            key = f"{row['team']}_{row['hole']}"
-            st.session_state.day1_scores[key] = {
-                'team': row['team'], 'hole': row['hole'],
-                'scramble': row['scramble_score'], 'alt_shot': row['alt_shot_score'],
-                'timestamp': row['timestamp']
-            }
-
-        # Day 2 scores
-        st.session_state.day2_scores = {}
-        for row in conn.execute("SELECT * FROM day2_scores").fetchall():
-            key = f"{row['group_num']}_{row['hole']}_{row['team']}"
-            st.session_state.day2_scores[key] = {
-                'group': row['group_num'], 'hole': row['hole'], 'team': row['team'],
-                'score': row['score'], 'golfer': row['golfer'], 'timestamp': row['timestamp']
-            }
-
-        # Day 2 skins + recalculate team points
-        st.session_state.day2_skins = {}
-        st.session_state.team_day2_points = {team: 0 for team in TEAMS}
-        for row in conn.execute("SELECT * FROM day2_skins WHERE winner IS NOT NULL").fetchall():
-            key = f"{row['group_num']}_{row['hole']}"
-            st.session_state.day2_skins[key] = {
-                'group': row['group_num'], 'hole': row['hole'], 'winner': row['winner'],
-                'score': row['winning_score'], 'tied': False, 'points_value': row['points_value']
-            }
-            st.session_state.team_day2_points[row['winner']] += row['points_value']
-
-        # Recalculate any missing skins (e.g. scores exist but no skin row yet)
-        recalculate_missing_skins()
-
+        event = current_event()
+        slot['data'] = _shared_live_data(event, data_version())
+        slot['owned'] = False
+        if any(not p['future'].done() and p['event'] == event for p in st.session_state.get('pending_saves', [])):
+            _overlay_pending_saves(_own_live_data())
     except Exception as e:
+        if slot['data'] is None:
+            slot['data'] = {key: {} for key in _LIVE_KEYS}
         st.error(f"Error loading data: {e}")
 
 
-def recalculate_missing_skins():
-    """Recalculate skins for any holes that have scores but no skin result"""
-    if 'day2_scores' not in st.session_state:
+def _deep_size(obj, seen):
+    """Approximate bytes reachable from obj, skipping anything already in seen."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    return size
+
+
+def session_memory_report():
+    """{'sessions': [{session, event, idle_s, owned, bytes}], 'shared_bytes', 'evicted', 'closed'}.
+
+    bytes is what a tab holds on its own (a private copy); snapshots shared
+    between tabs are counted once, in shared_bytes."""
+    registry, now = _session_registry(), time.time()
+    with registry['lock']:
+        slots = list(registry['slots'].items())
+        evicted, closed = registry['evicted'], registry['closed']
+    sessions, shared, shared_seen = [], {}, set()
+    for sid, slot in slots:
+        data = slot['data']
+        size = 0
+        if data is not None and slot['owned']:
+            size = _deep_size(data, set())
+        elif data is not None and id(data) not in shared:
+            shared[id(data)] = _deep_size(data, shared_seen)
+        sessions.append({'session': sid, 'event': slot['event'], 'idle_s': round(now - slot['last_seen']),
+                         'owned': slot['owned'], 'bytes': size})
+    return {'sessions': sorted(sessions, key=lambda r: -r['bytes']), 'shared_bytes': sum(shared.values()),
+            'evicted': evicted, 'closed': closed}
+
+
+# ---------------------------------------------------------------------------
+# Skins consistency verifier
+# ---------------------------------------------------------------------------
+# Stored day2_skins rows are derived data: they should always equal a replay
+# of day2_scores. Rather than re-deriving and re-saving every group on every
+# page load, this checks the whole table in one pass, rewrites only the rows
+# that disagree, and remembers what it found. It runs once at startup, after
+# flush_pending_writes() replays anything, and on a background timer.
+SKINS_VERIFY_INTERVAL = int(os.environ.get("GCUP_SKINS_VERIFY_INTERVAL", "300"))  # seconds, 0 = off
+
+
+@st.cache_resource
+def _skins_verifier_state(event):
+    """Shared (all users) record of an event's most recent verifier run."""
+    return {'last_report': None, 'total_repaired': 0}
+
+
+def _sync_stored_skins(conn, groups=None, repair=True):
+    """Diff stored day2_skins against a replay of day2_scores (optionally for
+    just some groups) and rewrite only the rows that disagree. Caller holds
+    _db_lock (shared connection) or a transaction (write connection) and
+    commits. Returns (holes_checked, mismatches); each mismatch is
+    {group, hole, stored, expected} with None meaning "no row"."""
+    groups = list(GROUPS) if groups is None else list(groups)
+    scores = {}
+    for row in repo.get_group_scores(conn, groups):
+        scores[f"{row['group_num']}_{row['hole']}_{row['team']}"] = {
+            'group': row['group_num'], 'hole': row['hole'], 'team': row['team'], 'score': row['score']
+        }
+    stored = {
+        (row['group_num'], row['hole']): (row['winner'], row['winning_score'], row['points_value'])
+        for row in repo.get_group_skins(conn, groups)
+    }
+
+    expected = {}
+    for skin in replay_all_skins(scores, TEAMS, groups, DAY2_HOLES).values():
+        if not skin['tied']:
+            expected[(skin['group'], skin['hole'])] = (skin['winner'], skin['score'], skin['points_value'])
+
+    mismatches = []
+    for group, hole in sorted(set(stored) | set(expected)):
+        have, want = stored.get((group, hole)), expected.get((group, hole))
+        if have != want:
+            mismatches.append({'group': group, 'hole': hole, 'stored': have, 'expected': want})
+
+    if repair and mismatches:
+        repo.upsert_many(conn, 'day2_skins', [
+            {'group_num': m['group'], 'hole': m['hole'], 'winner': m['expected'][0],
+             'winning_score': m['expected'][1], 'points_value': m['expected'][2]}
+            for m in mismatches if m['expected']])
+        repo.delete_skins(conn, [(m['group'], m['hole']) for m in mismatches if not m['expected']])
+    return len(set(stored) | set(expected)), mismatches
+
+
+# ---------------------------------------------------------------------------
+# Live skins engine (incremental skins on save)
+# ---------------------------------------------------------------------------
+# Background saves don't replay a group's skins: each event keeps one
+# formats.SkinsEngine, built from the stored scores on the first save, and
+# every committed score is fed to it. Only the day2_skins rows it reports
+# as changed are rewritten. Anything that changes scores without going
+# through it (write-log replays, verifier repairs) drops it, and the next
+# save rebuilds it.
+@st.cache_resource
+def _skins_engine_state(event):
+    """An event's live skins engine and the lock that orders updates to it."""
+    return {'lock': threading.Lock(), 'engine': None}
+
+
+def reset_skins_engine():
+    state = _skins_engine_state(current_event())
+    with state['lock']:
+        state['engine'] = None
+
+
+def _update_stored_skins(conn, cells):
+    """Feed just-written Day 2 scores - cells: (group, hole, team) - to
+    the live engine and rewrite only the day2_skins rows that changed.
+    Runs inside the save's own transaction (_write_logged's derive), so
+    engine updates happen in the same order as the commits and the skins
+    land in the same commit as the scores."""
+    state = _skins_engine_state(current_event())
+    with state['lock']:
+        try:
+            if state['engine'] is None:
+                engine = SkinsEngine(TEAMS, DAY2_HOLES)
+                by_group = {}
+                for row in repo.get_group_scores(conn, GROUPS):
+                    if row['score'] and row['score'] > 0:
+                        group_scores = by_group.setdefault(row['group_num'], {})
+                        group_scores.setdefault(row['hole'], {})[row['team']] = row['score']
+                for group in GROUPS:
+                    engine.seed(group, by_group.get(group, {}))
+                _sync_stored_skins(conn)  # one full pass so stored rows start out in step
+                state['engine'] = engine
+                return
+            engine, changed = state['engine'], {}
+            for group, hole, team in cells:
+                engine.update(group, hole, team, repo.get_day2_score(conn, group, hole, team))
+                changed.update(((g, h), r) for g, h, r in engine.changed)  # latest result wins
+            won = {key: r for key, r in changed.items() if r and not r['tied']}
+            repo.upsert_many(conn, 'day2_skins', [
+                {'group_num': g, 'hole': h, 'winner': r['winner'], 'winning_score': r['score'],
+                 'points_value': r['points_value']} for (g, h), r in won.items()])
+            repo.delete_skins(conn, [key for key in changed if key not in won])
+        except BaseException:
+            state['engine'] = None  # the transaction won't commit - rebuild next time
+            raise
+
+
+def verify_skins(repair=True):
+    """Diff stored day2_skins against a replay of day2_scores and fix drift.
+
+    Returns a report dict: {checked_at, holes_checked, mismatches, repaired}.
+    """
+    conn = get_db()
+    with _db_lock():
+        holes_checked, mismatches = _sync_stored_skins(conn, repair=repair)
+        if repair and mismatches:
+            repo.bump_data_version(conn)
+        conn.commit()
+
+    if repair and mismatches:
+        reset_skins_engine()
+
+    report = {
+        'checked_at': datetime.now().isoformat(timespec='seconds'),
+        'holes_checked': holes_checked,
+        'mismatches': mismatches,
+        'repaired': len(mismatches) if repair else 0,
+    }
+    state = _skins_verifier_state(current_event())
+    state['last_report'] = report
+    state['total_repaired'] += report['repaired']
+    return report
+
+
+def _skins_verifier_loop(event):
+    while True:
+        try:
+            with event_scope(event):
+                verify_skins()
+        except Exception:
+            pass  # e.g. DB briefly busy - the next tick tries again
+        if SKINS_VERIFY_INTERVAL <= 0:
+            return
+        time.sleep(SKINS_VERIFY_INTERVAL)
+
+
+@st.cache_resource
+def start_skins_verifier(event):
+    """Verify an event once at startup, then (optionally) keep verifying it -
+    all on a background thread, so the first page doesn't wait for the check."""
+    threading.Thread(target=_skins_verifier_loop, args=(event,), name=f"skins-verifier-{event}",
+                     daemon=True).start()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Hole stats (running tallies - see scoring.tally_score)
+# ---------------------------------------------------------------------------
+# The Hole Stats page reads counters, never raw rows. Each event keeps a
+# live tally built from its scores once and then moved by every committed
+# save (the old value out, the new one in); each history file is tallied
+# once per file version. Like the live skins engine, anything that writes
+# scores behind its back (write-log replays) just drops it.
+HOLE_STAT_FORMATS = {'scramble': "Day 1 scramble", 'alt_shot': "Day 1 alt shot", 'skins': "Day 2 skins"}
+
+
+def _hole_par(fmt, hole):
+    course = DAY2_COURSE if fmt == 'skins' else DAY1_COURSE
+    return course[hole]['par'] if hole in course else None
+
+
+@st.cache_resource
+def _hole_tally_state(event):
+    """An event's live hole tally and the scores it currently counts."""
+    return {'lock': threading.Lock(), 'tally': None, 'cells': {}}
+
+
+def reset_hole_tally():
+    state = _hole_tally_state(current_event())
+    with state['lock']:
+        state['tally'] = None
+
+
+def _set_tally_cell(state, fmt, key, hole, score):
+    old = state['cells'].get((fmt, key, hole))
+    if old == score:
         return
+    tally_score(state['tally'], fmt, hole, old, _hole_par(fmt, hole), sign=-1)
+    tally_score(state['tally'], fmt, hole, score, _hole_par(fmt, hole))
+    state['cells'][(fmt, key, hole)] = score
+
+
+def _update_hole_tally(conn, action=None, payloads=()):
+    """Move the live tally to the committed values of just-saved rows
+    (building it from every score on first use). Returns a copy of it."""
+    state = _hole_tally_state(current_event())
+    with state['lock']:
+        try:
+            if state['tally'] is None:
+                state['tally'], state['cells'] = {}, {}
+                for r in repo.get_day1_rows(conn):
+                    _set_tally_cell(state, 'scramble', r['team'], r['hole'], r['scramble_score'])
+                    _set_tally_cell(state, 'alt_shot', r['team'], r['hole'], r['alt_shot_score'])
+                for r in repo.get_day2_rows(conn):
+                    _set_tally_cell(state, 'skins', (r['group_num'], r['team']), r['hole'], r['score'])
+            elif action == 'day1_score':
+                for p in payloads:
+                    scramble, alt_shot = repo.get_day1_score(conn, p['team'], p['hole'])
+                    _set_tally_cell(state, 'scramble', p['team'], p['hole'], scramble)
+                    _set_tally_cell(state, 'alt_shot', p['team'], p['hole'], alt_shot)
+            elif action == 'day2_score':
+                for p in payloads:
+                    score = repo.get_day2_score(conn, p['group'], p['hole'], p['team'])
+                    _set_tally_cell(state, 'skins', (p['group'], p['team']), p['hole'], score)
+        except BaseException:
+            state['tally'] = None
+            raise
+        return {key: dict(counters) for key, counters in state['tally'].items()}
+
+
+def live_hole_tally():
+    conn = get_db()
+    with _db_lock():
+        return _update_hole_tally(conn)
+
+
+@st.cache_data(show_spinner=False)
+def history_hole_tally(year, mtime):
+    """One history file's hole tally, against the pars recorded in that file.
+    Cached per file version (mtime), so each file is scanned once."""
+    import archive  # numpy - lazily, see "Startup"
+    path = history_path(year)
+    data = archive.load_summary(path, HISTORY_CACHE_DIR)
+    pars = (data.get('format_notes') or {}).get('course_par_used_for_to_par_stats') or {}
+    tally = {}
+    for r in archive.iter_raw(path, HISTORY_CACHE_DIR, 'day1_scores',
+                              ('Hole', 'Scramble_Score', 'Alt_Shot_Score')):
+        par = pars.get(str(r.get('Hole')), _hole_par('scramble', r.get('Hole')))
+        tally_score(tally, 'scramble', r.get('Hole'), r.get('Scramble_Score'), par)
+        tally_score(tally, 'alt_shot', r.get('Hole'), r.get('Alt_Shot_Score'), par)
+    for r in archive.iter_raw(path, HISTORY_CACHE_DIR, 'day2_scores', ('Hole', 'Score')):
+        par = pars.get(str(r.get('Hole')), _hole_par('skins', r.get('Hole')))
+        tally_score(tally, 'skins', r.get('Hole'), r.get('Score'), par)
+    return tally
+
+
+def history_hole_tallies():
+    """{year: tally} for every history file."""
+    tallies = {}
+    for year in load_history():
+        tallies[year] = history_hole_tally(year, os.path.getmtime(history_path(year)))
+    return tallies
+
+
+# ---------------------------------------------------------------------------
+# Continuous replication + restore after a wipe
+# ---------------------------------------------------------------------------
+# A redeploy wipes tournament_data.db (see the Storage note above). Point
+# GCUP_REPLICA_DIR at storage that outlives the app (a mounted volume, a
+# synced folder) and every committed score write is shipped there as it
+# happens, plus a compacted snapshot of the whole database every few
+# minutes. If get_db() then starts up with no database it rebuilds one on
+# its own: copy the snapshot, replay only the log shipped since.
+#
+#   <replica>/snapshot.db    SQLite backup-API copy of the database
+#   <replica>/log.jsonl      synced write_log entries shipped since that snapshot (append-only)
+#   <replica>/events/<event>/...   the same pair for every event other than the Cup
+REPLICA_DIR = os.environ.get("GCUP_REPLICA_DIR", "")  # "" = off
+REPLICA_SNAPSHOT_INTERVAL = int(os.environ.get("GCUP_REPLICA_SNAPSHOT_INTERVAL", "300"))  # seconds
+REPLICA_POLL_SECONDS = 5  # also catches roster / reveal changes, which aren't write-logged
+
+
+@st.cache_resource
+def _replica_state(event):
+    """An event's shipping cursor + status, shared by its replicator thread and the sidebar.
+
+    `wakeup` is set after each score commit so it's shipped right away."""
+    return {'wakeup': threading.Event(), 'cursor': 0, 'shipped': set(), 'setup_sig': None, 'snapshot_at': None,
+            'snapshot_mono': 0.0, 'entries_shipped': 0, 'restored': None, 'error': None}
+
+
+def _replica_dir(event):
+    return REPLICA_DIR if event == DEFAULT_EVENT else os.path.join(REPLICA_DIR, "events", event)
+
 
-    groups_with_scores = set()
-    for key, score_data in st.session_state.day2_scores.items():
-        if score_data['score'] and score_data['score'] > 0:
-            groups_with_scores.add(score_data['group'])
+def _replica_paths(event):
+    folder = _replica_dir(event)
+    return (os.path.join(folder, "snapshot.db"), os.path.join(folder, "log.jsonl"))
 
-    for group in groups_with_scores:
-        recalculate_group_skins_from_hole(group, 1)
+
+def _read_replica_log(log_path):
+    entries = []
+    if os.path.exists(log_path):
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    pass  # torn last line from a crash mid-append
+    return entries
+
+
+def _restore_from_replica(event):
+    """Rebuild an event's missing database from the replica. Returns a report dict or None."""
+    db_path = event_db_path(event)
+    if not REPLICA_DIR or os.path.exists(db_path):
+        return None
+    snapshot_path, log_path = _replica_paths(event)
+    if not os.path.exists(snapshot_path):
+        return None
+    started = time.monotonic()
+    staging = db_path + ".restoring"
+    shutil.copyfile(snapshot_path, staging)
+    conn = sqlite3.connect(staging, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    replayed = 0
+    with _transaction(conn):
+        for entry in _read_replica_log(log_path):
+            # The snapshot may already hold an entry that was shipped just
+            # before it was taken - only apply what it doesn't have.
+            if repo.get_log_status(conn, entry['id']) == LOG_SYNCED:
+                continue
+            _APPLIERS[entry['action']](**dict(entry['payload'], expected_version=None), conn=conn)
+            repo.put_log_entry(conn, entry['id'], entry['session_id'], entry['action'],
+                               json.dumps(entry['payload']), entry['timestamp'], LOG_SYNCED,
+                               entry['idem_key'])
+            replayed += 1
+    conn.close()
+    os.replace(staging, db_path)
+    return {'restored_at': datetime.now().isoformat(timespec='seconds'), 'replayed': replayed,
+            'seconds': round(time.monotonic() - started, 2)}
+
+
+def _setup_signature(conn):
+    """Changes whenever a roster / role / assignment / meta row does."""
+    return hashlib.sha1(repr(repo.setup_rows(conn)).encode()).hexdigest()
+
+
+def _take_replica_snapshot(conn):
+    """Compact: snapshot the whole DB, then start an empty log after it."""
+    snapshot_path, log_path = _replica_paths(current_event())
+    staging = snapshot_path + ".tmp"
+    target = sqlite3.connect(staging)
+    conn.backup(target)
+    target.close()
+    os.replace(staging, snapshot_path)
+    # Everything shipped so far is inside the snapshot now.
+    open(log_path, "w").close()
+
+
+def replicate_once(force_snapshot=False):
+    """Ship the current event's newly synced write_log entries; snapshot if
+    due or if setup changed."""
+    event = current_event()
+    state = _replica_state(event)
+    conn = _write_conn()
+    snapshot_path, log_path = _replica_paths(event)
+
+    rows = repo.get_log_entries(conn, LOG_SYNCED, after_id=state['cursor'])
+    new = [r for r in rows if r['id'] not in state['shipped']]
+    if new:
+        with open(log_path, "a", encoding="utf-8") as f:
+            for r in new:
+                f.write(json.dumps({'id': r['id'], 'session_id': r['session_id'], 'action': r['action'],
+                                    'payload': json.loads(r['payload']), 'timestamp': r['timestamp'],
+                                    'idem_key': r['idem_key']}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        state['shipped'].update(r['id'] for r in new)
+        state['entries_shipped'] += len(new)
+
+    # Saves commit out of id order, so the cursor only moves past ids that
+    # can't still turn synced; anything shipped above it is remembered.
+    oldest_pending = repo.oldest_log_id(conn, LOG_PENDING)
+    top = max(state['shipped'] | {state['cursor']})
+    state['cursor'] = top if oldest_pending is None else min(top, oldest_pending - 1)
+    state['shipped'] = {i for i in state['shipped'] if i > state['cursor']}
+
+    setup_sig = _setup_signature(conn)
+    due = time.monotonic() - state['snapshot_mono'] >= REPLICA_SNAPSHOT_INTERVAL
+    if force_snapshot or due or setup_sig != state['setup_sig'] or not os.path.exists(snapshot_path):
+        _take_replica_snapshot(conn)
+        state.update(setup_sig=setup_sig, snapshot_mono=time.monotonic(),
+                     snapshot_at=datetime.now().isoformat(timespec='seconds'))
+
+
+def _replicator_loop(event):
+    state = _replica_state(event)
+    try:
+        with event_scope(event):
+            replicate_once(force_snapshot=True)
+        state['entries_shipped'] = 0  # the startup snapshot already holds them
+    except Exception as e:
+        state['error'] = str(e)  # the loop below keeps trying
+    while True:
+        state['wakeup'].wait(REPLICA_POLL_SECONDS)
+        state['wakeup'].clear()
+        try:
+            with event_scope(event):
+                replicate_once()
+            state['error'] = None
+        except Exception as e:
+            state['error'] = str(e)  # e.g. replica volume unmounted - retry next tick
+
+
+@st.cache_resource
+def start_replicator(event):
+    """Snapshot an event once at startup, then keep its replica current - both
+    in the background, so the first page doesn't wait for the copy."""
+    if not REPLICA_DIR:
+        return False
+    os.makedirs(_replica_dir(event), exist_ok=True)
+    threading.Thread(target=_replicator_loop, args=(event,), name=f"replicator-{event}",
+                     daemon=True).start()
+    return True
 
 
 def get_day1_scores():
     """Get all Day 1 scores"""
     load_all_data()
-    return st.session_state.get('day1_scores', {})
+    return live_data()['day1_scores']
 
 
 def get_day2_scores():
     """Get all Day 2 scores"""
     load_all_data()
-    return st.session_state.get('day2_scores', {})
+    return live_data()['day2_scores']
 
 
 # ---------------------------------------------------------------------------
@@ -511,29 +1621,70 @@ def get_day2_scores():
 # ---------------------------------------------------------------------------
 def get_roster(team):
     """List of golfer names for a team, alphabetical."""
-    conn = get_db()
-    rows = conn.execute("SELECT golfer FROM roster WHERE team = ? ORDER BY golfer", (team,)).fetchall()
-    return [r['golfer'] for r in rows]
+    return repo.get_roster(get_db(), team)
 
 
-def add_golfer(team, golfer):
-    golfer = golfer.strip()
-    if not golfer:
-        return
-    conn = get_db()
-    with _db_lock:
-        conn.execute("INSERT OR IGNORE INTO roster (team, golfer) VALUES (?, ?)", (team, golfer))
-        conn.commit()
+class TeamSetupError(Exception):
+    """A team setup save was refused. `issues` lists why, one message each."""
 
+    def __init__(self, issues):
+        self.issues = issues
+        super().__init__("; ".join(issues))
 
-def remove_golfer(team, golfer):
-    conn = get_db()
-    with _db_lock:
-        conn.execute("DELETE FROM roster WHERE team = ? AND golfer = ?", (team, golfer))
-        conn.execute("DELETE FROM day2_assignments WHERE team = ? AND golfer = ?", (team, golfer))
-        # Clear this golfer out of any Day 1 role slot they occupied
-        conn.execute("UPDATE day1_roles SET golfer = NULL WHERE team = ? AND golfer = ?", (team, golfer))
-        conn.commit()
+
+def get_team_setup(team):
+    """{'roster', 'roles', 'groups'} - a team's whole configuration as stored."""
+    return repo.get_team_setup(get_db(), team)
+
+
+def team_setup_issues(roster, roles, groups):
+    """Problems that stop a team setup from being saved (duplicates, names
+    not on the roster). Unfilled roles / groups aren't problems - a team
+    can save as it goes."""
+    issues, names = [], [g.lower() for g in roster]
+    for golfer in sorted({g for g in roster if names.count(g.lower()) > 1}):
+        issues.append(f"{golfer} is on the roster more than once.")
+    by_golfer = {}
+    for slot in DAY1_SLOTS:
+        if roles.get(slot):
+            by_golfer.setdefault(roles[slot], []).append(slot)
+    for golfer, slots in by_golfer.items():
+        if len(slots) > 1:
+            issues.append(f"{golfer} is assigned to more than one role.")
+        if golfer not in roster:
+            issues.append(f"{golfer} has a Round 1 role but isn't on the roster.")
+    by_group = {}
+    for golfer, group in groups.items():
+        if group is not None:
+            by_group.setdefault(group, []).append(golfer)
+            if golfer not in roster:
+                issues.append(f"{golfer} is in Group {group} but isn't on the roster.")
+    for group, golfers in sorted(by_group.items()):
+        if len(golfers) > 1:
+            issues.append(f"{' and '.join(sorted(golfers))} are both assigned to Group {group}.")
+    return issues
+
+
+def apply_team_setup(team, roster, roles, groups, base):
+    """Save a team's whole configuration in one transaction.
+
+    base: the get_team_setup() the edits started from - if the stored setup
+    no longer matches it (edited from another device), nothing is written.
+    Raises TeamSetupError with the reasons when the setup is refused."""
+    roster = [g.strip() for g in roster if g and g.strip()]
+    roles = {slot: g for slot, g in roles.items() if slot in DAY1_SLOTS and g}
+    groups = {g: n for g, n in groups.items() if n is not None}
+    issues = team_setup_issues(roster, roles, groups)
+    if issues:
+        raise TeamSetupError(issues)
+    conn = _write_conn()
+    with _transaction(conn):
+        if repo.get_team_setup(conn, team) != base:
+            raise TeamSetupError([f"{team}'s setup was changed from another device since you started "
+                                  "editing. Discard your changes to load the current setup."])
+        repo.replace_team_setup(conn, team, roster, roles, groups)
+        repo.resolve_golfers(conn, roster)
+        repo.bump_data_version(conn)  # unstamped scores are credited by the current assignments
 
 
 # Day 1 role slots. Each team fills all five: one all-time scrambler and two pairs.
@@ -543,31 +1694,19 @@ SCRAMBLER_LABEL = "All-time Scrambler / Beer Drinker"
 
 def get_day1_roles(team):
     """{slot: golfer} for a team's Day 1 role assignments (missing slots absent)."""
-    conn = get_db()
-    rows = conn.execute("SELECT slot, golfer FROM day1_roles WHERE team = ?", (team,)).fetchall()
-    return {r['slot']: r['golfer'] for r in rows if r['golfer']}
-
-
-def set_day1_role(team, slot, golfer):
-    conn = get_db()
-    with _db_lock:
-        if golfer is None:
-            conn.execute("DELETE FROM day1_roles WHERE team = ? AND slot = ?", (team, slot))
-        else:
-            conn.execute("""
-                INSERT INTO day1_roles (team, slot, golfer) VALUES (?, ?, ?)
-                ON CONFLICT(team, slot) DO UPDATE SET golfer = excluded.golfer
-            """, (team, slot, golfer))
-        conn.commit()
+    return repo.get_day1_roles(get_db(), team)
 
 
-def day1_rotation(team):
+def day1_rotation(team, roles=None):
     """Resolve a team's Day 1 roles into the front/back scramble & alt-shot rotation.
 
     Front 9: (Pair 1 + Scrambler) scramble | Pair 2 alt shot
     Back 9:  (Pair 2 + Scrambler) scramble | Pair 1 alt shot
+
+    roles: the team's {slot: golfer} if already fetched (get_all_day1_roles).
     """
-    roles = get_day1_roles(team)
+    if roles is None:
+        roles = get_day1_roles(team)
     scrambler = roles.get('scrambler')
     pair1 = [roles.get('p1a'), roles.get('p1b')]
     pair2 = [roles.get('p2a'), roles.get('p2b')]
@@ -582,19 +1721,15 @@ def day1_rotation(team):
     }
 
 
-def day1_role_issues(team):
-    """Return a list of human-readable problems with a team's Day 1 role setup."""
-    roles = get_day1_roles(team)
-    assigned = [g for g in roles.values() if g]
+def day1_role_issues(team, roles=None):
+    """Return a list of human-readable, non-blocking notes on a team's Day 1
+    role setup (unfilled roles). Duplicates block the save, so they're
+    reported by team_setup_issues instead.
+
+    roles: the team's {slot: golfer} to check instead of the stored ones."""
+    if roles is None:
+        roles = get_day1_roles(team)
     issues = []
-    # Duplicates across slots
-    seen = {}
-    for slot, g in roles.items():
-        seen.setdefault(g, []).append(slot)
-    for g, slots in seen.items():
-        if len(slots) > 1:
-            issues.append(f"{g} is assigned to more than one role.")
-    # Completeness
     missing = [s for s in DAY1_SLOTS if not roles.get(s)]
     if missing:
         issues.append("Not all five roles are filled yet.")
@@ -603,83 +1738,259 @@ def day1_role_issues(team):
 
 def get_day2_assignments(team):
     """{golfer: group_num} for a team."""
-    conn = get_db()
-    rows = conn.execute("SELECT golfer, group_num FROM day2_assignments WHERE team = ?", (team,)).fetchall()
-    return {r['golfer']: r['group_num'] for r in rows}
+    return repo.get_day2_assignments(get_db(), team)
 
 
-def set_day2_assignment(team, golfer, group_num):
-    conn = get_db()
-    with _db_lock:
-        if group_num is None:
-            conn.execute("DELETE FROM day2_assignments WHERE team = ? AND golfer = ?", (team, golfer))
-        else:
-            conn.execute("""
-                INSERT INTO day2_assignments (team, golfer, group_num)
-                VALUES (?, ?, ?)
-                ON CONFLICT(team, golfer) DO UPDATE SET group_num = excluded.group_num
-            """, (team, golfer, group_num))
-        conn.commit()
+def get_all_assignments():
+    """{team: {golfer: group_num}} for every team, in one query."""
+    return repo.get_all_assignments(get_db())
 
 
-def get_golfer_for_team_group(team, group_num):
-    """Which golfer on this team is playing in this Day 2 group, if assigned."""
-    assignments = get_day2_assignments(team)
+def group_lineups(assignments=None):
+    """{group: {team: golfer}} - who's playing in each Day 2 group."""
+    if assignments is None:
+        assignments = get_all_assignments()
+    lineups = {g: {} for g in GROUPS}
+    for team, golfers in assignments.items():
+        for golfer, group in golfers.items():
+            lineups.setdefault(group, {})[team] = golfer
+    return lineups
+
+
+def get_golfer_for_team_group(team, group_num, assignments=None):
+    """Which golfer on this team is playing in this Day 2 group, if assigned.
+
+    assignments: get_all_assignments() result to look in instead of querying."""
+    assignments = get_day2_assignments(team) if assignments is None else assignments.get(team, {})
     for golfer, g in assignments.items():
         if g == group_num:
             return golfer
     return None
 
 
-def compute_golfer_skins():
-    """Per-golfer Day 2 skins tally, resolved from the stamped golfer on each
-    winning score row (falling back to the current group assignment for any
-    older rows saved before names were stamped).
+@st.cache_data(show_spinner=False, max_entries=8)
+def golfer_stats(event, version):
+    """Per-golfer Day 2 stats, cached per event + data_version() - one query
+    (repo.get_golfer_day2_stats) however many golfers or skins there are.
 
-    Returns a list of dicts: {golfer, team, group, skins}, sorted by skins desc.
+    Returns a list of dicts: {golfer, team, group, skins, holes_won, holes,
+    strokes, to_par, birdies, average}, most skins first.
     """
-    load_all_data()
-    scores = st.session_state.get('day2_scores', {})
-    skins = st.session_state.get('day2_skins', {})
+    pars = {hole: DAY2_COURSE[hole]['par'] for hole in DAY2_HOLES}
+    with event_scope(event):
+        conn = get_db()
+        with _db_lock():
+            rows = repo.get_golfer_day2_stats(conn, pars)
+    stats = [{'golfer': r['golfer'], 'team': r['team'], 'group': r['group_num'], 'skins': r['skins'],
+              'holes_won': r['holes_won'], 'holes': r['holes'], 'strokes': r['strokes'],
+              'to_par': r['to_par'], 'birdies': r['birdies'],
+              'average': round(r['strokes'] / r['holes'], 2)} for r in rows]
+    return sorted(stats, key=lambda x: (-x['skins'], x['to_par'], x['golfer']))
+
+
+# ---------------------------------------------------------------------------
+# Golfer careers (golfer ids + aliases, one season row per golfer / year / team)
+# ---------------------------------------------------------------------------
+# golfer_seasons is rebuilt off the request path: a background thread per
+# event runs sync_golfer_seasons() at startup and then on a timer (a no-op
+# unless scores, setup or the history files moved), so the Individual
+# Skins page only reads.
+GOLFER_SYNC_INTERVAL = int(os.environ.get("GCUP_GOLFER_SYNC_INTERVAL", "30"))  # seconds, 0 = startup only
+
+
+@st.cache_resource
+def _golfer_sync_state(event):
+    """What golfer_seasons was last rebuilt from. In memory rather than meta,
+    so a rebuild doesn't count as a setup change to the replica."""
+    return {'lock': threading.Lock(), 'key': None}
+
+
+def _season_rows(ids, year, golfer_skins, team_points, champion):
+    return [{'golfer_id': ids[g['golfer']], 'team': g['team'], 'skins': g.get('skins', 0),
+             'team_points': team_points.get(g['team']), 'champion': int(g['team'] == champion)}
+            for g in golfer_skins if g.get('golfer') in ids and g.get('team')]
+
+
+def sync_golfer_seasons():
+    """Rebuild golfer_seasons from the history files + this year's Day 2 stats,
+    only when either has changed since the last rebuild.
+
+    Every name seen (rosters, assignments, stamped scores, history) is resolved
+    to a golfer id first, so aliases merged on the Individual Skins page count
+    towards one career."""
+    event = current_event()
+    history_files = sorted(load_history())
+    key = (data_version(), tuple((y, os.path.getmtime(history_path(y))) for y in history_files
+                                  if os.path.exists(history_path(y))))
+    state = _golfer_sync_state(event)
+    with state['lock']:
+        if state['key'] == key:
+            return
+        history = load_history()
+        live_year = datetime.now().year
+        live = golfer_stats(event, key[0]) if live_year not in history else []
+        live = [r for r in live if not re.fullmatch(r".+ \(Group \d+\)", r['golfer'])]  # unnamed lineups
+        names = {g for golfers in get_all_assignments().values() for g in golfers}
+        names |= {g for golfers in repo.get_all_rosters(get_db()).values() for g in golfers}
+        names |= {r['golfer'] for r in live}
+        for data in history.values():
+            names |= {g.get('golfer') for g in (data.get('results') or {}).get('golfer_skins') or []}
+
+        conn = get_db()
+        with _db_lock():
+            ids = repo.resolve_golfers(conn, names)
+            for year, data in history.items():
+                results = data.get('results') or {}
+                repo.replace_golfer_seasons(conn, year, _season_rows(
+                    ids, year, results.get('golfer_skins') or [], results.get('overall_points') or {},
+                    results.get('champion')))
+            if live:
+                data = _shared_live_data(event, key[0])
+                team_points, _ = calculate_leaderboard(data)
+                repo.replace_golfer_seasons(conn, live_year, _season_rows(ids, live_year, live, team_points, None))
+            conn.commit()
+        state['key'] = key
+
+
+def _golfer_sync_loop(event):
+    while True:
+        try:
+            with event_scope(event):
+                sync_golfer_seasons()
+        except Exception:
+            pass  # e.g. DB briefly busy - the next tick tries again
+        if GOLFER_SYNC_INTERVAL <= 0:
+            return
+        time.sleep(GOLFER_SYNC_INTERVAL)
 
-    tally = {}  # golfer -> {'team', 'group', 'skins'}
-    for skin in skins.values():
-        if not skin.get('winner') or skin.get('tied'):
-            continue
-        group = skin['group']
-        hole = skin['hole']
-        team = skin['winner']
-        points = skin.get('points_value', 1)
 
-        # Prefer the golfer stamped on that exact winning score row.
-        row = scores.get(f"{group}_{hole}_{team}", {})
-        golfer = row.get('golfer') or get_golfer_for_team_group(team, group)
-        if not golfer:
-            golfer = f"{team} (Group {group})"  # unnamed fallback
+@st.cache_resource
+def start_golfer_sync(event):
+    """Keep an event's golfer_seasons in step on a background thread."""
+    threading.Thread(target=_golfer_sync_loop, args=(event,), name=f"golfer-sync-{event}",
+                     daemon=True).start()
+    return True
+
+
+def golfer_careers():
+    """Career rows from the golfer_careers view, as the last sync left them."""
+    with _db_lock():
+        return [dict(r) for r in repo.get_golfer_careers(get_db())]
+
 
-        entry = tally.setdefault(golfer, {'golfer': golfer, 'team': team, 'group': group, 'skins': 0})
-        entry['skins'] += points
+def get_golfers():
+    """[{'id', 'name', 'aliases'}] - every known golfer."""
+    with _db_lock():
+        return repo.get_golfers(get_db())
 
-    return sorted(tally.values(), key=lambda x: x['skins'], reverse=True)
+
+def merge_golfers(keep_id, merge_id):
+    """Make merge_id's names aliases of keep_id and fold its seasons in."""
+    conn = get_db()
+    with _db_lock():
+        repo.merge_golfers(conn, keep_id, merge_id)
+        conn.commit()
+    _golfer_sync_state(current_event())['key'] = None
+
+
+def _render_golfer_careers():
+    careers = golfer_careers()
+    if not careers:
+        return
+    st.markdown("### 🗂️ Careers")
+    rows = [[r['name'], str(r['seasons']), str(r['skins']), f"{r['team_points'] or 0:g}", str(r['titles']),
+             ", ".join(sorted((r['teams'] or "").split(","))),
+             str(r['first_year']) if r['first_year'] == r['last_year'] else f"{r['first_year']}–{r['last_year']}"]
+            for r in careers]
+    st.markdown(_html_table(["Golfer", "Seasons", "Skins", "Team Pts", "Titles", "Teams", "Years"], rows),
+                unsafe_allow_html=True)
+    st.caption("Every past year's individual skins plus this year's, one row per golfer. Team Pts and "
+               "Titles are the golfer's team's totals in the years they played.")
+
+    with st.expander("🔗 Merge golfers (same person, different spellings)"):
+        golfers = get_golfers()
+        labels = {g['id']: g['name'] + (f" (aka {', '.join(g['aliases'])})" if g['aliases'] else "")
+                  for g in golfers}
+        if len(labels) < 2:
+            st.caption("Nothing to merge yet.")
+            return
+        keep = st.selectbox("Keep", list(labels), format_func=labels.get, key="merge_keep")
+        merge = st.selectbox("Merge into it", [i for i in labels if i != keep], format_func=labels.get,
+                             key="merge_other")
+        code = st.text_input("Commissioner code:", type="password", key="commish_code_merge")
+        if st.button("Merge"):
+            if check_commissioner_code(code):
+                merge_golfers(keep, merge)
+                st.success(f"Merged {labels[merge]} into {labels[keep]}.")
+                st.rerun()
+            else:
+                st.error("Incorrect commissioner code.")
 
 
 def golfer_skins_page():
     """Individual skins leaderboard for the current tournament."""
     st.title("⛳ Individual Skins Stats")
-    st.caption("Per-golfer skins for Day 2. (Day 1 is a team scramble/alt-shot, "
+    st.caption("Per-golfer skins and scoring for Day 2. (Day 1 is a team scramble/alt-shot, "
                "so it has no individual scores.)")
 
     if not is_revealed():
         st.info("🔒 Individual stats appear after the groupings are revealed.")
         return
 
-    rows = compute_golfer_skins()
+    rows = golfer_stats(current_event(), data_version())
+    if not rows:
+        st.info("No Day 2 scores yet.")
+    else:
+        table_rows = [[r['golfer'], r['team'], f"Group {r['group']}", str(r['skins']), str(r['holes_won']),
+                       str(r['holes']), format_score_to_par(r['to_par']), str(r['birdies']),
+                       f"{r['average']:.2f}"] for r in rows]
+        st.markdown(_html_table(["Golfer", "Team", "Group", "Skins", "Holes Won", "Holes", "To Par",
+                                 "Birdies", "Avg"], table_rows), unsafe_allow_html=True)
+        st.caption("Skins counts carryovers (a hole won after two ties is 3 skins). "
+                   "Birdies include anything better than par.")
+
+    _render_golfer_careers()
+
+
+def hole_stats_page():
+    """Which holes play hardest - this year's scores, past years, or both."""
+    st.title("📈 Hole Stats")
+    st.caption("Scoring average, birdie / bogey rates and a difficulty rank for every hole.")
+
+    history = history_hole_tallies()
+    rounds = st.radio("Rounds", ["This year + history", "This year", "History"], horizontal=True,
+                      key="hole_stats_rounds")
+    fmt_label = st.selectbox("Format", ["All formats"] + list(HOLE_STAT_FORMATS.values()),
+                             key="hole_stats_format")
+    formats = [k for k, label in HOLE_STAT_FORMATS.items() if label == fmt_label] or None
+
+    parts = []
+    if rounds != "History":
+        parts.append(live_hole_tally())
+    if rounds != "This year":
+        parts.extend(history.values())
+    rows = hole_difficulty(merge_tallies(*parts), formats)
     if not rows:
-        st.info("No skins have been won yet.")
+        st.info("No hole-by-hole scores yet.")
         return
 
-    table_rows = [[r['golfer'], r['team'], f"Group {r['group']}", str(r['skins'])] for r in rows]
-    st.markdown(_html_table(["Golfer", "Team", "Group", "Skins"], table_rows), unsafe_allow_html=True)
+    hardest = ", ".join(f"#{r['hole']}" for r in rows[:3])
+    easiest = ", ".join(f"#{r['hole']}" for r in rows[-3:][::-1])
+    st.markdown(f"**Hardest:** {hardest} · **Easiest:** {easiest}")
+    course = DAY2_COURSE if formats == ['skins'] else DAY1_COURSE
+
+    def pct(rate):
+        return f"{rate:.0%}"
+
+    table_rows = [[str(r['hole']), str(course[r['hole']]['par']) if r['hole'] in course else '—',
+                   str(r['plays']), f"{r['average']:.2f}", f"{r['to_par']:+.2f}",
+                   pct(r['eagles_rate'] + r['birdies_rate']), pct(r['pars_rate']),
+                   pct(r['bogeys_rate']), pct(r['doubles_rate']), str(r['rank'])]
+                  for r in sorted(rows, key=lambda r: r['hole'])]
+    st.markdown(_html_table(["Hole", "Par", "Scores", "Avg", "vs Par", "Birdie+", "Par",
+                             "Bogey", "Double+", "Rank"], table_rows), unsafe_allow_html=True)
+    st.caption(f"{len(history)} past year(s) on file. vs Par is measured against the par each "
+               "round was played to; Rank 1 is the hardest hole.")
 
 
 # ---------------------------------------------------------------------------
@@ -737,21 +2048,81 @@ def check_commissioner_code(code):
     return code == expected
 
 
+# The reveal payload - every team's Round 1 rotation and every Round 2
+# group's lineup - is built once, when the commissioner reveals, and frozen
+# in meta ('reveal_payload') in the same commit as the revealed flag. Viewers
+# read the flag and payload from memory, so a room full of phones stepping
+# through the reveal doesn't query the rosters, roles or assignments at all.
+def build_reveal_payload():
+    """{'built_at', 'day1': {team: rotation}, 'lineups': {group: {team: golfer}}}
+    from the current setup, in two queries."""
+    conn = get_db()
+    with _db_lock():
+        all_roles = repo.get_all_day1_roles(conn)
+        assignments = repo.get_all_assignments(conn)
+    lineups = group_lineups(assignments)
+    return {'built_at': datetime.now().isoformat(timespec='seconds'),
+            'day1': {team: day1_rotation(team, all_roles.get(team, {})) for team in TEAMS},
+            'lineups': {g: dict(lineups.get(g, {})) for g in GROUPS}}
+
+
+def _decode_reveal_payload(raw):
+    """A frozen payload from meta, or None if it's for a different field."""
+    payload = json.loads(raw)
+    payload['lineups'] = {int(g): lineup for g, lineup in payload['lineups'].items()}
+    if set(payload['day1']) != set(TEAMS) or set(payload['lineups']) != set(GROUPS):
+        return None
+    return payload
+
+
+@st.cache_resource
+def _reveal_state(event):
+    """An event's revealed flag and frozen payload, read from meta once per process."""
+    return {'lock': threading.Lock(), 'loaded': False, 'revealed': False, 'payload': None}
+
+
+def _loaded_reveal_state():
+    state = _reveal_state(current_event())
+    if state['loaded']:
+        return state
+    with state['lock']:
+        if not state['loaded']:
+            conn = get_db()
+            revealed = repo.get_meta(conn, 'revealed') == '1'
+            raw = repo.get_meta(conn, 'reveal_payload')
+            payload = _decode_reveal_payload(raw) if revealed and raw else None
+            if revealed and payload is None:
+                # Revealed before payloads were frozen, by gen_tournament.py,
+                # or under a different field config - freeze one now.
+                payload = build_reveal_payload()
+                with _db_lock():
+                    repo.set_meta(conn, 'reveal_payload', json.dumps(payload))
+                    conn.commit()
+            state.update(revealed=revealed, payload=payload, loaded=True)
+    return state
+
+
 def is_revealed():
     """Has the commissioner triggered the grand reveal? Persistent, app-wide."""
-    conn = get_db()
-    row = conn.execute("SELECT value FROM meta WHERE key = 'revealed'").fetchone()
-    return bool(row and row['value'] == '1')
+    return _loaded_reveal_state()['revealed']
+
+
+def reveal_payload():
+    """The frozen reveal payload (None until revealed)."""
+    return _loaded_reveal_state()['payload']
 
 
 def set_revealed(state):
+    """Reveal (freezing the payload) or re-lock (dropping it)."""
+    payload = build_reveal_payload() if state else None
     conn = get_db()
-    with _db_lock:
-        conn.execute("""
-            INSERT INTO meta (key, value) VALUES ('revealed', ?)
-            ON CONFLICT(key) DO UPDATE SET value = excluded.value
-        """, ('1' if state else '0',))
-        conn.commit()
+    reveal = _reveal_state(current_event())
+    with reveal['lock']:
+        with _db_lock():
+            repo.set_meta(conn, 'revealed', '1' if state else '0')
+            repo.set_meta(conn, 'reveal_payload', json.dumps(payload) if payload else '')
+            conn.commit()
+        reveal.update(revealed=bool(state), payload=payload, loaded=True)
 
 
 def unlocked_team():
@@ -759,29 +2130,77 @@ def unlocked_team():
     return st.session_state.get('unlocked_team')
 
 
+def _setup_draft(team):
+    """This tab's unsaved edits to a team's setup, started from what's stored.
+    rev bumps whenever the roster changes, so the role / group pickers are
+    rebuilt against the new roster."""
+    key = f"setup_draft_{team}"
+    if key not in st.session_state:
+        base = get_team_setup(team)
+        st.session_state[key] = {'base': base, 'roster': list(base['roster']), 'roles': dict(base['roles']),
+                                 'groups': dict(base['groups']), 'rev': 0, 'notice': None}
+    return st.session_state[key]
+
+
+def _draft_changes(draft):
+    """How many roster entries, roles and group picks differ from what's stored."""
+    base = draft['base']
+    changes = len(set(base['roster']) ^ set(draft['roster']))
+    changes += sum(1 for slot in DAY1_SLOTS if base['roles'].get(slot) != draft['roles'].get(slot))
+    changes += sum(1 for g in set(base['groups']) | set(draft['groups'])
+                   if base['groups'].get(g) != draft['groups'].get(g))
+    return changes
+
+
+def _draft_add_golfer(team):
+    draft, key = _setup_draft(team), f"new_golfer_{team}"
+    golfer = (st.session_state.get(key) or "").strip()
+    if not golfer:
+        return
+    if golfer.lower() in (g.lower() for g in draft['roster']):
+        draft['notice'] = f"{golfer} is already on the roster."
+    else:
+        draft['roster'] = sorted(draft['roster'] + [golfer])
+        draft['rev'] += 1
+    st.session_state[key] = ""
+
+
+def _draft_remove_golfer(team, golfer):
+    """Drop a golfer from the draft roster, their group and any Day 1 role."""
+    draft = _setup_draft(team)
+    draft['roster'] = [g for g in draft['roster'] if g != golfer]
+    draft['roles'] = {slot: g for slot, g in draft['roles'].items() if g != golfer}
+    draft['groups'].pop(golfer, None)
+    draft['rev'] += 1
+
+
 def _render_team_editor(team):
-    """The roster / partnerships / assignments editing UI for one team."""
-    roster = get_roster(team)
+    """The roster / partnerships / assignments editing UI for one team.
+
+    Every edit goes into this tab's draft (_setup_draft); nothing is written
+    until Save, which applies the whole team in one transaction."""
+    draft = _setup_draft(team)
+    roster, rev = draft['roster'], draft['rev']
 
     # --- Roster ---------------------------------------------------
     st.markdown("#### Roster")
     col_a, col_b = st.columns([3, 1])
     with col_a:
-        new_golfer = st.text_input("Add golfer:", key=f"new_golfer_{team}", label_visibility="collapsed",
-                                    placeholder="Golfer name")
+        st.text_input("Add golfer:", key=f"new_golfer_{team}", label_visibility="collapsed",
+                      placeholder="Golfer name")
     with col_b:
-        if st.button("Add", key=f"add_golfer_{team}", use_container_width=True):
-            if new_golfer.strip():
-                add_golfer(team, new_golfer)
-                st.rerun()
+        st.button("Add", key=f"add_golfer_{team}", use_container_width=True,
+                  on_click=_draft_add_golfer, args=(team,))
+    if draft['notice']:
+        st.warning(draft['notice'])
+        draft['notice'] = None
 
     if roster:
         for golfer in roster:
             rcol1, rcol2 = st.columns([5, 1])
-            rcol1.markdown(f"- {golfer}")
-            if rcol2.button("Remove", key=f"remove_{team}_{golfer}"):
-                remove_golfer(team, golfer)
-                st.rerun()
+            rcol1.markdown(f"- {golfer}" + ("" if golfer in draft['base']['roster'] else " *(new)*"))
+            rcol2.button("Remove", key=f"remove_{team}_{golfer}", on_click=_draft_remove_golfer,
+                         args=(team, golfer))
     else:
         st.info("No golfers added yet.")
 
@@ -797,18 +2216,18 @@ def _render_team_editor(team):
     if len(roster) < 5:
         st.info(f"Add all 5 golfers to the roster to set roles (currently {len(roster)}).")
     else:
-        roles = get_day1_roles(team)
+        roles = draft['roles']
         blank = "— none —"
 
         def role_selectbox(slot, label):
             options = [blank] + roster
             current = roles.get(slot)
             idx = options.index(current) if current in options else 0
-            chosen = st.selectbox(label, options, index=idx, key=f"role_{team}_{slot}")
-            new_val = None if chosen == blank else chosen
-            if new_val != roles.get(slot):
-                set_day1_role(team, slot, new_val)
-                st.rerun()
+            chosen = st.selectbox(label, options, index=idx, key=f"role_{team}_{slot}_{rev}")
+            if chosen == blank:
+                roles.pop(slot, None)
+            else:
+                roles[slot] = chosen
 
         role_selectbox('scrambler', SCRAMBLER_LABEL)
         pc1, pc2 = st.columns(2)
@@ -821,11 +2240,11 @@ def _render_team_editor(team):
             role_selectbox('p2a', "Pair 2 — Golfer A")
             role_selectbox('p2b', "Pair 2 — Golfer B")
 
-        for issue in day1_role_issues(team):
+        for issue in day1_role_issues(team, roles):
             st.warning(issue)
 
         # Show the resolved rotation so the whole picture is visible at once
-        rot = day1_rotation(team)
+        rot = day1_rotation(team, roles)
         st.markdown("**This produces:**")
         st.markdown(
             f"- **Front 9 scramble:** {', '.join(rot['front_scramble']) or '—'}\n"
@@ -838,35 +2257,55 @@ def _render_team_editor(team):
 
     # --- Round 2 group assignments -----------------------------------
     st.markdown("#### Round 2 Group Assignments (Skins)")
+    groups = draft['groups']
     if not roster:
         st.caption("Add golfers to the roster to assign them to groups.")
     else:
-        assignments = get_day2_assignments(team)
         group_labels = ["Unassigned"] + [f"Group {g}" for g in GROUPS]
 
         for golfer in roster:
-            current_group = assignments.get(golfer)
-            current_index = group_labels.index(f"Group {current_group}") if current_group else 0
+            current_group = groups.get(golfer)
+            current_index = group_labels.index(f"Group {current_group}") if current_group in GROUPS else 0
             acol1, acol2 = st.columns([3, 2])
             acol1.markdown(f"**{golfer}**")
             chosen = acol2.selectbox(
                 "Group:", group_labels, index=current_index,
-                key=f"assign_{team}_{golfer}", label_visibility="collapsed"
+                key=f"assign_{team}_{golfer}_{rev}", label_visibility="collapsed"
             )
-            new_group = None if chosen == "Unassigned" else int(chosen.split(" ")[1])
-            if new_group != current_group:
-                if new_group is not None:
-                    conflict = next((g for g, grp in assignments.items()
-                                      if grp == new_group and g != golfer), None)
-                    if conflict:
-                        st.warning(f"{conflict} is already assigned to Group {new_group} for {team}.")
-                set_day2_assignment(team, golfer, new_group)
-                st.rerun()
+            if chosen == "Unassigned":
+                groups.pop(golfer, None)
+            else:
+                groups[golfer] = int(chosen.split(" ")[1])
 
         st.caption("Group coverage: " + ", ".join(
-            f"G{g}: {get_golfer_for_team_group(team, g) or '—'}" for g in GROUPS
+            f"G{g}: {get_golfer_for_team_group(team, g, {team: groups}) or '—'}" for g in GROUPS
         ))
 
+    st.divider()
+
+    # --- Save: the whole team, one transaction ---------------------
+    issues = team_setup_issues(roster, draft['roles'], groups)
+    for issue in issues:
+        st.error(issue)
+    changes = _draft_changes(draft)
+    scol1, scol2, scol3 = st.columns([2, 1, 1])
+    scol1.markdown(f"**{changes} unsaved change(s)**" if changes else "All changes saved.")
+    if scol2.button("💾 Save team setup", type="primary", use_container_width=True,
+                    disabled=not changes or bool(issues), key=f"save_setup_{team}"):
+        try:
+            apply_team_setup(team, roster, draft['roles'], groups, draft['base'])
+        except TeamSetupError as e:
+            for issue in e.issues:
+                st.error(issue)
+        else:
+            st.session_state.pop(f"setup_draft_{team}", None)
+            st.toast(f"✅ Saved {team}'s setup")
+            st.rerun()
+    if scol3.button("Discard changes", use_container_width=True, disabled=not changes,
+                    key=f"discard_setup_{team}"):
+        st.session_state.pop(f"setup_draft_{team}", None)
+        st.rerun()
+
 
 def _render_team_readonly(team):
     """Read-only view of a team's config, shown after the reveal."""
@@ -893,8 +2332,9 @@ def _render_team_readonly(team):
     )
 
     st.markdown("#### Round 2 Group Assignments (Skins)")
+    assignments = {team: get_day2_assignments(team)}
     st.markdown("\n".join(
-        f"- Group {g}: **{get_golfer_for_team_group(team, g) or '—'}**" for g in GROUPS
+        f"- Group {g}: **{get_golfer_for_team_group(team, g, assignments) or '—'}**" for g in GROUPS
     ))
 
 
@@ -909,8 +2349,9 @@ def team_setup_page():
     if not _secrets_configured():
         st.warning(
             "⚠️ Team & commissioner codes aren't configured in Streamlit secrets yet, "
-            "so placeholder codes are in effect (team codes: `team-1` / `team-2` / `team-3` "
-            "for the three teams in order; commissioner: `commish`). "
+            "so placeholder codes are in effect (team codes: "
+            + ", ".join(f"`{code}` for {team}" for team, code in _PLACEHOLDER_TEAM_CODES.items())
+            + f"; commissioner: `{_PLACEHOLDER_COMMISSIONER_CODE}`). "
             "Set real codes in your app's secrets before the tournament - see the code "
             "comments for the exact format."
         )
@@ -953,7 +2394,8 @@ def team_setup_page():
     top1, top2 = st.columns([4, 1])
     with top1:
         st.markdown(f"### Editing: {current}")
-        st.caption("Freely editable until the reveal - no need to 'submit'.")
+        st.caption("Freely editable until the reveal. Edits stay on this device until you "
+                   "press **Save team setup**, which saves the whole team at once.")
     with top2:
         if st.button("Switch team", use_container_width=True):
             st.session_state.pop('unlocked_team', None)
@@ -962,9 +2404,9 @@ def team_setup_page():
     _render_team_editor(current)
 
 
-def _render_one_team_day1(team):
+def _render_one_team_day1(team, payload):
     """A single team's Round 1 role breakdown, presented for the reveal."""
-    rot = day1_rotation(team)
+    rot = payload['day1'][team]
     st.markdown(f"#### 🏌️ {team}")
     st.markdown(f"🍺 **{SCRAMBLER_LABEL}:** {rot['scrambler'] or '—'}")
     c1, c2 = st.columns(2)
@@ -982,12 +2424,12 @@ def _render_one_team_day1(team):
     )
 
 
-def _render_all_day1_roles():
+def _render_all_day1_roles(payload):
     """Consolidated Round 1 role rotation for all teams, side by side."""
     st.markdown("### Round 1 Roles (all teams)")
     cols = st.columns(len(TEAMS))
     for col, team in zip(cols, TEAMS):
-        rot = day1_rotation(team)
+        rot = payload['day1'][team]
         with col:
             st.markdown(f"#### {team}")
             st.markdown(f"🍺 **Scrambler:** {rot['scrambler'] or '—'}")
@@ -1001,22 +2443,22 @@ def _render_all_day1_roles():
             )
 
 
-def _render_all_skins_groups():
+def _render_all_skins_groups(payload):
     """Consolidated Round 2 skins groups for all teams, all at once."""
     st.markdown("### Round 2 Skins Groups (all at once)")
+    lineups = payload['lineups']
     rows = []
     for g in GROUPS:
         row = {'Group': f"Group {g}"}
         for team in TEAMS:
-            row[team] = get_golfer_for_team_group(team, g) or '—'
+            row[team] = lineups[g].get(team) or '—'
         rows.append(row)
-    show_table(pd.DataFrame(rows))
+    show_table(rows)
 
 
-# Reveal sequence: first Round 1, team by team in this order, then the 5
+# Reveal sequence: first Round 1, team by team in R1_REVEAL_ORDER, then the
 # Round 2 skins groups one at a time.
-R1_REVEAL_ORDER = ["Young Guns", "Mids", "OGs"]
-_TOTAL_REVEAL_STEPS = len(R1_REVEAL_ORDER) + len(GROUPS)  # 3 teams + 5 groups = 8
+_TOTAL_REVEAL_STEPS = len(R1_REVEAL_ORDER) + len(GROUPS)  # 3 teams + 5 groups = 8 for the Cup
 
 
 def grand_reveal_page():
@@ -1066,18 +2508,21 @@ def grand_reveal_page():
             if st.button("Exit preview"):
                 st.session_state.pop('commish_preview', None)
                 st.rerun()
-            _render_all_day1_roles()
+            payload = build_reveal_payload()  # live - nothing is frozen until the reveal
+            _render_all_day1_roles(payload)
             st.divider()
-            _render_all_skins_groups()
+            _render_all_skins_groups(payload)
             return
 
         st.info("🔒 The groupings are sealed. Waiting for the commissioner to reveal them Thursday night.")
+        assignments = get_all_assignments()
         ready = sum(1 for team in TEAMS if any(
-            get_golfer_for_team_group(team, g) for g in GROUPS))
+            get_golfer_for_team_group(team, g, assignments) for g in GROUPS))
         st.caption(f"{ready} of {len(TEAMS)} teams have entered assignments.")
         return
 
     # --- Revealed: stepped presentation ----------------------------------
+    payload = reveal_payload()
     if 'reveal_step' not in st.session_state:
         st.session_state.reveal_step = _TOTAL_REVEAL_STEPS  # fully revealed on revisit
 
@@ -1128,11 +2573,12 @@ def grand_reveal_page():
     if groups_shown > 0:
         st.markdown("### Round 2 — Skins Groups")
         st.caption("Each group has one golfer from every team going head-to-head for skins.")
+        lineups = payload['lineups']
         for g in reversed(GROUPS[:groups_shown]):
             st.markdown(f"#### 🏌️ Group {g}")
             cols = st.columns(len(TEAMS))
             for col, team in zip(cols, TEAMS):
-                golfer = get_golfer_for_team_group(team, g)
+                golfer = lineups[g].get(team)
                 with col:
                     st.markdown(f"**{team}**")
                     st.markdown(f"### {golfer or '—'}")
@@ -1143,20 +2589,29 @@ def grand_reveal_page():
     if teams_shown == 0:
         st.caption("First up: Round 1 roles, one team at a time.")
     for team in reversed(R1_REVEAL_ORDER[:teams_shown]):
-        _render_one_team_day1(team)
+        _render_one_team_day1(team, payload)
 
     # ---- Everything out: consolidated recap (very bottom) --------------
     if step >= _TOTAL_REVEAL_STEPS:
         st.divider()
         st.success("🎉 That's everyone!")
-        _render_all_skins_groups()
+        _render_all_skins_groups(payload)
 
 
 # ---------------------------------------------------------------------------
 # Tournament History (past years, read from history/<year>_results.json)
 # ---------------------------------------------------------------------------
+def history_path(year):
+    return os.path.join(HISTORY_DIR, f"{year}_results.json")
+
+
 def load_history():
-    """Load every history/<year>_results.json file in the repo, keyed by year."""
+    """Load every history/<year>_results.json file in the repo, keyed by year.
+
+    Summaries only - each year's raw_data stays on disk (history_raw() /
+    archive.iter_raw() read it on demand), and summaries come from the
+    compact sidecars once they're built, so this stays small as years pile up."""
+    import archive  # numpy - lazily, see "Startup"
     years = {}
     if not os.path.isdir(HISTORY_DIR):
         return years
@@ -1166,13 +2621,23 @@ def load_history():
             continue
         year = int(match.group(1))
         try:
-            with open(os.path.join(HISTORY_DIR, fname)) as f:
-                years[year] = json.load(f)
+            years[year] = archive.load_summary(os.path.join(HISTORY_DIR, fname), HISTORY_CACHE_DIR)
         except Exception as e:
             st.warning(f"Couldn't read {fname}: {e}")
     return years
 
 
+def history_raw(year):
+    """{table: [rows]} - one year's raw_data."""
+    import archive  # numpy - lazily, see "Startup"
+    return archive.load_raw(history_path(year), HISTORY_CACHE_DIR)
+
+
+def history_with_raw():
+    """load_history() with each year's raw_data put back, for the models that need every row."""
+    return {year: dict(data, raw_data=history_raw(year)) for year, data in load_history().items()}
+
+
 def _format_supreme_leader(leader):
     """Render a year's supreme_leader field (a name, a list of names, or None)."""
     if not leader:
@@ -1230,13 +2695,16 @@ def _html_table(headers, rows, highlight_first_col=False):
     )
 
 
-def show_table(df, highlight_first_col=False):
-    """Render a pandas DataFrame as the blue-header HTML table.
+def show_table(records, highlight_first_col=False):
+    """Render a list of row dicts as the blue-header HTML table (columns in
+    first-seen order, missing / None cells blank).
 
     Drop-in replacement for st.dataframe throughout the app so every table
-    gets the same Old-Glory-blue header styling."""
-    headers = [str(c) for c in df.columns]
-    rows = [["" if pd.isna(v) else str(v) for v in row] for row in df.itertuples(index=False)]
+    gets the same Old-Glory-blue header styling - without pandas, which the
+    app doesn't import at all (see "Startup")."""
+    headers = list(dict.fromkeys(key for record in records for key in record))
+    rows = [["" if record.get(h) is None else str(record[h]) for h in headers] for record in records]
+    headers = [str(h) for h in headers]
     st.markdown(_html_table(headers, rows, highlight_first_col=highlight_first_col),
                 unsafe_allow_html=True)
 
@@ -1312,10 +2780,8 @@ def history_page():
 
     overall = results.get('overall_points', {})
     if overall:
-        df_overall = pd.DataFrame(
-            [{'Team': t, 'Overall Points': p} for t, p in overall.items()]
-        ).sort_values('Overall Points', ascending=False)
-        show_table(df_overall)
+        show_table(sorted([{'Team': t, 'Overall Points': p} for t, p in overall.items()],
+                          key=lambda r: -r['Overall Points']))
 
     # Detailed scoring tables only exist for years with hole-by-hole data.
     has_detail = any(results.get(k) for k in
@@ -1337,7 +2803,7 @@ def history_page():
                 'Score': totals.get('scramble'), 'To Par': totals.get('scramble_to_par')
             })
         if rows:
-            show_table(pd.DataFrame(rows))
+            show_table(rows)
 
     with col2:
         st.markdown("#### Day 1 - Alt Shot")
@@ -1350,15 +2816,13 @@ def history_page():
                 'Score': totals.get('alt_shot'), 'To Par': totals.get('alt_shot_to_par')
             })
         if rows:
-            show_table(pd.DataFrame(rows))
+            show_table(rows)
 
     st.markdown("#### Day 2 - Skins Points")
     skins_points = results.get('day2_skins_points', {})
     if skins_points:
-        df_skins = pd.DataFrame(
-            [{'Team': t, 'Skins Points': p} for t, p in skins_points.items()]
-        ).sort_values('Skins Points', ascending=False)
-        show_table(df_skins)
+        show_table(sorted([{'Team': t, 'Skins Points': p} for t, p in skins_points.items()],
+                          key=lambda r: -r['Skins Points']))
 
     # Per-golfer skins, if this year recorded them
     golfer_skins = results.get('golfer_skins')
@@ -1372,86 +2836,31 @@ def history_page():
 # ---------------------------------------------------------------------------
 # Scoring calculations
 # ---------------------------------------------------------------------------
-def calculate_day1_points():
-    """Calculate Day 1 points and current standings"""
-    day1_scores = get_day1_scores()
-
-    team_totals = {team: {'scramble': 0, 'alt_shot': 0, 'holes_completed': 0,
-                           'scramble_to_par': 0, 'alt_shot_to_par': 0} for team in TEAMS}
-
-    total_par = sum(DAY1_COURSE[hole]['par'] for hole in range(1, 19))
-
-    for score_data in day1_scores.values():
-        team = score_data['team']
-        hole = score_data['hole']
-        if score_data['scramble'] and score_data['alt_shot']:
-            team_totals[team]['scramble'] += score_data['scramble']
-            team_totals[team]['alt_shot'] += score_data['alt_shot']
-            team_totals[team]['holes_completed'] += 1
-
-            hole_par = DAY1_COURSE[hole]['par']
-            team_totals[team]['scramble_to_par'] += (score_data['scramble'] - hole_par)
-            team_totals[team]['alt_shot_to_par'] += (score_data['alt_shot'] - hole_par)
-
+def calculate_day1_points(day1_scores=None):
+    """Calculate Day 1 points and current standings.
+
+    Scramble and alt shot are two stroke-play units of one engine, built
+    fresh from the scores it's given, so the snapshot and a tab's overlay
+    never share state. A row counts once both formats are entered."""
+    if day1_scores is None:
+        day1_scores = get_day1_scores()
+    engine = StrokePlayEngine(TEAMS, HOLES, DAY1_POINT_VALUES)
+    for row in day1_scores.values():
+        if row['scramble'] and row['alt_shot']:
+            engine.update('scramble', row['hole'], row['team'], row['scramble'])
+            engine.update('alt_shot', row['hole'], row['team'], row['alt_shot'])
+    scramble_points, alt_shot_points = engine.unit_points('scramble'), engine.unit_points('alt_shot')
+    scramble_strokes, alt_shot_strokes = engine.strokes('scramble'), engine.strokes('alt_shot')
+
+    team_totals = {}
     for team in TEAMS:
-        holes_played = team_totals[team]['holes_completed']
-        if 0 < holes_played < 18:
-            par_for_holes_played = sum(DAY1_COURSE[hole]['par'] for hole in range(1, holes_played + 1))
-            team_totals[team]['scramble_to_par'] = team_totals[team]['scramble'] - par_for_holes_played
-            team_totals[team]['alt_shot_to_par'] = team_totals[team]['alt_shot'] - par_for_holes_played
-        elif holes_played == 18:
-            team_totals[team]['scramble_to_par'] = team_totals[team]['scramble'] - total_par
-            team_totals[team]['alt_shot_to_par'] = team_totals[team]['alt_shot'] - total_par
-
-    complete_teams = [team for team in TEAMS if team_totals[team]['holes_completed'] == 18]
-
-    def award_points_with_ties(scores_dict, point_values=None):
-        """Award points handling ties by splitting combined position points"""
-        if point_values is None:
-            point_values = DAY1_POINT_VALUES
-        if not scores_dict:
-            return {}
-
-        sorted_teams = sorted(scores_dict.items(), key=lambda x: x[1])
-
-        points_awarded = {}
-        i = 0
-        while i < len(sorted_teams):
-            current_score = sorted_teams[i][1]
-            tied_teams = [team for team, score in sorted_teams[i:] if score == current_score]
-
-            if i == 0:
-                if len(tied_teams) == 1:
-                    points_to_split = point_values[0]
-                elif len(tied_teams) == 2:
-                    points_to_split = point_values[0] + point_values[1]
-                else:
-                    points_to_split = sum(point_values)
-            elif i == 1:
-                if len(tied_teams) == 1:
-                    points_to_split = point_values[1]
-                else:
-                    points_to_split = point_values[1] + point_values[2]
-            else:
-                points_to_split = point_values[2]
-
-            points_per_team = points_to_split / len(tied_teams)
-            for team in tied_teams:
-                points_awarded[team] = points_per_team
+        (scramble, holes_played), (alt_shot, _) = scramble_strokes[team], alt_shot_strokes[team]
+        par_for_holes_played = sum(DAY1_COURSE[hole]['par'] for hole in HOLES[:holes_played])
+        team_totals[team] = {'scramble': scramble, 'alt_shot': alt_shot, 'holes_completed': holes_played,
+                             'scramble_to_par': scramble - par_for_holes_played if holes_played else 0,
+                             'alt_shot_to_par': alt_shot - par_for_holes_played if holes_played else 0}
 
-            i += len(tied_teams)
-
-        return points_awarded
-
-    if len(complete_teams) == len(TEAMS):
-        scramble_scores = {team: data['scramble'] for team, data in team_totals.items()}
-        scramble_points = award_points_with_ties(scramble_scores)
-
-        alt_shot_scores = {team: data['alt_shot'] for team, data in team_totals.items()}
-        alt_shot_points = award_points_with_ties(alt_shot_scores)
-    else:
-        scramble_points = {}
-        alt_shot_points = {}
+    complete_teams = [team for team in TEAMS if team_totals[team]['holes_completed'] == len(HOLES)]
 
     return {
         'scramble_points': scramble_points,
@@ -1462,11 +2871,13 @@ def calculate_day1_points():
     }
 
 
-def calculate_leaderboard():
-    """Calculate current team standings"""
+def calculate_leaderboard(data=None):
+    """Calculate current team standings
+
+    data: a _read_live_data() dict to use instead of this session's scores."""
     team_points = {team: 0 for team in TEAMS}
 
-    day1_results = calculate_day1_points()
+    day1_results = calculate_day1_points(None if data is None else data['day1_scores'])
     if day1_results['all_teams_complete']:
         scramble_points = day1_results['scramble_points']
         alt_shot_points = day1_results['alt_shot_points']
@@ -1474,15 +2885,251 @@ def calculate_leaderboard():
             team_points[team] += scramble_points.get(team, 0)
             team_points[team] += alt_shot_points.get(team, 0)
 
-    load_all_data()
+    if data is None:
+        load_all_data()
+        data = live_data()
 
-    day2_points = st.session_state.get('team_day2_points', {team: 0 for team in TEAMS})
+    day2_points = data.get('team_day2_points', {team: 0 for team in TEAMS})
     for team in TEAMS:
         team_points[team] += day2_points.get(team, 0)
 
     return team_points, day1_results
 
 
+def skins_summary(day2_skins):
+    """Per-group skins progress: [{group, holes_played, points: {team: n}}].
+
+    One pass over the skins, however many groups there are."""
+    summary = {group: {'group': group, 'holes_played': 0, 'points': {team: 0 for team in TEAMS}}
+               for group in GROUPS}
+    for skin in day2_skins.values():
+        row = summary.get(skin['group'])
+        if row is None:
+            continue
+        row['holes_played'] += 1
+        if skin['winner'] and not skin['tied'] and skin['winner'] in row['points']:
+            row['points'][skin['winner']] += skin.get('points_value', 1)
+    return list(summary.values())
+
+
+def data_version():
+    """Cheap "has anything changed?" token for caching derived results
+    (per event - cache on (event, version), never the version alone).
+
+    A counter in meta, moved inside every transaction that changes scores,
+    stored skins or a team's setup (saves, write-log replays, verifier
+    repairs, apply_team_setup) - so it only goes up, and never ahead of or
+    behind what's committed, however concurrent saves interleave.
+    """
+    return repo.data_version(get_db())
+
+
+# ---------------------------------------------------------------------------
+# Win probability (Monte Carlo - see winprob.py)
+# ---------------------------------------------------------------------------
+SIM_COUNT = int(os.environ.get("GCUP_SIM_COUNT", "100000"))
+SIM_WORKERS = int(os.environ.get("GCUP_SIM_WORKERS", "1"))  # >1 = spread across processes
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def win_probabilities(event, version, n_sims=SIM_COUNT):
+    """Simulated win probability per team, cached per event + data version.
+
+    The seed is the data version too, so the numbers only move when a score
+    does - not every time someone hits refresh."""
+    import winprob  # numpy - lazily, see "Startup"
+    with event_scope(event):
+        data = _read_live_data(get_db())
+    model = winprob.build_model(
+        data['day1_scores'], data['day2_scores'], TEAMS, GROUPS, DAY1_COURSE, DAY2_COURSE,
+        DAY1_POINT_VALUES, winprob.history_observations(history_with_raw()), HOLES, DAY2_HOLES)
+    return winprob.simulate(model, n_sims, seed=version, workers=SIM_WORKERS)
+
+
+@st.cache_resource
+def _win_prob_jobs(event):
+    """An event's simulation in flight + the newest finished one."""
+    return {'lock': threading.Lock(), 'version': None, 'future': None, 'last': None,
+            'executor': ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"win-prob-{event}")}
+
+
+def win_probabilities_nowait(event, version):
+    """(odds, current, error) without waiting on a simulation: the newest
+    finished odds (None before the first), whether they're for this version,
+    and the exception if this version's simulation failed. A missing version
+    is simulated in the background (filling the win_probabilities cache), so
+    a cold start or a fresh score doesn't hold up the page."""
+    jobs = _win_prob_jobs(event)
+    with jobs['lock']:
+        if jobs['version'] != version:
+            jobs['version'] = version
+            jobs['future'] = jobs['executor'].submit(win_probabilities, event, version)
+        future = jobs['future']
+        error = future.exception() if future.done() else None
+        if future.done() and error is None:
+            jobs['last'] = (version, future.result())
+        last = jobs['last']
+    if last is None:
+        return None, False, error
+    return last[1], last[0] == version, error
+
+
+@st.fragment(run_every=1)
+def _win_prob_poll(event, version):
+    """Full rerun once this version's simulation has finished."""
+    future = _win_prob_jobs(event)['future']
+    if future is None or future.done():
+        st.rerun()
+
+
+# ---------------------------------------------------------------------------
+# Clinch / elimination (see scoring.clinch_status / scoring.bounds_status)
+# ---------------------------------------------------------------------------
+# The exact engine enumerates finishing orders, which is instant for the
+# Cup's 3 teams but grows factorially. Bigger fields use per-team points
+# ranges instead: still never wrong, just slower to call a clinch.
+CLINCH_EXACT_MAX_TEAMS = int(os.environ.get("GCUP_CLINCH_EXACT_MAX_TEAMS", "5"))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def clinch_standings(event, version):
+    """{team: {'min_points', 'max_points', 'status'}} for the current state,
+    cached per event + data version so it's recomputed once per save, not per viewer."""
+    with event_scope(event):
+        data = _read_live_data(get_db())
+    team_index = {team: i for i, team in enumerate(TEAMS)}
+    exact = len(TEAMS) <= CLINCH_EXACT_MAX_TEAMS
+    format_component = day1_format_outcomes if exact else day1_format_bounds
+    skins_component = skins_group_outcomes if exact else skins_group_bounds
+
+    components = []
+    for fmt in ('scramble', 'alt_shot'):
+        current = [0] * len(TEAMS)
+        played = [0] * len(TEAMS)
+        for row in data['day1_scores'].values():
+            if row['team'] in team_index and row['scramble'] and row['alt_shot']:
+                current[team_index[row['team']]] += row[fmt]
+                played[team_index[row['team']]] += 1
+        remaining = [len(HOLES) - p for p in played]
+        components.append(format_component(current, remaining, DAY1_POINT_VALUES))
+
+    known = {group: {} for group in GROUPS}
+    for row in data['day2_scores'].values():
+        if row['group'] in known and row['team'] in team_index and row['score'] and row['score'] > 0:
+            known[row['group']].setdefault(row['hole'], {})[team_index[row['team']]] = row['score']
+    for group in GROUPS:
+        components.append(skins_component(known[group], DAY2_HOLES, len(TEAMS)))
+
+    return clinch_status(components, TEAMS) if exact else bounds_status(components, TEAMS)
+
+
+# ---------------------------------------------------------------------------
+# Spectator JSON endpoint
+# ---------------------------------------------------------------------------
+# Spectators only want the standings, and a full Streamlit session per phone
+# re-runs the whole leaderboard script on every refresh. This small HTTP
+# server runs alongside the app (same process) and serves the standings as
+# JSON. The body is rebuilt only when the data changes (a save, or a skins
+# repair by the verifier - see data_version()), and carries
+# an ETag, so a spectator polling an unchanged leaderboard gets a bare 304.
+#
+#   GCUP_SPECTATOR_PORT=8502 streamlit run app.py   ->  GET :8502/standings.json
+#                                                      GET :8502/standings.json?event=<id>
+#
+# Binds to localhost unless GCUP_SPECTATOR_HOST says otherwise (e.g. 0.0.0.0
+# behind a reverse proxy).
+SPECTATOR_PORT = int(os.environ.get("GCUP_SPECTATOR_PORT", "0"))  # 0 = off
+SPECTATOR_HOST = os.environ.get("GCUP_SPECTATOR_HOST", "127.0.0.1")
+SPECTATOR_RECHECK_SECONDS = 1.0  # how often the data version is re-read
+
+
+def spectator_snapshot():
+    """Standings, skins summary and (after the reveal) individual skins, as plain JSON types."""
+    data = _read_live_data(get_db())
+    team_points, day1_results = calculate_leaderboard(data)
+    standings = []
+    for team in TEAMS:
+        day1 = (day1_results['scramble_points'].get(team, 0) +
+                day1_results['alt_shot_points'].get(team, 0))
+        standings.append({'team': team, 'day1_points': day1,
+                          'day2_skins': data['team_day2_points'].get(team, 0),
+                          'total_points': team_points[team]})
+    standings.sort(key=lambda x: x['total_points'], reverse=True)
+    return {
+        'standings': standings,
+        'day1_complete': day1_results['all_teams_complete'],
+        'day1_totals': day1_results['team_totals'],
+        'skins_summary': skins_summary(data['day2_skins']),
+        'golfer_skins': golfer_stats(current_event(), data_version()) if is_revealed() else [],
+    }
+
+
+@st.cache_resource
+def _spectator_cache(event):
+    """An event's current JSON body + ETag, keyed by (data version, revealed)."""
+    return {'lock': threading.Lock(), 'key': None, 'etag': None, 'body': b'', 'checked': 0.0}
+
+
+def spectator_payload(event=DEFAULT_EVENT):
+    """(etag, body) for an event's current standings, rebuilt only when its data changes."""
+    cache = _spectator_cache(event)
+    with cache['lock'], event_scope(event):
+        if time.monotonic() - cache['checked'] >= SPECTATOR_RECHECK_SECONDS:
+            key = (data_version(), is_revealed())
+            if key != cache['key']:
+                snapshot = dict(spectator_snapshot(), event=event, version=key[0],
+                                generated_at=datetime.now().isoformat(timespec='seconds'))
+                body = json.dumps(snapshot).encode('utf-8')
+                cache.update(key=key, body=body,
+                             etag='"%s"' % hashlib.sha1(body).hexdigest()[:20])
+            cache['checked'] = time.monotonic()
+        return cache['etag'], cache['body']
+
+
+class _SpectatorHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        event = parse_qs(url.query).get('event', [DEFAULT_EVENT])[0]
+        if url.path not in ('/', '/standings.json') or event not in list_events():
+            self.send_error(404)
+            return
+        try:
+            etag, body = spectator_payload(event)
+        except Exception:
+            self.send_error(503, "Standings unavailable")
+            return
+        if etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per spectator poll is just noise
+
+
+@st.cache_resource
+def start_spectator_server():
+    """Start the spectator endpoint once per process (if a port is configured)."""
+    if SPECTATOR_PORT <= 0:
+        return None
+    try:
+        server = ThreadingHTTPServer((SPECTATOR_HOST, SPECTATOR_PORT), _SpectatorHandler)
+    except OSError:
+        return None  # port taken, e.g. by another app process - spectators use that one
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="spectator-http", daemon=True).start()
+    return server
+
+
 def format_score_to_par(score_to_par):
     """Format score to par display"""
     if score_to_par == 0:
@@ -1496,6 +3143,42 @@ def format_score_to_par(score_to_par):
 # ---------------------------------------------------------------------------
 # Sidebar: backup / data export
 # ---------------------------------------------------------------------------
+# The sidebar renders on every full rerun, so the exports are built once per
+# change and reused rather than re-reading every table (and the whole .db
+# file) for every click by every user.
+@st.cache_data(show_spinner=False, max_entries=4)
+def _backup_csvs(event, version):
+    conn = _open_event_db(event)
+    csvs = {}
+    for table in ('day1_scores', 'day2_scores', 'day2_skins'):
+        columns, rows = repo.export_table(conn, table)
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(tuple(r) for r in rows)
+        csvs[table] = out.getvalue()
+    return csvs
+
+
+def _db_file_stamp(event):
+    """(mtime, size) of an event's .db and its WAL - changes whenever the file would."""
+    stamp = []
+    db_path = event_db_path(event)
+    for path in (db_path, db_path + "-wal"):
+        try:
+            info = os.stat(path)
+            stamp.append((info.st_mtime_ns, info.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _backup_db_bytes(event, stamp):
+    with open(event_db_path(event), "rb") as f:
+        return f.read()
+
+
 def backup_sidebar():
     """Lets anyone pull a backup copy of the data at any time."""
     with st.sidebar.expander("💾 Backup & Data"):
@@ -1503,26 +3186,68 @@ def backup_sidebar():
             "Data lives locally in the app. Grab a backup anytime you want "
             "extra peace of mind (recommended right after the tournament)."
         )
-        conn = get_db()
+        event = current_event()
+        prefix = "" if event == DEFAULT_EVENT else f"{event}_"
         try:
-            day1_df = pd.read_sql_query("SELECT * FROM day1_scores", conn)
-            day2_df = pd.read_sql_query("SELECT * FROM day2_scores", conn)
-            skins_df = pd.read_sql_query("SELECT * FROM day2_skins", conn)
-
-            st.download_button("Day 1 scores (CSV)", day1_df.to_csv(index=False),
-                                "day1_scores.csv", "text/csv", use_container_width=True)
-            st.download_button("Day 2 scores (CSV)", day2_df.to_csv(index=False),
-                                "day2_scores.csv", "text/csv", use_container_width=True)
-            st.download_button("Skins results (CSV)", skins_df.to_csv(index=False),
-                                "day2_skins.csv", "text/csv", use_container_width=True)
-
-            if os.path.exists(DB_PATH):
-                with open(DB_PATH, "rb") as f:
-                    st.download_button("Full database (.db)", f.read(),
-                                        "tournament_data.db", use_container_width=True)
+            csvs = _backup_csvs(event, data_version())
+            st.download_button("Day 1 scores (CSV)", csvs['day1_scores'],
+                                f"{prefix}day1_scores.csv", "text/csv", use_container_width=True)
+            st.download_button("Day 2 scores (CSV)", csvs['day2_scores'],
+                                f"{prefix}day2_scores.csv", "text/csv", use_container_width=True)
+            st.download_button("Skins results (CSV)", csvs['day2_skins'],
+                                f"{prefix}day2_skins.csv", "text/csv", use_container_width=True)
+
+            if os.path.exists(event_db_path(event)):
+                st.download_button("Full database (.db)", _backup_db_bytes(event, _db_file_stamp(event)),
+                                    os.path.basename(event_db_path(event)), use_container_width=True)
         except Exception as e:
             st.caption(f"Backup unavailable: {e}")
 
+        report = _skins_verifier_state(event)['last_report']
+        if report:
+            if report['mismatches']:
+                st.caption(f"Skins check {report['checked_at']}: repaired "
+                           f"{report['repaired']} out-of-sync hole(s).")
+            else:
+                st.caption(f"Skins check {report['checked_at']}: all "
+                           f"{report['holes_checked']} stored skins match the scores.")
+
+        if REPLICA_DIR:
+            replica = _replica_state(event)
+            if replica['restored']:
+                st.caption(f"♻️ Restored from replica at {replica['restored']['restored_at']} "
+                           f"({replica['restored']['replayed']} logged saves replayed).")
+            if replica['error']:
+                st.caption(f"⚠️ Replica behind: {replica['error']}")
+            else:
+                st.caption(f"Replica: snapshot {replica['snapshot_at']}, "
+                           f"{replica['entries_shipped']} saves shipped since startup.")
+
+        if st.checkbox("Show startup timings", key="show_startup_timings"):
+            report = startup_report(event)
+            if report['first_render_ms'] is None:
+                st.caption("Still starting up.")
+            else:
+                st.caption(f"First render took {report['first_render_ms']:.0f} ms "
+                           f"(schema {report['schema']}): "
+                           + ", ".join(f"{name} {ms:.0f} ms" for name, ms in report['phases'].items()) + ".")
+
+        if st.checkbox("Show session memory", key="show_session_memory"):
+            mem = session_memory_report()
+            owned = [r for r in mem['sessions'] if r['owned']]
+            st.caption(f"{len(mem['sessions'])} tab(s) tracked, shared snapshots "
+                       f"{mem['shared_bytes'] / 1024:.0f} KB, {len(owned)} private cop(ies) "
+                       f"{sum(r['bytes'] for r in owned) / 1024:.0f} KB, {mem['evicted']} idle tab(s) evicted, {mem['closed']} closed tab(s) dropped.")
+            st.caption("\n\n".join(
+                f"`{r['session']}` ({r['event']}): idle {r['idle_s']}s, "
+                + (f"{r['bytes'] / 1024:.0f} KB private" if r['owned'] else "shared")
+                for r in mem['sessions'][:10]))
+
+        if st.checkbox("Show query timings", key="show_query_timings"):
+            st.caption("\n\n".join(
+                f"`{name}` ×{s['calls']}: {s['total_ms']:.1f} ms total, {s['max_ms']:.1f} ms max"
+                for name, s in list(repo.call_stats().items())[:10]) or "No queries yet.")
+
 
 # ---------------------------------------------------------------------------
 # Pages
@@ -1531,6 +3256,7 @@ def day1_scoring_page():
     """Day 1 scoring interface"""
     st.title("📊 Day 1 Scoring")
     st.markdown("**Format**: Scramble + Alternating Shot for each team")
+    show_save_status()
 
     col1, col2 = st.columns([1, 2])
 
@@ -1540,46 +3266,64 @@ def day1_scoring_page():
 
         if is_revealed():
             rot = day1_rotation(selected_team)
-            nine = "front" if selected_hole <= 9 else "back"
+            nine = "front" if selected_hole in DAY1_FRONT_HOLES else "back"
             st.caption("**Roles this nine:**")
             st.caption(f"🍺 Scrambler: {rot['scrambler'] or '—'}")
             st.caption(f"Scramble: {', '.join(rot[f'{nine}_scramble']) or '—'}")
             st.caption(f"Alt shot: {', '.join(rot[f'{nine}_alt_shot']) or '—'}")
 
     with col2:
-        hole_info = DAY1_COURSE[selected_hole]
-        st.markdown(f"### {selected_team} - Hole {selected_hole}")
-        st.markdown(f"**Par {hole_info['par']} • {hole_info['yardage']} yards**")
-
-        key = f"{selected_team}_{selected_hole}"
-        existing_scores = st.session_state.get('day1_scores', {}).get(key, {})
-
-        col2a, col2b = st.columns(2)
+        _day1_score_entry(selected_team, selected_hole)
+
+    _day1_team_scorecard(selected_team)
+
+
+# The scoring pages are split into fragments so the on-course scorer's
+# clicks stay cheap: nudging a score input only reruns the entry fragment,
+# not the whole script (write-log flush, backup panel, full data load,
+# scorecard). Saving triggers one full rerun so the scorecard catches up.
+@st.fragment
+def _day1_score_entry(selected_team, selected_hole):
+    """Score inputs + Save for one team/hole (reruns on its own)."""
+    hole_info = DAY1_COURSE[selected_hole]
+    st.markdown(f"### {selected_team} - Hole {selected_hole}")
+    st.markdown(f"**Par {hole_info['par']} • {hole_info['yardage']} yards**")
+
+    key = f"{selected_team}_{selected_hole}"
+    existing_scores = live_data()['day1_scores'].get(key, {})
+    widget_key = f"scramble_{selected_team}_{selected_hole}"
+    expected_version = _seen_version(widget_key, existing_scores.get('version', 0))
+
+    col2a, col2b = st.columns(2)
+
+    with col2a:
+        scramble_score = st.number_input(
+            "Scramble Score:", min_value=1, max_value=15,
+            value=existing_scores.get('scramble', hole_info['par']),
+            key=f"scramble_{selected_team}_{selected_hole}"
+        )
+        scramble_to_par = scramble_score - hole_info['par']
+        st.markdown(f"To Par: **{format_score_to_par(scramble_to_par)}**")
+
+    with col2b:
+        alt_shot_score = st.number_input(
+            "Alternating Shot Score:", min_value=1, max_value=15,
+            value=existing_scores.get('alt_shot', hole_info['par']),
+            key=f"alt_shot_{selected_team}_{selected_hole}"
+        )
+        alt_shot_to_par = alt_shot_score - hole_info['par']
+        st.markdown(f"To Par: **{format_score_to_par(alt_shot_to_par)}**")
 
-        with col2a:
-            scramble_score = st.number_input(
-                "Scramble Score:", min_value=1, max_value=15,
-                value=existing_scores.get('scramble', hole_info['par']),
-                key=f"scramble_{selected_team}_{selected_hole}"
-            )
-            scramble_to_par = scramble_score - hole_info['par']
-            st.markdown(f"To Par: **{format_score_to_par(scramble_to_par)}**")
-
-        with col2b:
-            alt_shot_score = st.number_input(
-                "Alternating Shot Score:", min_value=1, max_value=15,
-                value=existing_scores.get('alt_shot', hole_info['par']),
-                key=f"alt_shot_{selected_team}_{selected_hole}"
-            )
-            alt_shot_to_par = alt_shot_score - hole_info['par']
-            st.markdown(f"To Par: **{format_score_to_par(alt_shot_to_par)}**")
+    if st.button("Save Scores", key=f"save_{selected_team}_{selected_hole}"):
+        if queue_day1_save(selected_team, selected_hole, scramble_score, alt_shot_score,
+                           expected_version=expected_version):
+            st.session_state.seen_versions[widget_key] = expected_version + 1
+        st.rerun()
 
-        if st.button("Save Scores", key=f"save_{selected_team}_{selected_hole}"):
-            save_day1_score(selected_team, selected_hole, scramble_score, alt_shot_score)
-            st.success(f"Scores saved for {selected_team} - Hole {selected_hole}")
-            time.sleep(1)
-            st.rerun()
 
+@st.fragment
+def _day1_team_scorecard(selected_team):
+    """Current scores + running totals for one team (reruns only with the app)."""
     st.markdown("### Current Scores")
     day1_scores = get_day1_scores()
     team_scores = [(data['hole'], data['scramble'], data['alt_shot'],
@@ -1591,10 +3335,10 @@ def day1_scoring_page():
 
     if team_scores:
         team_scores.sort(key=lambda x: x[0])
-        df = pd.DataFrame(team_scores, columns=['Hole', 'Scramble', 'Alt Shot', 'Par', 'Scramble To Par', 'Alt Shot To Par'])
-        df['Scramble To Par'] = df['Scramble To Par'].apply(format_score_to_par)
-        df['Alt Shot To Par'] = df['Alt Shot To Par'].apply(format_score_to_par)
-        show_table(df)
+        show_table([{'Hole': hole, 'Scramble': scramble, 'Alt Shot': alt_shot, 'Par': par,
+                     'Scramble To Par': format_score_to_par(scramble_to_par),
+                     'Alt Shot To Par': format_score_to_par(alt_shot_to_par)}
+                    for hole, scramble, alt_shot, par, scramble_to_par, alt_shot_to_par in team_scores])
 
         st.markdown("### Running Totals")
         scramble_total = sum(score[1] for score in team_scores)
@@ -1604,7 +3348,7 @@ def day1_scoring_page():
 
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Holes Completed", f"{holes_played}/18")
+            st.metric("Holes Completed", f"{holes_played}/{len(HOLES)}")
         with col2:
             st.metric("Scramble Total", f"{scramble_total} ({format_score_to_par(scramble_total - par_total)})")
         with col3:
@@ -1616,7 +3360,9 @@ def day1_scoring_page():
 def day2_scoring_page():
     """Day 2 scoring interface"""
     st.title("🎯 Day 2 Scoring - Skins Game")
-    st.markdown("**Format**: Individual play, lowest score wins the skin (18 holes)")
+    st.markdown(f"**Format**: Individual play, lowest score wins the skin ({len(DAY2_HOLES)} holes)")
+    show_save_status()
+    load_all_data()  # once per full run; the entry fragment reuses it between saves
 
     col1, col2 = st.columns([1, 2])
 
@@ -1626,70 +3372,82 @@ def day2_scoring_page():
 
         st.caption("**Group roster:**")
         _revealed = is_revealed()
+        lineup = group_lineups().get(selected_group, {}) if _revealed else {}
+        golfers = {}
         for team in TEAMS:
             if _revealed:
-                golfer = get_golfer_for_team_group(team, selected_group)
-                st.caption(f"{team}: {golfer or '— unassigned —'}")
+                golfers[team] = lineup.get(team)
+                st.caption(f"{team}: {golfers[team] or '— unassigned —'}")
             else:
+                golfers[team] = None
                 st.caption(f"{team}: 🔒 hidden until reveal")
 
     with col2:
-        hole_info = DAY2_COURSE[selected_hole]
-        points_value = calculate_hole_points_value(selected_group, selected_hole)
-
-        st.markdown(f"### Group {selected_group} - Hole {selected_hole}")
-        st.markdown(f"**Par {hole_info['par']} • {hole_info['yardage']} yards**")
-        if points_value > 1:
-            st.markdown(f"**🔥 Worth {points_value} points (carryover from ties!)**")
-        else:
-            st.markdown(f"**Worth {points_value} point**")
-
-        scores = {}
-        cols = st.columns(3)
-        for i, team in enumerate(TEAMS):
-            key = f"{selected_group}_{selected_hole}_{team}"
-            existing_score = st.session_state.get('day2_scores', {}).get(key, {}).get('score', hole_info['par'])
-            golfer = get_golfer_for_team_group(team, selected_group) if is_revealed() else None
-            label = f"{team} ({golfer}) Score:" if golfer else f"{team} Score:"
-
-            with cols[i]:
-                scores[team] = st.number_input(
-                    label, min_value=1, max_value=15,
-                    value=existing_score,
-                    key=f"score_{selected_group}_{selected_hole}_{team}"
-                )
-                team_to_par = scores[team] - hole_info['par']
-                st.markdown(f"To Par: **{format_score_to_par(team_to_par)}**")
-
-        if st.button("Save Scores", key=f"save_day2_{selected_group}_{selected_hole}"):
-            for team, score in scores.items():
-                save_day2_score(selected_group, selected_hole, team, score)
-            st.success(f"Scores saved for Group {selected_group} - Hole {selected_hole}")
-            time.sleep(1)
-            st.rerun()
-
-        skin_key = f"{selected_group}_{selected_hole}"
-        if skin_key in st.session_state.get('day2_skins', {}):
-            skin_info = st.session_state.day2_skins[skin_key]
-            if skin_info['tied']:
-                st.warning(f"🤝 Hole {selected_hole}: TIE - Skin carries over to next hole!")
-            else:
-                st.success(f"🏆 Hole {selected_hole}: **{skin_info['winner']}** wins {skin_info.get('points_value', 1)} point(s)!")
+        _day2_score_entry(selected_group, selected_hole, golfers)
 
     st.markdown(f"### Group {selected_group} Scorecard")
     display_group_scorecard(selected_group)
 
 
+@st.fragment
+def _day2_score_entry(selected_group, selected_hole, golfers):
+    """Score inputs + Save for one group/hole (reruns on its own)."""
+    hole_info = DAY2_COURSE[selected_hole]
+    points_value = calculate_hole_points_value(selected_group, selected_hole)
+
+    st.markdown(f"### Group {selected_group} - Hole {selected_hole}")
+    st.markdown(f"**Par {hole_info['par']} • {hole_info['yardage']} yards**")
+    if points_value > 1:
+        st.markdown(f"**🔥 Worth {points_value} points (carryover from ties!)**")
+    else:
+        st.markdown(f"**Worth {points_value} point**")
+
+    scores, versions = {}, {}
+    cols = st.columns(min(len(TEAMS), 4))   # bigger fields wrap onto more rows
+    for i, team in enumerate(TEAMS):
+        key = f"{selected_group}_{selected_hole}_{team}"
+        existing = live_data()['day2_scores'].get(key, {})
+        existing_score = existing.get('score', hole_info['par'])
+        versions[team] = _seen_version(f"score_{key}", existing.get('version', 0))
+        golfer = golfers.get(team)
+        label = f"{team} ({golfer}) Score:" if golfer else f"{team} Score:"
+
+        with cols[i % len(cols)]:
+            scores[team] = st.number_input(
+                label, min_value=1, max_value=15,
+                value=existing_score,
+                key=f"score_{key}"
+            )
+            team_to_par = scores[team] - hole_info['par']
+            st.markdown(f"To Par: **{format_score_to_par(team_to_par)}**")
+
+    if st.button("Save Scores", key=f"save_day2_{selected_group}_{selected_hole}"):
+        if queue_day2_saves(selected_group, selected_hole, scores, expected_versions=versions):
+            for team, version in versions.items():
+                st.session_state.seen_versions[f"score_{selected_group}_{selected_hole}_{team}"] = version + 1
+        st.rerun()
+
+    skin_key = f"{selected_group}_{selected_hole}"
+    if skin_key in live_data()['day2_skins']:
+        skin_info = live_data()['day2_skins'][skin_key]
+        if skin_info['tied']:
+            st.warning(f"🤝 Hole {selected_hole}: TIE - Skin carries over to next hole!")
+        else:
+            st.success(f"🏆 Hole {selected_hole}: **{skin_info['winner']}** wins {skin_info.get('points_value', 1)} point(s)!")
+
+
+@st.fragment
 def display_group_scorecard(group):
-    """Display scorecard for a specific group"""
+    """Display scorecard for a specific group (reruns only with the app)"""
     scorecard_data = []
+    data = live_data()
 
     for hole in DAY2_HOLES:
         hole_data = {'Hole': hole, 'Par': DAY2_COURSE[hole]['par']}
 
         for team in TEAMS:
             key = f"{group}_{hole}_{team}"
-            score = st.session_state.get('day2_scores', {}).get(key, {}).get('score', '-')
+            score = data['day2_scores'].get(key, {}).get('score', '-')
             if score != '-':
                 to_par = score - DAY2_COURSE[hole]['par']
                 hole_data[team] = f"{score} ({format_score_to_par(to_par)})"
@@ -1697,8 +3455,8 @@ def display_group_scorecard(group):
                 hole_data[team] = '-'
 
         skin_key = f"{group}_{hole}"
-        if skin_key in st.session_state.get('day2_skins', {}):
-            skin_info = st.session_state.day2_skins[skin_key]
+        if skin_key in data['day2_skins']:
+            skin_info = data['day2_skins'][skin_key]
             if skin_info['tied']:
                 hole_data['Skin Winner'] = 'TIE'
                 hole_data['Points'] = f"{skin_info.get('points_value', 1)} (carry)"
@@ -1712,120 +3470,141 @@ def display_group_scorecard(group):
         scorecard_data.append(hole_data)
 
     if scorecard_data:
-        df = pd.DataFrame(scorecard_data)
-        show_table(df)
+        show_table(scorecard_data)
 
 
-def leaderboard_page():
-    """Display live leaderboard"""
-    st.title("🏆 Live Leaderboard")
+def _leaderboard_standings():
+    """Standings, odds and Day 1 / Day 2 summaries."""
+    team_points, day1_results = calculate_leaderboard()
+
+    st.markdown("### Overall Team Standings")
+    race = clinch_standings(current_event(), data_version())
+    leaderboard_data = []
+    for team in TEAMS:
+        if day1_results['all_teams_complete']:
+            day1_scramble = day1_results['scramble_points'].get(team, 0)
+            day1_alt_shot = day1_results['alt_shot_points'].get(team, 0)
+            day1_total = day1_scramble + day1_alt_shot
+        else:
+            day1_total = 0
 
-    placeholder = st.empty()
+        day2_skins = live_data()['team_day2_points'].get(team, 0)
 
-    with placeholder.container():
-        team_points, day1_results = calculate_leaderboard()
+        outlook = race[team]
+        if outlook['status'] == 'clinched':
+            status = "🏆 Clinched"
+        elif outlook['status'] == 'eliminated':
+            status = "❌ Eliminated"
+        else:
+            status = f"{outlook['min_points']:g}–{outlook['max_points']:g} pts possible"
+
+        leaderboard_data.append({
+            'Team': team,
+            'Day 1 Points': f"{day1_total:.1f}" if day1_total > 0 else "Pending",
+            'Day 2 Skins': day2_skins,
+            'Total Points': f"{team_points[team]:.1f}",
+            'Status': status
+        })
+
+    leaderboard_data.sort(key=lambda x: float(x['Total Points']), reverse=True)
+    show_table(leaderboard_data)
+
+    if not day1_results['all_teams_complete']:
+        st.info("⏳ Day 1 points will be awarded once all teams complete their rounds")
+
+    st.markdown("### Win Probability")
+    version = data_version()
+    odds, current, error = win_probabilities_nowait(current_event(), version)
+    if error is not None:
+        st.caption(f"⚠️ Couldn't simulate the finish: {error}")
+    elif odds is None:
+        st.caption(f"⏳ Simulating {SIM_COUNT:,} finishes…")
+    else:
+        odds_rows = sorted(odds.items(), key=lambda x: x[1]['win_prob'], reverse=True)
+        st.markdown(_html_table(
+            ["Team", "Chance to Win", "Projected Points"],
+            [[team, f"{o['win_prob']:.1%}", f"{o['expected_points']:.1f}"] for team, o in odds_rows]
+        ), unsafe_allow_html=True)
+        st.caption(f"Based on {SIM_COUNT:,} simulated finishes of every unplayed hole, "
+                   "using past years' and this year's scoring."
+                   + ("" if current or error else " ⏳ Updating for the latest scores…"))
+    if not current and error is None:
+        _win_prob_poll(current_event(), version)
+
+    st.markdown("### Day 1 Current Standings")
+    col1, col2 = st.columns(2)
 
-        st.markdown("### Overall Team Standings")
-        leaderboard_data = []
+    with col1:
+        st.markdown("#### Scramble Competition")
+        scramble_data = []
         for team in TEAMS:
-            if day1_results['all_teams_complete']:
-                day1_scramble = day1_results['scramble_points'].get(team, 0)
-                day1_alt_shot = day1_results['alt_shot_points'].get(team, 0)
-                day1_total = day1_scramble + day1_alt_shot
+            team_data = day1_results['team_totals'][team]
+            holes_played = team_data['holes_completed']
+            if holes_played > 0:
+                total_score = team_data['scramble']
+                to_par = team_data['scramble_to_par']
+                scramble_data.append({
+                    'Team': team,
+                    'Score': f"{total_score} ({format_score_to_par(to_par)})",
+                    'Holes': f"{holes_played}/{len(HOLES)}"
+                })
             else:
-                day1_total = 0
+                scramble_data.append({'Team': team, 'Score': 'No scores', 'Holes': f"0/{len(HOLES)}"})
 
-            day2_skins = st.session_state.get('team_day2_points', {}).get(team, 0)
+        scramble_data.sort(key=lambda x: (
+            -int(x['Holes'].split('/')[0]),
+            int(x['Score'].split(' (')[0]) if x['Score'] != 'No scores' else 999
+        ))
+        show_table(scramble_data)
 
-            leaderboard_data.append({
-                'Team': team,
-                'Day 1 Points': f"{day1_total:.1f}" if day1_total > 0 else "Pending",
-                'Day 2 Skins': day2_skins,
-                'Total Points': f"{team_points[team]:.1f}"
-            })
+    with col2:
+        st.markdown("#### Alternating Shot Competition")
+        alt_shot_data = []
+        for team in TEAMS:
+            team_data = day1_results['team_totals'][team]
+            holes_played = team_data['holes_completed']
+            if holes_played > 0:
+                total_score = team_data['alt_shot']
+                to_par = team_data['alt_shot_to_par']
+                alt_shot_data.append({
+                    'Team': team,
+                    'Score': f"{total_score} ({format_score_to_par(to_par)})",
+                    'Holes': f"{holes_played}/{len(HOLES)}"
+                })
+            else:
+                alt_shot_data.append({'Team': team, 'Score': 'No scores', 'Holes': f"0/{len(HOLES)}"})
 
-        leaderboard_data.sort(key=lambda x: float(x['Total Points']), reverse=True)
-        df_leaderboard = pd.DataFrame(leaderboard_data)
-        show_table(df_leaderboard)
+        alt_shot_data.sort(key=lambda x: (
+            -int(x['Holes'].split('/')[0]),
+            int(x['Score'].split(' (')[0]) if x['Score'] != 'No scores' else 999
+        ))
+        show_table(alt_shot_data)
 
-        if not day1_results['all_teams_complete']:
-            st.info("⏳ Day 1 points will be awarded once all teams complete their rounds")
+    st.markdown("### Day 2 Skins Summary")
+    summary_rows = []
+    for row in skins_summary(live_data()['day2_skins']):
+        summary_rows.append({
+            'Group': f"Group {row['group']}",
+            'Holes Played': f"{row['holes_played']}/{len(DAY2_HOLES)}",
+            **row['points'],
+        })
 
-        st.markdown("### Day 1 Current Standings")
-        col1, col2 = st.columns(2)
+    show_table(summary_rows)
 
-        with col1:
-            st.markdown("#### Scramble Competition")
-            scramble_data = []
-            for team in TEAMS:
-                team_data = day1_results['team_totals'][team]
-                holes_played = team_data['holes_completed']
-                if holes_played > 0:
-                    total_score = team_data['scramble']
-                    to_par = team_data['scramble_to_par']
-                    scramble_data.append({
-                        'Team': team,
-                        'Score': f"{total_score} ({format_score_to_par(to_par)})",
-                        'Holes': f"{holes_played}/18"
-                    })
-                else:
-                    scramble_data.append({'Team': team, 'Score': 'No scores', 'Holes': '0/18'})
 
-            scramble_data.sort(key=lambda x: (
-                -int(x['Holes'].split('/')[0]),
-                int(x['Score'].split(' (')[0]) if x['Score'] != 'No scores' else 999
-            ))
-            df_scramble = pd.DataFrame(scramble_data)
-            show_table(df_scramble)
+# Same standings, re-run by the browser every 30s while auto-refresh is on -
+# no server thread sits in time.sleep() waiting for the next refresh.
+_leaderboard_standings_live = st.fragment(run_every=30)(_leaderboard_standings)
 
-        with col2:
-            st.markdown("#### Alternating Shot Competition")
-            alt_shot_data = []
-            for team in TEAMS:
-                team_data = day1_results['team_totals'][team]
-                holes_played = team_data['holes_completed']
-                if holes_played > 0:
-                    total_score = team_data['alt_shot']
-                    to_par = team_data['alt_shot_to_par']
-                    alt_shot_data.append({
-                        'Team': team,
-                        'Score': f"{total_score} ({format_score_to_par(to_par)})",
-                        'Holes': f"{holes_played}/18"
-                    })
-                else:
-                    alt_shot_data.append({'Team': team, 'Score': 'No scores', 'Holes': '0/18'})
-
-            alt_shot_data.sort(key=lambda x: (
-                -int(x['Holes'].split('/')[0]),
-                int(x['Score'].split(' (')[0]) if x['Score'] != 'No scores' else 999
-            ))
-            df_alt_shot = pd.DataFrame(alt_shot_data)
-            show_table(df_alt_shot)
-
-        st.markdown("### Day 2 Skins Summary")
-        skins_summary = []
-        for group in GROUPS:
-            skins_played = sum(1 for key in st.session_state.get('day2_skins', {}).keys()
-                              if key.startswith(f"{group}_"))
-            group_skins = {team: 0 for team in TEAMS}
-
-            for skin_data in st.session_state.get('day2_skins', {}).values():
-                if (skin_data['group'] == group and
-                    skin_data['winner'] and
-                    not skin_data['tied']):
-                    points = skin_data.get('points_value', 1)
-                    group_skins[skin_data['winner']] += points
-
-            skins_summary.append({
-                'Group': f"Group {group}",
-                'Holes Played': f"{skins_played}/18",
-                'Young Guns': group_skins['Young Guns'],
-                'OGs': group_skins['OGs'],
-                'Mids': group_skins['Mids']
-            })
 
-        df_skins = pd.DataFrame(skins_summary)
-        show_table(df_skins)
+def leaderboard_page():
+    """Display live leaderboard"""
+    st.title("🏆 Live Leaderboard")
+
+    if st.session_state.get('leaderboard_auto_refresh'):
+        _leaderboard_standings_live()
+    else:
+        _leaderboard_standings()
 
     col1, col2, col3 = st.columns([1, 1, 2])
 
@@ -1834,26 +3613,101 @@ def leaderboard_page():
             st.rerun()
 
     with col2:
-        auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
+        st.checkbox("Auto-refresh (30s)", value=False, key="leaderboard_auto_refresh")
 
     with col3:
         st.markdown("*Leaderboard updates automatically when scores are saved*")
 
-    if auto_refresh:
-        time.sleep(30)
-        st.rerun()
+
+# Session keys that belong to this tab rather than to one event; everything
+# else (typed scores, seen versions, conflicts, reveal progress...) is
+# dropped when the tab switches event.
+_TAB_SESSION_KEYS = {'session_id', 'event_id', 'pending_saves', 'submitted_tokens'}
+
+
+def select_event():
+    """Sidebar event selector (only shown when the server hosts more than one).
+
+    Sets st.session_state.event_id, which current_event() reads."""
+    events = list_events()
+    if st.session_state.get('event_id') not in events:
+        requested = st.query_params.get('event')
+        st.session_state.event_id = requested if requested in events else DEFAULT_EVENT
+    if len(events) > 1:
+        choice = st.sidebar.selectbox("Event:", events, index=events.index(st.session_state.event_id),
+                                      format_func=lambda e: "The Gentlemen's Cup" if e == DEFAULT_EVENT else e)
+        if choice != st.session_state.event_id:
+            for key in [k for k in st.session_state if k not in _TAB_SESSION_KEYS]:
+                del st.session_state[key]
+            st.session_state.event_id = choice
+        st.query_params['event'] = choice
+    return st.session_state.event_id
+
+
+# ---------------------------------------------------------------------------
+# Startup
+# ---------------------------------------------------------------------------
+# A reboot or redeploy starts a fresh process, and the first visitor waits
+# for everything main() does before the page appears. That path is kept
+# short, and measured:
+#   - pandas isn't imported at all, and numpy (archive.py / winprob.py) only
+#     by the functions that need it;
+#   - the schema pass is skipped when the file is already at SCHEMA_VERSION;
+#   - the startup skins check and replica snapshot run on their background
+#     threads, and so does a win-probability simulation the Leaderboard
+#     doesn't have cached yet (win_probabilities_nowait);
+#   - interrupted writes are looked for at most once per FLUSH_GRACE_SECONDS
+#     (anything younger isn't treated as interrupted anyway).
+# startup_report() has the numbers - sidebar "Show startup timings", and one
+# log line per event.
+@st.cache_resource
+def _startup_state(event):
+    return {'phases': {}, 'schema': None, 'first_render_ms': None, 'flushed_at': 0.0}
+
+
+def _startup_step(state, name, fn, *args):
+    """Run one startup step, timing it on the event's first run."""
+    started = time.perf_counter()
+    result = fn(*args)
+    if state['first_render_ms'] is None:
+        state['phases'][name] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def _flush_if_due(state):
+    now = time.time()
+    if now - state['flushed_at'] >= FLUSH_GRACE_SECONDS:
+        state['flushed_at'] = now
+        flush_pending_writes()
+
+
+def startup_report(event=None):
+    """{'phases': {step: ms}, 'schema', 'first_render_ms'} for an event's first run in this process."""
+    state = _startup_state(event or current_event())
+    return {'phases': dict(state['phases']), 'schema': state['schema'],
+            'first_render_ms': state['first_render_ms']}
 
 
 def main():
     """Main application"""
-    get_db()               # ensure the database + schema exist
-    flush_pending_writes()  # retry anything left over from an interrupted write
-
     st.sidebar.title("🏌️‍♂️ The Gentlemen's Cup")
+    event = select_event()
+
+    state = _startup_state(event)
+    if state['first_render_ms'] is None:
+        state['phases']['script'] = round((time.perf_counter() - _RUN_STARTED) * 1000, 1)
+    _startup_step(state, 'open_db', get_db)  # ensure this event's database + schema exist
+    _startup_step(state, 'flush', _flush_if_due, state)  # retry anything left over from an interrupted write
+    _startup_step(state, 'skins_verifier', start_skins_verifier, event)  # skins check (+ timer), in the background
+    start_golfer_sync(event)  # golfer_seasons rebuilds, in the background
+    start_spectator_server()  # read-only standings JSON (if GCUP_SPECTATOR_PORT is set)
+    _startup_step(state, 'replicator', start_replicator, event)  # ship every write to GCUP_REPLICA_DIR (if set)
+    start_checkpointer(event)  # WAL checkpoints off the request path, when writes pause
+
     page = st.sidebar.radio(
         "Navigate:",
         ["🏆 Leaderboard", "📊 Day 1 Scoring", "🎯 Day 2 Scoring", "⛳ Individual Skins",
-         "⚙️ Team Setup", "🎭 Grand Reveal", "📜 Tournament History"]
+         "📈 Hole Stats", "⚙️ Team Setup", "🎭 Grand Reveal", "📜 Tournament History"]
     )
 
     st.sidebar.divider()
@@ -1867,6 +3721,8 @@ def main():
         day2_scoring_page()
     elif page == "⛳ Individual Skins":
         golfer_skins_page()
+    elif page == "📈 Hole Stats":
+        hole_stats_page()
     elif page == "⚙️ Team Setup":
         team_setup_page()
     elif page == "🎭 Grand Reveal":
@@ -1874,6 +3730,11 @@ def main():
     elif page == "📜 Tournament History":
         history_page()
 
+    if state['first_render_ms'] is None:
+        state['first_render_ms'] = round((time.perf_counter() - _RUN_STARTED) * 1000, 1)
+        logger.info("startup [%s]: first render %.0f ms, schema %s, %s", event, state['first_render_ms'],
+                    state['schema'], ", ".join(f"{name} {ms:.0f} ms" for name, ms in state['phases'].items()))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Compact sidecars for the history/<year>_results.json files.
+
+The JSON files stay the source of truth - hand-edited and checked in. Next
+to them, in a cache directory, each year gets a sidecar pair built from it:
+
+  <year>.summary.json   the file without raw_data (all the History page needs)
+  <year>.raw.npz        raw_data as one array per column, no repeated keys
+
+A sidecar records the size and mtime of the JSON it was built from and is
+rebuilt (best effort - a read-only checkout just keeps parsing the JSON)
+whenever those change. Loading a year's summary is then a small file
+however many raw rows it has, and raw rows are read per table / column
+only when something asks for them.
+
+    summary = load_summary(path)               # dict, no 'raw_data'
+    for row in iter_raw(path, 'day2_scores'):  # same dicts as in the JSON
+        ...
+
+Rows come back with the JSON's keys and values; a key that was missing or
+null in the JSON is left out of the row. Like scoring.py there's no
+Streamlit in here.
+"""
+
+import json
+import os
+
+import numpy as np
+
+SIDECAR_VERSION = 1
+
+
+def sidecar_paths(json_path, cache_dir):
+    base = os.path.join(cache_dir, os.path.basename(json_path).split('_')[0])
+    return base + ".summary.json", base + ".raw.npz"
+
+
+def _source_stamp(json_path):
+    st = os.stat(json_path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'version': SIDECAR_VERSION}
+
+
+def _column_kind(values):
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return 'int'
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return 'float'
+    if all(isinstance(v, str) for v in present):
+        return 'str'
+    return 'json'
+
+
+def _encode_column(values, kind):
+    if kind == 'int':
+        return np.array([0 if v is None else v for v in values], dtype=np.int64)
+    if kind == 'float':
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if kind == 'str':
+        return np.array(['' if v is None else v for v in values], dtype=str)
+    return np.array(['' if v is None else json.dumps(v) for v in values], dtype=str)
+
+
+def _decode_value(value, kind):
+    if kind == 'int':
+        return int(value)
+    if kind == 'float':
+        return float(value)
+    if kind == 'str':
+        return str(value)
+    return json.loads(value)
+
+
+def build_sidecar(json_path, cache_dir, data=None):
+    """Write the summary + columnar raw sidecars for one history file.
+    data: the file's already-parsed contents, if the caller has them."""
+    if data is None:
+        with open(json_path, encoding='utf-8') as f:
+            data = json.load(f)
+    raw = data.get('raw_data') or {}
+    columns, arrays = {}, {}
+    for table, rows in raw.items():
+        if not isinstance(rows, list):
+            continue
+        names = list(dict.fromkeys(key for row in rows for key in row))
+        columns[table] = {'rows': len(rows), 'columns': {}}
+        for i, name in enumerate(names):
+            values = [row.get(name) for row in rows]
+            kind = _column_kind(values)
+            columns[table]['columns'][name] = kind
+            arrays[f"{table}.{i}"] = _encode_column(values, kind)
+            arrays[f"{table}.{i}.null"] = np.array([v is None for v in values], dtype=bool)
+
+    summary = {k: v for k, v in data.items() if k != 'raw_data'}
+    summary_path, raw_path = sidecar_paths(json_path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write the arrays first, then the summary that vouches for them.
+    with open(raw_path + ".tmp", 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(raw_path + ".tmp", raw_path)
+    with open(summary_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({'source': _source_stamp(json_path), 'raw_tables': columns, 'summary': summary}, f)
+    os.replace(summary_path + ".tmp", summary_path)
+    return summary
+
+
+def _fresh_sidecar(json_path, cache_dir):
+    """The sidecar's summary document if it matches the JSON, else None."""
+    summary_path, raw_path = sidecar_paths(json_path, cache_dir)
+    try:
+        with open(summary_path, encoding='utf-8') as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if doc.get('source') != _source_stamp(json_path) or not os.path.exists(raw_path):
+        return None
+    return doc
+
+
+def load_summary(json_path, cache_dir):
+    """A history file without its raw_data, from the sidecar when it's fresh."""
+    doc = _fresh_sidecar(json_path, cache_dir)
+    if doc is not None:
+        return doc['summary']
+    with open(json_path, encoding='utf-8') as f:
+        data = json.load(f)
+    try:
+        return build_sidecar(json_path, cache_dir, data)
+    except OSError:
+        return {k: v for k, v in data.items() if k != 'raw_data'}
+
+
+def raw_tables(json_path, cache_dir):
+    """[table names] in a history file's raw_data."""
+    doc = _fresh_sidecar(json_path, cache_dir)
+    if doc is None:
+        load_summary(json_path, cache_dir)
+        doc = _fresh_sidecar(json_path, cache_dir)
+    if doc is None:
+        with open(json_path, encoding='utf-8') as f:
+            return [t for t, rows in (json.load(f).get('raw_data') or {}).items() if isinstance(rows, list)]
+    return list(doc['raw_tables'])
+
+
+def iter_raw(json_path, cache_dir, table, columns=None):
+    """Yield one raw_data table's rows as dicts, optionally only some columns.
+
+    Reads just that table's columns out of the sidecar (building it first if
+    it's stale); falls back to the JSON itself if no sidecar can be written.
+    """
+    doc = _fresh_sidecar(json_path, cache_dir)
+    if doc is None:
+        load_summary(json_path, cache_dir)
+        doc = _fresh_sidecar(json_path, cache_dir)
+    if doc is None:
+        with open(json_path, encoding='utf-8') as f:
+            rows = (json.load(f).get('raw_data') or {}).get(table) or []
+        for row in rows:
+            yield {k: v for k, v in row.items() if v is not None and (columns is None or k in columns)}
+        return
+
+    spec = doc['raw_tables'].get(table)
+    if not spec:
+        return
+    wanted = [(i, name, kind) for i, (name, kind) in enumerate(spec['columns'].items())
+              if columns is None or name in columns]
+    with np.load(sidecar_paths(json_path, cache_dir)[1]) as npz:
+        data = [(name, kind, npz[f"{table}.{i}"].tolist(), npz[f"{table}.{i}.null"].tolist())
+                for i, name, kind in wanted]
+    for r in range(spec['rows']):
+        yield {name: _decode_value(values[r], kind) for name, kind, values, nulls in data if not nulls[r]}
+
+
+def load_raw(json_path, cache_dir):
+    """{table: [rows]} - a history file's whole raw_data, via the sidecar."""
+    return {table: list(iter_raw(json_path, cache_dir, table)) for table in raw_tables(json_path, cache_dir)}
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Format engines for The Gentlemen's Cup.
+
+Each competition format is an engine that keeps its own running state and
+is fed one score at a time: update() takes a single score change and
+returns only the points it moved, {team: delta}. Saving a score therefore
+costs what that one score can affect - a stroke total, one stableford
+hole, the few skins holes a carryover reaches - never a replay of the
+whole round.
+
+Every engine works in "units": independent competitions whose points add
+up - the Day 1 formats (scramble / alt shot) for stroke play, the Day 2
+groups for skins, individual matches for match play.
+
+    engine = SkinsEngine(TEAMS, DAY2_HOLES)
+    engine.update(group, hole, team, score)   # -> {'OGs': 2}
+    engine.points()                            # -> {team: running total}
+
+Rules match scoring.py (ties split position points, skins carry over until
+a hole is won or skipped); scripts/check_scoring.py holds every engine to a
+reference implementation. Like scoring.py there's no Streamlit or database
+dependency.
+"""
+
+from scoring import award_points_with_ties, is_valid_score
+
+
+class FormatEngine:
+    """Base for every format: running points per team plus the update() contract."""
+
+    name = None
+
+    def __init__(self, teams, holes):
+        self.teams = list(teams)
+        self.holes = sorted(holes)
+        self.totals = {team: 0 for team in self.teams}
+
+    def update(self, unit, hole, team, score):
+        """Set one score (None or 0 clears it). Returns {team: points delta}, non-zero only."""
+        raise NotImplementedError
+
+    def points(self):
+        return dict(self.totals)
+
+    def load(self, rows):
+        """Feed many (unit, hole, team, score) rows - e.g. on startup."""
+        for row in rows:
+            self.update(*row)
+        return self.points()
+
+    def _apply(self, old, new):
+        """Move totals from one {team: points} award to another; returns the deltas."""
+        deltas = {}
+        for team in set(old) | set(new):
+            delta = new.get(team, 0) - old.get(team, 0)
+            if delta:
+                deltas[team] = delta
+                self.totals[team] = self.totals.get(team, 0) + delta
+        return deltas
+
+
+class StrokePlayEngine(FormatEngine):
+    """Lowest total wins; position points (ties split) once every team has finished.
+
+    A unit is one stroke-play competition, e.g. 'scramble' or 'alt_shot'.
+    Each update adjusts that unit's running totals in O(1); the position
+    points are re-awarded (one sort) only while the unit is complete.
+    """
+
+    name = 'stroke'
+
+    def __init__(self, teams, holes, point_values):
+        super().__init__(teams, holes)
+        self.point_values = list(point_values)
+        self._cells = {}      # unit -> {(hole, team): score}
+        self._strokes = {}    # unit -> {team: total}
+        self._played = {}     # unit -> {team: holes}
+        self._awarded = {}    # unit -> {team: position points}
+
+    def update(self, unit, hole, team, score):
+        cells = self._cells.setdefault(unit, {})
+        strokes = self._strokes.setdefault(unit, {t: 0 for t in self.teams})
+        played = self._played.setdefault(unit, {t: 0 for t in self.teams})
+        old = cells.pop((hole, team), None)
+        if old is not None:
+            strokes[team] -= old
+            played[team] -= 1
+        if is_valid_score(score):
+            cells[(hole, team)] = score
+            strokes[team] += score
+            played[team] += 1
+
+        before = self._awarded.get(unit, {})
+        after = award_points_with_ties(strokes, self.point_values) if self.complete(unit) else {}
+        self._awarded[unit] = after
+        return self._apply(before, after)
+
+    def complete(self, unit):
+        played = self._played.get(unit, {})
+        return all(played.get(t, 0) == len(self.holes) for t in self.teams)
+
+    def strokes(self, unit):
+        """{team: (total strokes, holes played)} for one unit."""
+        return {t: (self._strokes.get(unit, {}).get(t, 0), self._played.get(unit, {}).get(t, 0))
+                for t in self.teams}
+
+    def unit_points(self, unit):
+        return dict(self._awarded.get(unit, {}))
+
+
+class SkinsEngine(FormatEngine):
+    """Lowest score wins the hole outright; ties carry the skin over.
+
+    A unit is one group. A hole is worth 1 + the value of the hole right
+    before it if that one was tied, so a changed score only re-scores holes
+    from there forward, and stops at the first hole whose result comes out
+    the same - everything after it is unaffected. `changed` lists the
+    (unit, hole, result or None) rows the last update touched, so callers
+    can persist just those.
+    """
+
+    name = 'skins'
+
+    def __init__(self, teams, holes):
+        super().__init__(teams, holes)
+        self._scores = {}     # unit -> {hole: {team: score}}
+        self._results = {}    # unit -> {hole: result}
+        self._next = {h: n for h, n in zip(self.holes, self.holes[1:])}
+        self.changed = []
+
+    def seed(self, unit, scores, results=None):
+        """Adopt a unit's state wholesale. scores: {hole: {team: score}};
+        results: its current {hole: result} (replayed here if not given)."""
+        self._apply(self._won_points(unit), {})
+        self._scores[unit] = {h: dict(s) for h, s in scores.items()}
+        self._results[unit] = {}
+        if results is None:
+            self.rescore(unit, self.holes[0] if self.holes else None, full=True)
+        else:
+            self._results[unit] = {h: dict(r) for h, r in results.items()}
+            self._apply({}, self._won_points(unit))
+        self.changed = []
+
+    def update(self, unit, hole, team, score):
+        hole_scores = self._scores.setdefault(unit, {}).setdefault(hole, {})
+        if is_valid_score(score):
+            hole_scores[team] = score
+        else:
+            hole_scores.pop(team, None)
+        return self.rescore(unit, hole)
+
+    def rescore(self, unit, start_hole, full=False):
+        """Re-score holes from start_hole on until one comes out unchanged
+        (full=True re-scores to the end). Returns {team: points delta}."""
+        results = self._results.setdefault(unit, {})
+        self.changed = []
+        old_award, new_award = {}, {}
+        hole = start_hole
+        while hole is not None:
+            old, new = results.get(hole), self._score_hole(unit, hole)
+            if old == new and not full:
+                break
+            if new is None:
+                results.pop(hole, None)
+            else:
+                results[hole] = new
+            if old != new:
+                self.changed.append((unit, hole, new))
+            for award, result in ((old_award, old), (new_award, new)):
+                if result and not result['tied']:
+                    award[result['winner']] = award.get(result['winner'], 0) + result['points_value']
+            hole = self._next.get(hole)
+        return self._apply(old_award, new_award)
+
+    def results(self, unit):
+        """{hole: result} for one unit, ties included (same shape as scoring.replay_group_skins)."""
+        return dict(self._results.get(unit, {}))
+
+    def _score_hole(self, unit, hole):
+        hole_scores = self._scores.get(unit, {}).get(hole, {})
+        if len(hole_scores) < 2:
+            return None
+        low = min(hole_scores.values())
+        winners = [t for t in self.teams if hole_scores.get(t) == low]
+        prev = self._results.get(unit, {}).get(hole - 1)
+        points_value = 1 + (prev['points_value'] if prev and prev['tied'] else 0)
+        tied = len(winners) != 1
+        return {'group': unit, 'hole': hole, 'winner': None if tied else winners[0],
+                'score': low, 'tied': tied, 'points_value': points_value}
+
+    def _won_points(self, unit):
+        won = {}
+        for result in self._results.get(unit, {}).values():
+            if not result['tied']:
+                won[result['winner']] = won.get(result['winner'], 0) + result['points_value']
+        return won
+
+
+# Points for a hole by strokes relative to par (anything worse scores 0).
+STABLEFORD_POINTS = {-3: 5, -2: 4, -1: 3, 0: 2, 1: 1}
+
+
+class StablefordEngine(FormatEngine):
+    """Points per hole from the score relative to par, highest total wins.
+
+    Every hole stands alone, so an update is a single table lookup.
+    """
+
+    name = 'stableford'
+
+    def __init__(self, teams, holes, pars, table=None):
+        super().__init__(teams, holes)
+        self.pars = dict(pars)
+        self.table = dict(table or STABLEFORD_POINTS)
+        self._best = min(self.table)
+        self._cells = {}      # (unit, hole, team) -> points
+
+    def hole_points(self, hole, score):
+        if not is_valid_score(score):
+            return 0
+        return self.table.get(max(score - self.pars[hole], self._best), 0)
+
+    def update(self, unit, hole, team, score):
+        old = self._cells.pop((unit, hole, team), 0)
+        new = self.hole_points(hole, score)
+        if new:
+            self._cells[(unit, hole, team)] = new
+        return self._apply({team: old}, {team: new})
+
+
+class MatchPlayEngine(FormatEngine):
+    """Head-to-head by holes won; the match is worth win_points once decided.
+
+    A unit is one match, pairings = {unit: (team_a, team_b)}. A match is
+    decided when the lead is bigger than the holes left, or when every hole
+    is in (level = halved, half the points each). Each update touches one
+    hole and the match's running margin.
+    """
+
+    name = 'match_play'
+
+    def __init__(self, pairings, holes, win_points=1):
+        teams = []
+        for pair in pairings.values():
+            teams += [t for t in pair if t not in teams]
+        super().__init__(teams, holes)
+        self.pairings = dict(pairings)
+        self.win_points = win_points
+        self._scores = {}     # unit -> {hole: {team: score}}
+        self._margin = {unit: 0 for unit in self.pairings}    # holes up for team_a
+        self._decided = {unit: 0 for unit in self.pairings}   # holes with both scores in
+        self._awarded = {}
+
+    def _hole_margin(self, unit, hole):
+        a, b = self.pairings[unit]
+        scores = self._scores.get(unit, {}).get(hole, {})
+        if a not in scores or b not in scores:
+            return None
+        return (scores[a] < scores[b]) - (scores[a] > scores[b])
+
+    def update(self, unit, hole, team, score):
+        if team not in self.pairings.get(unit, ()):
+            return {}
+        before_hole = self._hole_margin(unit, hole)
+        hole_scores = self._scores.setdefault(unit, {}).setdefault(hole, {})
+        if is_valid_score(score):
+            hole_scores[team] = score
+        else:
+            hole_scores.pop(team, None)
+        after_hole = self._hole_margin(unit, hole)
+        self._margin[unit] += (after_hole or 0) - (before_hole or 0)
+        self._decided[unit] += (after_hole is not None) - (before_hole is not None)
+
+        before = self._awarded.get(unit, {})
+        after = self.result(unit)
+        self._awarded[unit] = after
+        return self._apply(before, after)
+
+    def result(self, unit):
+        """{team: points} if the match is decided, else {}."""
+        a, b = self.pairings[unit]
+        margin, left = self._margin[unit], len(self.holes) - self._decided[unit]
+        if abs(margin) > left:
+            return {a if margin > 0 else b: self.win_points}
+        if left == 0:
+            return {a: self.win_points / 2, b: self.win_points / 2}
+        return {}
+
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+Data access for The Gentlemen's Cup.
+
+Every query and write the app runs against SQLite lives here (the schema and
+migrations stay with get_db() in app.py). Statements are fixed strings, so
+sqlite3's per-connection statement cache (see STATEMENT_CACHE_SIZE) prepares
+each one once and reuses it on every later call. Bulk variants -
+get_all_assignments(), get_all_day1_roles(), upsert_many() - replace
+per-team loops of single-row queries.
+
+Functions take the connection first and never commit: the caller decides
+the transaction (_db_lock + commit on the shared connection, or
+_transaction() on a write connection). Every public function is timed;
+call_stats() returns the running totals.
+
+Like scoring.py there's no Streamlit in here.
+"""
+
+import functools
+import threading
+import time
+
+STATEMENT_CACHE_SIZE = 256   # pass as sqlite3.connect(cached_statements=...)
+DATA_VERSION_KEY = 'data_version'   # meta row holding the data version counter
+
+# Primary key of every table upsert_many() may write to.
+TABLE_KEYS = {
+    'day1_scores': ('team', 'hole'),
+    'day2_scores': ('group_num', 'hole', 'team'),
+    'day2_skins': ('group_num', 'hole'),
+    'roster': ('team', 'golfer'),
+    'day1_roles': ('team', 'slot'),
+    'day2_assignments': ('team', 'golfer'),
+    'meta': ('key',),
+    'golfer_aliases': ('alias',),
+    'golfer_seasons': ('golfer_id', 'year', 'team'),
+}
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _timed(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with _stats_lock:
+                s = _stats.setdefault(fn.__name__, {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                s['calls'] += 1
+                s['total_ms'] += elapsed
+                s['max_ms'] = max(s['max_ms'], elapsed)
+    return wrapper
+
+
+def call_stats():
+    """{function: {'calls', 'total_ms', 'max_ms'}}, busiest first."""
+    with _stats_lock:
+        return dict(sorted(((k, dict(v)) for k, v in _stats.items()),
+                           key=lambda kv: kv[1]['total_ms'], reverse=True))
+
+
+# ---------------------------------------------------------------------------
+# Scores + skins
+# ---------------------------------------------------------------------------
+@_timed
+def get_day1_rows(conn):
+    return conn.execute("SELECT * FROM day1_scores").fetchall()
+
+
+@_timed
+def get_day2_rows(conn):
+    return conn.execute("SELECT * FROM day2_scores").fetchall()
+
+
+@_timed
+def get_won_skin_rows(conn):
+    return conn.execute("SELECT * FROM day2_skins WHERE winner IS NOT NULL").fetchall()
+
+
+@_timed
+def get_group_scores(conn, groups):
+    marks = ",".join("?" * len(groups))
+    return conn.execute(f"SELECT group_num, hole, team, score FROM day2_scores "
+                        f"WHERE group_num IN ({marks})", list(groups)).fetchall()
+
+
+@_timed
+def get_day1_score(conn, team, hole):
+    """(scramble_score, alt_shot_score) for one Day 1 row, or (None, None)."""
+    row = conn.execute("SELECT scramble_score, alt_shot_score FROM day1_scores WHERE team = ? AND hole = ?",
+                       (team, hole)).fetchone()
+    return (row['scramble_score'], row['alt_shot_score']) if row else (None, None)
+
+
+@_timed
+def get_day2_score(conn, group, hole, team):
+    row = conn.execute("SELECT score FROM day2_scores WHERE group_num = ? AND hole = ? AND team = ?",
+                       (group, hole, team)).fetchone()
+    return row['score'] if row else None
+
+
+@_timed
+def get_group_skins(conn, groups):
+    marks = ",".join("?" * len(groups))
+    return conn.execute(f"SELECT * FROM day2_skins WHERE group_num IN ({marks})", list(groups)).fetchall()
+
+
+@_timed
+def get_golfer_day2_stats(conn, pars):
+    """Per-golfer Day 2 totals in one joined query over day2_scores,
+    day2_skins and day2_assignments. pars: {hole: par}.
+
+    The golfer is the one stamped on the score row, else whoever is assigned
+    to that team + group now, else "<team> (Group <n>)". Rows: golfer, team,
+    group_num, holes, strokes, to_par, birdies (birdie or better),
+    holes_won, skins (points value of the skins won).
+    """
+    par_values = ", ".join("(?, ?)" for _ in pars)
+    return conn.execute(f"""
+        WITH par(hole, par) AS (VALUES {par_values}),
+        lineup AS (SELECT team, group_num, MIN(golfer) AS golfer FROM day2_assignments
+                   WHERE group_num IS NOT NULL GROUP BY team, group_num)
+        SELECT COALESCE(s.golfer, l.golfer, s.team || ' (Group ' || s.group_num || ')') AS golfer,
+               s.team, MIN(s.group_num) AS group_num, COUNT(*) AS holes,
+               SUM(s.score) AS strokes, SUM(s.score - p.par) AS to_par,
+               SUM(s.score < p.par) AS birdies, COUNT(k.hole) AS holes_won,
+               COALESCE(SUM(k.points_value), 0) AS skins
+        FROM day2_scores s
+        JOIN par p ON p.hole = s.hole
+        LEFT JOIN lineup l ON l.team = s.team AND l.group_num = s.group_num
+        LEFT JOIN day2_skins k ON k.group_num = s.group_num AND k.hole = s.hole AND k.winner = s.team
+        WHERE s.score > 0
+        GROUP BY 1, s.team""", [v for item in sorted(pars.items()) for v in item]).fetchall()
+
+
+@_timed
+def cas_upsert(conn, table, keys, values, compare, expected_version):
+    """Insert or update one row, but only if it's still at expected_version.
+
+    expected_version=None writes unconditionally. If the row has moved on but
+    already holds the same `compare` values, that's not a conflict. Returns
+    None on success, or {'theirs': {...}, 'version': n} on a conflict.
+    """
+    where = " AND ".join(f"{k} = ?" for k in keys)
+    row = conn.execute(f"SELECT {', '.join(values)}, version FROM {table} WHERE {where}",
+                       tuple(keys.values())).fetchone()
+    if row is None:
+        cols = list(keys) + list(values)
+        conn.execute(f"INSERT INTO {table} ({', '.join(cols)}, version) VALUES ({', '.join('?' * len(cols))}, 1)",
+                     tuple(keys.values()) + tuple(values.values()))
+        return None
+    if expected_version is not None and row['version'] != expected_version:
+        theirs = {c: row[c] for c in values}
+        if all(theirs[c] == values[c] for c in compare):
+            return None
+        return {'theirs': theirs, 'version': row['version']}
+    conn.execute(f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in values)}, version = version + 1 "
+                 f"WHERE {where}", tuple(values.values()) + tuple(keys.values()))
+    return None
+
+
+@_timed
+def delete_skins(conn, holes):
+    """holes: iterable of (group, hole)."""
+    conn.executemany("DELETE FROM day2_skins WHERE group_num = ? AND hole = ?", list(holes))
+
+
+@_timed
+def upsert_many(conn, table, rows):
+    """Insert-or-update many rows of one table in a single executemany.
+
+    rows: list of dicts with the same columns, including the table's key
+    columns (TABLE_KEYS). Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+    keys = TABLE_KEYS[table]
+    cols = list(rows[0])
+    updates = [c for c in cols if c not in keys]
+    on_conflict = (f"DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in updates)}"
+                   if updates else "DO NOTHING")
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT({', '.join(keys)}) {on_conflict}",
+        [tuple(r[c] for c in cols) for r in rows])
+    return len(rows)
+
+
+@_timed
+def export_table(conn, table):
+    """(column names, rows) for a whole table - used by the backup downloads."""
+    if table not in TABLE_KEYS:
+        raise ValueError(f"unknown table {table!r}")
+    cur = conn.execute(f"SELECT * FROM {table}")
+    return [d[0] for d in cur.description], cur.fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Write log
+# ---------------------------------------------------------------------------
+@_timed
+def log_write(conn, session_id, action, payload_json, timestamp, idem_key=None):
+    """Append a pending write-log entry. Returns its id, or None if idem_key
+    is already logged."""
+    cur = conn.execute(
+        "INSERT OR IGNORE INTO write_log (session_id, action, payload, timestamp, synced, idem_key) "
+        "VALUES (?, ?, ?, ?, 0, ?)",
+        (session_id, action, payload_json, timestamp, idem_key))
+    return cur.lastrowid if cur.rowcount else None
+
+
+@_timed
+def mark_synced(conn, log_id, status):
+    conn.execute("UPDATE write_log SET synced = ? WHERE id = ?", (status, log_id))
+
+
+@_timed
+def get_log_status(conn, log_id):
+    row = conn.execute("SELECT synced FROM write_log WHERE id = ?", (log_id,)).fetchone()
+    return row['synced'] if row else None
+
+
+@_timed
+def put_log_entry(conn, log_id, session_id, action, payload_json, timestamp, status, idem_key):
+    """Write a write-log entry with a known id (restoring from a replica)."""
+    conn.execute("INSERT OR REPLACE INTO write_log (id, session_id, action, payload, timestamp, "
+                 "synced, idem_key) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                 (log_id, session_id, action, payload_json, timestamp, status, idem_key))
+
+
+@_timed
+def get_log_entries(conn, status, after_id=0, before_timestamp=None):
+    """Write-log entries with this status, oldest first."""
+    if before_timestamp is None:
+        return conn.execute("SELECT * FROM write_log WHERE id > ? AND synced = ? ORDER BY id",
+                            (after_id, status)).fetchall()
+    return conn.execute("SELECT * FROM write_log WHERE id > ? AND synced = ? AND timestamp < ? ORDER BY id",
+                        (after_id, status, before_timestamp)).fetchall()
+
+
+@_timed
+def oldest_log_id(conn, status):
+    return conn.execute("SELECT MIN(id) FROM write_log WHERE synced = ?", (status,)).fetchone()[0]
+
+
+@_timed
+def data_version(conn):
+    """The data version counter (see bump_data_version) - 0 before the first change."""
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (DATA_VERSION_KEY,)).fetchone()
+    return int(row['value']) if row else 0
+
+
+@_timed
+def bump_data_version(conn):
+    """Move the data version on by one. Call inside the transaction that
+    changes the scores, stored skins or setup, so it commits (or rolls back) with
+    them - it only ever goes up, whatever order concurrent saves commit in."""
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, '1') "
+                 "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1", (DATA_VERSION_KEY,))
+
+
+# ---------------------------------------------------------------------------
+# Rosters, Day 1 roles, Day 2 assignments
+# ---------------------------------------------------------------------------
+@_timed
+def get_roster(conn, team):
+    rows = conn.execute("SELECT golfer FROM roster WHERE team = ? ORDER BY golfer", (team,)).fetchall()
+    return [r['golfer'] for r in rows]
+
+
+@_timed
+def get_all_rosters(conn):
+    """{team: [golfer, ...]} for every team with anyone on it, alphabetical."""
+    rosters = {}
+    for r in conn.execute("SELECT team, golfer FROM roster ORDER BY team, golfer").fetchall():
+        rosters.setdefault(r['team'], []).append(r['golfer'])
+    return rosters
+
+
+@_timed
+def get_day1_roles(conn, team):
+    rows = conn.execute("SELECT slot, golfer FROM day1_roles WHERE team = ?", (team,)).fetchall()
+    return {r['slot']: r['golfer'] for r in rows if r['golfer']}
+
+
+@_timed
+def get_all_day1_roles(conn):
+    """{team: {slot: golfer}} in one query."""
+    roles = {}
+    for r in conn.execute("SELECT team, slot, golfer FROM day1_roles WHERE golfer IS NOT NULL").fetchall():
+        roles.setdefault(r['team'], {})[r['slot']] = r['golfer']
+    return roles
+
+
+@_timed
+def get_day2_assignments(conn, team):
+    rows = conn.execute("SELECT golfer, group_num FROM day2_assignments WHERE team = ?", (team,)).fetchall()
+    return {r['golfer']: r['group_num'] for r in rows}
+
+
+@_timed
+def get_all_assignments(conn):
+    """{team: {golfer: group_num}} in one query."""
+    assignments = {}
+    for r in conn.execute("SELECT team, golfer, group_num FROM day2_assignments").fetchall():
+        assignments.setdefault(r['team'], {})[r['golfer']] = r['group_num']
+    return assignments
+
+
+@_timed
+def get_team_setup(conn, team):
+    """{'roster': [...], 'roles': {slot: golfer}, 'groups': {golfer: group_num}} for one team."""
+    return {'roster': get_roster(conn, team), 'roles': get_day1_roles(conn, team),
+            'groups': {g: n for g, n in get_day2_assignments(conn, team).items() if n is not None}}
+
+
+@_timed
+def replace_team_setup(conn, team, roster, roles, groups):
+    """Replace a team's roster, Day 1 roles and Day 2 assignments in one go
+    (inside the caller's transaction). roles: {slot: golfer}; groups: {golfer: group_num}."""
+    for table in ('roster', 'day1_roles', 'day2_assignments'):
+        conn.execute(f"DELETE FROM {table} WHERE team = ?", (team,))
+    conn.executemany("INSERT INTO roster (team, golfer) VALUES (?, ?)", [(team, g) for g in roster])
+    upsert_many(conn, 'day1_roles', [{'team': team, 'slot': s, 'golfer': g} for s, g in roles.items() if g])
+    upsert_many(conn, 'day2_assignments', [{'team': team, 'golfer': g, 'group_num': n}
+                                           for g, n in groups.items() if n is not None])
+
+
+# ---------------------------------------------------------------------------
+# Golfer identity + careers
+# ---------------------------------------------------------------------------
+# Every spelling of a name is an alias pointing at one golfers.id (names and
+# aliases compare case-insensitively). golfer_seasons holds one pre-added
+# row per golfer / year / team, and the golfer_careers view sums them.
+@_timed
+def resolve_golfers(conn, names):
+    """{name: golfer id} for these names, creating a golfer for any unknown one."""
+    names = sorted({n.strip() for n in names if n and n.strip()})
+    conn.executemany("INSERT OR IGNORE INTO golfers (name) SELECT ? WHERE NOT EXISTS "
+                     "(SELECT 1 FROM golfer_aliases WHERE alias = ?)", [(n, n) for n in names])
+    conn.executemany("INSERT OR IGNORE INTO golfer_aliases (alias, golfer_id) "
+                     "SELECT ?, id FROM golfers WHERE name = ?", [(n, n) for n in names])
+    ids = {}
+    for i in range(0, len(names), 500):
+        chunk = names[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        for r in conn.execute(f"SELECT alias, golfer_id FROM golfer_aliases WHERE alias IN ({marks})", chunk):
+            ids[r['alias'].lower()] = r['golfer_id']
+    return {n: ids[n.lower()] for n in names}
+
+
+@_timed
+def get_golfers(conn):
+    """[{'id', 'name', 'aliases': [...]}] by name."""
+    golfers = {}
+    for r in conn.execute("SELECT g.id, g.name, a.alias FROM golfers g "
+                          "LEFT JOIN golfer_aliases a ON a.golfer_id = g.id ORDER BY g.name, a.alias"):
+        entry = golfers.setdefault(r['id'], {'id': r['id'], 'name': r['name'], 'aliases': []})
+        if r['alias'] and r['alias'] != r['name']:
+            entry['aliases'].append(r['alias'])
+    return list(golfers.values())
+
+
+@_timed
+def merge_golfers(conn, keep_id, merge_id):
+    """Fold golfer merge_id into keep_id: its aliases (name included) and seasons move over."""
+    conn.execute("UPDATE golfer_aliases SET golfer_id = ? WHERE golfer_id = ?", (keep_id, merge_id))
+    conn.execute("INSERT INTO golfer_seasons (golfer_id, year, team, skins, team_points, champion) "
+                 "SELECT ?, year, team, skins, team_points, champion FROM golfer_seasons WHERE golfer_id = ? "
+                 "ON CONFLICT(golfer_id, year, team) DO UPDATE SET skins = skins + excluded.skins",
+                 (keep_id, merge_id))
+    conn.execute("DELETE FROM golfer_seasons WHERE golfer_id = ?", (merge_id,))
+    conn.execute("DELETE FROM golfers WHERE id = ?", (merge_id,))
+
+
+@_timed
+def replace_golfer_seasons(conn, year, rows):
+    """Replace one year's season rows. rows: [{'golfer_id', 'team', 'skins', 'team_points', 'champion'}]
+    (two names for the same golfer in one year + team add up)."""
+    conn.execute("DELETE FROM golfer_seasons WHERE year = ?", (year,))
+    conn.executemany(
+        "INSERT INTO golfer_seasons (golfer_id, year, team, skins, team_points, champion) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(golfer_id, year, team) DO UPDATE SET skins = skins + excluded.skins",
+        [(r['golfer_id'], year, r['team'], r['skins'], r['team_points'], r['champion']) for r in rows])
+
+
+@_timed
+def get_golfer_careers(conn):
+    """Every golfer's career totals (the golfer_careers view), most skins first."""
+    return conn.execute("SELECT * FROM golfer_careers ORDER BY skins DESC, name").fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Meta (app-wide flags)
+# ---------------------------------------------------------------------------
+@_timed
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else default
+
+
+@_timed
+def set_meta(conn, key, value):
+    upsert_many(conn, 'meta', [{'key': key, 'value': value}])
+
+
+@_timed
+def setup_rows(conn):
+    """Every roster / role / assignment / meta / golfer identity row, in a stable order.
+    The data version counter isn't setup - it moves with every score save."""
+    rows = []
+    for table in ('roster', 'day1_roles', 'day2_assignments', 'meta', 'golfers', 'golfer_aliases'):
+        if table == 'meta':
+            found = conn.execute("SELECT 'meta', * FROM meta WHERE key != ? ORDER BY 2, 3", (DATA_VERSION_KEY,))
+        else:
+            found = conn.execute(f"SELECT '{table}', * FROM {table} ORDER BY 2, 3")
+        rows += [tuple(r) for r in found.fetchall()]
+    return rows
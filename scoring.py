@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""
+Pure scoring rules for The Gentlemen's Cup.
+
+Nothing in here touches Streamlit or the database - every function takes
+plain dicts and returns plain dicts - so it's safe to call from background
+threads (the skins verifier) and anywhere else that has no browser session.
+
+Score dicts use the same shape/keys as st.session_state in app.py:
+  day2_scores: {"<group>_<hole>_<team>": {'group', 'hole', 'team', 'score', ...}}
+  day2_skins:  {"<group>_<hole>": {'group', 'hole', 'winner', 'score', 'tied', 'points_value'}}
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+def is_valid_score(score):
+    """A score counts once it's been entered as a positive number."""
+    return bool(score) and score > 0
+
+
+def replay_group_skins(group, day2_scores, teams, holes):
+    """Replay one group's skins in hole order, exactly like the live app does.
+
+    Rules (kept identical to formats.SkinsEngine and scripts/check_scoring.py's oracle):
+      * a hole needs at least 2 valid scores to be decided, otherwise it's skipped
+      * lowest score wins outright; any tie for low means the skin carries over
+      * a hole is worth 1 + the number of consecutive tied holes right before it,
+        and the carryover stops at the first hole that was won OR skipped
+
+    Returns {skin_key: skin_result} for every decided hole, ties included.
+    One pass, linear in holes x teams: the carryover is a running count
+    rather than a walk back over earlier holes.
+    """
+    skins = {}
+    carry, last_tied_hole = 0, None
+    for hole in holes:
+        hole_scores = {}
+        for team in teams:
+            row = day2_scores.get(f"{group}_{hole}_{team}")
+            if row and is_valid_score(row.get('score')):
+                hole_scores[team] = row['score']
+
+        if len(hole_scores) < 2:
+            continue
+
+        min_score = min(hole_scores.values())
+        winners = [team for team, score in hole_scores.items() if score == min_score]
+
+        # consecutive tied holes directly before this one
+        if last_tied_hole != hole - 1:
+            carry = 0
+        points_value = 1 + carry
+
+        tied = len(winners) != 1
+        if tied:
+            carry, last_tied_hole = carry + 1, hole
+        else:
+            carry, last_tied_hole = 0, None
+        skins[f"{group}_{hole}"] = {
+            'group': group, 'hole': hole, 'winner': None if tied else winners[0],
+            'score': min_score, 'tied': tied, 'points_value': points_value
+        }
+    return skins
+
+
+def replay_all_skins(day2_scores, teams, groups, holes):
+    """Replay every group's skins in one pass. Returns {skin_key: skin_result}."""
+    skins = {}
+    for group in groups:
+        skins.update(replay_group_skins(group, day2_scores, teams, holes))
+    return skins
+
+
+def team_points_from_skins(day2_skins, teams):
+    """Total skins points per team from a {skin_key: skin_result} dict."""
+    points = {team: 0 for team in teams}
+    for skin in day2_skins.values():
+        if skin.get('winner') and not skin.get('tied'):
+            points[skin['winner']] = points.get(skin['winner'], 0) + skin.get('points_value', 1)
+    return points
+
+
+def award_points_with_ties(scores_dict, point_values):
+    """Award position points (lowest score first), splitting tied positions.
+
+    Tied teams share the combined points of the positions they occupy, e.g.
+    with [22, 15, 8] a two-way tie for 1st gets (22 + 15) / 2 each. Positions
+    past the end of point_values are worth 0. One sort, then a single pass
+    over the tiers - O(n log n) for any size of field.
+    """
+    if not scores_dict:
+        return {}
+
+    sorted_teams = sorted(scores_dict.items(), key=lambda x: x[1])
+    prefix = [0]
+    for value in point_values:
+        prefix.append(prefix[-1] + value)
+
+    def points_through(position):
+        return prefix[min(position, len(point_values))]
+
+    points_awarded = {}
+    i = 0
+    while i < len(sorted_teams):
+        j = i
+        while j < len(sorted_teams) and sorted_teams[j][1] == sorted_teams[i][1]:
+            j += 1
+        points_per_team = (points_through(j) - points_through(i)) / (j - i)
+        for team, _ in sorted_teams[i:j]:
+            points_awarded[team] = points_per_team
+        i = j
+
+    return points_awarded
+
+
+# ---------------------------------------------------------------------------
+# Clinch / elimination
+# ---------------------------------------------------------------------------
+# The rest of the tournament splits into independent pieces: the Day 1
+# scramble standings, the Day 1 alt-shot standings, and each Day 2 skins
+# group. For every piece we work out the set of points vectors (one entry
+# per team) it can still end with - by reasoning about reachable orderings
+# and carryover pots, not by trying every possible score - then combine the
+# pieces with bounds + dominance pruning to answer "can X still win?".
+MIN_SCORE, MAX_SCORE = 1, 15   # same bounds as the score inputs
+
+
+def _tier_points(start, size, point_values):
+    """Average of the position points for positions start .. start+size-1
+    (positions past the end of point_values are worth 0)."""
+    return sum(point_values[start:start + size]) / size
+
+
+def _position_value(position, point_values):
+    return point_values[position] if position < len(point_values) else 0
+
+
+def day1_format_outcomes(current, remaining, point_values):
+    """Every points vector one Day 1 format (scramble or alt shot) can still end with.
+
+    current / remaining: per-team lists of strokes so far and holes left.
+    A team's final total can be anything in [current + remaining*MIN, current + remaining*MAX],
+    so we enumerate finishing orders (ties allowed) tier by tier and drop any
+    order that can't be realised within those ranges as soon as it fails.
+    """
+    n = len(current)
+    lo = [current[i] + remaining[i] * MIN_SCORE for i in range(n)]
+    hi = [current[i] + remaining[i] * MAX_SCORE for i in range(n)]
+    outcomes = set()
+
+    def place(left, position, floor, points):
+        if not left:
+            outcomes.add(tuple(points))
+            return
+        left = sorted(left)
+        # every non-empty subset of the unplaced teams can form the next tier
+        for mask in range(1, 1 << len(left)):
+            tier = [left[i] for i in range(len(left)) if mask >> i & 1]
+            value = max([floor] + [lo[i] for i in tier])
+            if value > min(hi[i] for i in tier):
+                continue
+            share = _tier_points(position, len(tier), point_values)
+            new_points = list(points)
+            for i in tier:
+                new_points[i] = share
+            place([i for i in left if i not in tier], position + len(tier), value + 1, new_points)
+
+    place(list(range(n)), 0, float('-inf'), [0.0] * n)
+    return outcomes
+
+
+def _hole_outcomes(known, n_teams):
+    """Possible results of one skins hole: a winning team index, or None for a tie.
+
+    known: {team_index: score} for the scores already entered on that hole.
+    """
+    if len(known) == n_teams:
+        low = min(known.values())
+        winners = [t for t, s in known.items() if s == low]
+        return [winners[0]] if len(winners) == 1 else [None]
+
+    results = [None]  # an unscored team can always match the low score
+    if known:
+        low = min(known.values())
+        leaders = [t for t, s in known.items() if s == low]
+        if len(leaders) == 1 and low < MAX_SCORE:
+            results.append(leaders[0])
+        if low > MIN_SCORE:
+            results.extend(t for t in range(n_teams) if t not in known)
+    else:
+        results.extend(range(n_teams))
+    return results
+
+
+def skins_group_outcomes(known_by_hole, holes, n_teams):
+    """Every points vector one skins group can still end with.
+
+    known_by_hole: {hole: {team_index: score}}. Because every hole adds one
+    point to the pot and a win empties it, the pot is always
+    1 + holes played - points already handed out, so the state is just the
+    points vector and the set stays small even over 18 holes.
+    """
+    states = {tuple([0] * n_teams)}
+    for played, hole in enumerate(holes):
+        options = _hole_outcomes(known_by_hole.get(hole, {}), n_teams)
+        next_states = set()
+        for vec in states:
+            pot = played + 1 - sum(vec)
+            for winner in options:
+                if winner is None:
+                    next_states.add(vec)
+                else:
+                    won = list(vec)
+                    won[winner] += pot
+                    next_states.add(tuple(won))
+        states = next_states
+    return states
+
+
+def _pareto(vectors, target):
+    """Drop vectors that are no better for `target` than some other vector
+    (target no higher AND every rival no lower)."""
+    ordered = sorted(vectors, key=lambda v: -v[target])
+    kept = []
+    for v in ordered:
+        rivals = [x for i, x in enumerate(v) if i != target]
+        dominated = False
+        for k in kept:
+            if k[target] >= v[target] and all(
+                    kx <= vx for kx, vx in zip([x for i, x in enumerate(k) if i != target], rivals)):
+                dominated = True
+                break
+        if not dominated:
+            kept.append(v)
+    return kept
+
+
+def _can_reach_top(target, components, lows, highs):
+    """Is there any finish where `target` ends level with or ahead of everyone?"""
+    n = len(lows)
+    remaining_lo = [list(lows)]
+    remaining_hi = [list(highs)]
+    for comp in components:
+        c_lo = [min(v[i] for v in comp) for i in range(n)]
+        c_hi = [max(v[i] for v in comp) for i in range(n)]
+        remaining_lo.append([a - b for a, b in zip(remaining_lo[-1], c_lo)])
+        remaining_hi.append([a - b for a, b in zip(remaining_hi[-1], c_hi)])
+
+    frontier = [tuple([0.0] * n)]
+    for depth, comp in enumerate(components):
+        rest_lo, rest_hi = remaining_lo[depth + 1], remaining_hi[depth + 1]
+        candidates = set()
+        for f in frontier:
+            for c in comp:
+                v = tuple(a + b for a, b in zip(f, c))
+                best_case = v[target] + rest_hi[target]
+                # bound: even winning everything left, target can't catch someone
+                if any(v[o] + rest_lo[o] > best_case for o in range(n) if o != target):
+                    continue
+                # bound: target is guaranteed to finish on top from here
+                worst_case = v[target] + rest_lo[target]
+                if all(v[o] + rest_hi[o] <= worst_case for o in range(n) if o != target):
+                    return True
+                candidates.add(v)
+        if not candidates:
+            return False
+        frontier = _pareto(candidates, target)
+    return bool(frontier)
+
+
+def clinch_status(components, teams):
+    """Per-team points range and whether the Cup is clinched / out of reach.
+
+    components: list of outcome sets (day1_format_outcomes / skins_group_outcomes).
+    Returns {team: {'min_points', 'max_points', 'status'}} with status one of
+    'clinched' (wins outright in every finish), 'eliminated' (can't even tie
+    for first) or 'alive'.
+    """
+    n = len(teams)
+    components = [c for c in components if c]
+    lows = [sum(min(v[i] for v in comp) for comp in components) for i in range(n)]
+    highs = [sum(max(v[i] for v in comp) for comp in components) for i in range(n)]
+
+    result = {}
+    for t, team in enumerate(teams):
+        # Pairwise margins split cleanly across independent components, so
+        # "can rival o ever catch t?" is a sum of per-component maxima.
+        clinched = all(
+            sum(max(v[o] - v[t] for v in comp) for comp in components) < 0
+            for o in range(n) if o != t
+        )
+        if clinched:
+            status = 'clinched'
+        elif not _can_reach_top(t, components, lows, highs):
+            status = 'eliminated'
+        else:
+            status = 'alive'
+        result[team] = {'min_points': lows[t], 'max_points': highs[t], 'status': status}
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Clinch / elimination for big fields (bounds)
+# ---------------------------------------------------------------------------
+# Enumerating finishing orders grows factorially with the number of teams,
+# so past a handful of teams we switch to per-team points ranges: each
+# component gives every team a [min, max] on its own, the ranges add up, and
+#   clinched   = my minimum beats every rival's maximum
+#   eliminated = some rival's minimum beats my maximum
+# Both are sound (never wrong), just less eager than the exact engine.
+def day1_format_bounds(current, remaining, point_values):
+    """[(min_points, max_points)] per team for one Day 1 format, in O(n log n)."""
+    n = len(current)
+    lo = [current[i] + remaining[i] * MIN_SCORE for i in range(n)]
+    hi = [current[i] + remaining[i] * MAX_SCORE for i in range(n)]
+    sorted_lo, sorted_hi = sorted(lo), sorted(hi)
+    bounds = []
+    for i in range(n):
+        # best case: only teams that must beat us (hi < our lo) are ahead
+        ahead = bisect_left(sorted_hi, lo[i])
+        # worst case: only teams that must finish behind us (lo > our hi) are
+        behind = n - bisect_right(sorted_lo, hi[i])
+        bounds.append((_position_value(n - 1 - behind, point_values),
+                       _position_value(ahead, point_values)))
+    return bounds
+
+
+def skins_group_bounds(known_by_hole, holes, n_teams):
+    """[(min_points, max_points)] per team for one skins group.
+
+    Per team, a small DP over the carryover pot: at each hole the team
+    can win it, someone else can, or it's tied - whichever are still possible
+    given the scores already entered (see _hole_outcomes).
+    """
+    options = [_hole_outcomes(known_by_hole.get(hole, {}), n_teams) for hole in holes]
+    bounds = []
+    for t in range(n_teams):
+        best = {1: (0, 0)}   # pot -> (min points, max points) so far
+        for opts in options:
+            can_win = t in opts
+            other_wins = any(o is not None and o != t for o in opts)
+            tie = None in opts
+            nxt = {}
+            for pot, (low, high) in best.items():
+                moves = []
+                if can_win:
+                    moves.append((1, low + pot, high + pot))
+                if other_wins:
+                    moves.append((1, low, high))
+                if tie:
+                    moves.append((pot + 1, low, high))
+                for new_pot, new_low, new_high in moves:
+                    old = nxt.get(new_pot)
+                    nxt[new_pot] = (new_low, new_high) if old is None else \
+                        (min(old[0], new_low), max(old[1], new_high))
+            best = nxt
+        bounds.append((min(b[0] for b in best.values()), max(b[1] for b in best.values())))
+    return bounds
+
+
+def bounds_status(components, teams):
+    """Same result shape as clinch_status, from per-component [(min, max)] lists."""
+    n = len(teams)
+    lows = [sum(c[i][0] for c in components) for i in range(n)]
+    highs = [sum(c[i][1] for c in components) for i in range(n)]
+    # best / second-best rival maximum and best rival minimum, without an n^2 scan
+    order_hi = sorted(range(n), key=lambda i: highs[i], reverse=True)
+    order_lo = sorted(range(n), key=lambda i: lows[i], reverse=True)
+    result = {}
+    for t, team in enumerate(teams):
+        rival_hi = next((highs[i] for i in order_hi if i != t), float('-inf'))
+        rival_lo = next((lows[i] for i in order_lo if i != t), float('-inf'))
+        if lows[t] > rival_hi:
+            status = 'clinched'
+        elif highs[t] < rival_lo:
+            status = 'eliminated'
+        else:
+            status = 'alive'
+        result[team] = {'min_points': lows[t], 'max_points': highs[t], 'status': status}
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Hole difficulty (running counters)
+# ---------------------------------------------------------------------------
+# A tally is {(format, hole): counters} with plain integer counters, so
+# adding or removing one score is O(1) and tallies from different rounds or
+# years just add up. Counters are relative to the par the score was played
+# against, so years with a different par on a hole still combine.
+HOLE_BUCKETS = ('eagles', 'birdies', 'pars', 'bogeys', 'doubles')   # eagle or better .. double or worse
+
+
+def _hole_bucket(to_par):
+    return HOLE_BUCKETS[min(max(to_par, -2), 2) + 2]
+
+
+def tally_score(tally, fmt, hole, score, par, sign=1):
+    """Add (sign=1) or remove (sign=-1) one score; invalid scores are ignored."""
+    if not is_valid_score(score) or par is None:
+        return
+    counters = tally.setdefault((fmt, hole), dict.fromkeys(('plays', 'strokes', 'to_par') + HOLE_BUCKETS, 0))
+    counters['plays'] += sign
+    counters['strokes'] += sign * score
+    counters['to_par'] += sign * (score - par)
+    counters[_hole_bucket(score - par)] += sign
+
+
+def merge_tallies(*tallies):
+    merged = {}
+    for tally in tallies:
+        for key, counters in tally.items():
+            into = merged.setdefault(key, dict.fromkeys(counters, 0))
+            for name, value in counters.items():
+                into[name] += value
+    return merged
+
+
+def hole_difficulty(tally, formats=None):
+    """Per-hole averages and rates from a tally, hardest first.
+
+    formats: only count these formats (all by default). Returns a list of
+    {hole, plays, average, to_par, <bucket>_rate..., rank} - to_par is the
+    average strokes over par, rank 1 is the hardest hole.
+    """
+    by_hole = {}
+    for (fmt, hole), counters in tally.items():
+        if formats is None or fmt in formats:
+            into = by_hole.setdefault(hole, dict.fromkeys(counters, 0))
+            for name, value in counters.items():
+                into[name] += value
+    rows = []
+    for hole, c in by_hole.items():
+        if c['plays'] <= 0:
+            continue
+        row = {'hole': hole, 'plays': c['plays'], 'average': c['strokes'] / c['plays'],
+               'to_par': c['to_par'] / c['plays']}
+        row.update({f"{b}_rate": c[b] / c['plays'] for b in HOLE_BUCKETS})
+        rows.append(row)
+    rows.sort(key=lambda r: (-r['to_par'], r['hole']))
+    for rank, row in enumerate(rows, start=1):
+        row['rank'] = rank
+    return rows
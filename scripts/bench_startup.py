@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Cold-start benchmark: how long a freshly booted app takes to render its first page.
+
+Each run is a new Python process - like a Streamlit Cloud reboot - that
+imports Streamlit and runs app.py once (the Leaderboard, via AppTest)
+against a copy of an event database. It reports the process's wall time
+and the app's own startup report (see "Startup" in app.py): first render
+and the time spent in each startup step. The first run finds an unstamped
+database and does the schema pass; the rest find it at SCHEMA_VERSION.
+
+    python scripts/bench_startup.py [--runs 5] [--db path/to/event.db]
+
+Without --db it starts from an empty database. Set GCUP_FIELD_CONFIG as
+usual if the database is for a bigger field than the Cup's.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EVENT = "bench"
+
+
+def _run_child():
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)  # the app's startup report
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+    at = AppTest.from_file(os.path.join(REPO, "app.py"), default_timeout=300)
+    at.query_params['event'] = EVENT
+    at.run()
+    if at.exception:
+        raise SystemExit(f"app raised: {at.exception}")
+    print(json.dumps({'import_ms': (imported - started) * 1000,
+                      'wall_ms': (time.perf_counter() - started) * 1000}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db", help="event database to start from (copied, never modified)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child()
+        return
+
+    events_dir = tempfile.mkdtemp(prefix="gcup-startup-")
+    if args.db:
+        shutil.copy(args.db, os.path.join(events_dir, f"{EVENT}.db"))
+    env = dict(os.environ, GCUP_EVENTS_DIR=events_dir, GCUP_EVENTS=EVENT)
+
+    print(f"{'run':<5}{'schema':<18}{'streamlit ms':>13}{'first render ms':>17}{'process ms':>12}  steps")
+    renders = []
+    for run in range(1, args.runs + 1):
+        out = subprocess.run([sys.executable, __file__, "--child"], env=env, capture_output=True,
+                             text=True, check=True).stdout
+        child = json.loads(out.strip().splitlines()[-1])
+        report = re.search(r"startup \[" + EVENT + r"\]: first render (\d+) ms, schema (.+?), (.*)", out)
+        renders.append(int(report.group(1)))
+        print(f"{run:<5}{report.group(2):<18}{child['import_ms']:>13.0f}{int(report.group(1)):>17}"
+              f"{child['wall_ms']:>12.0f}  {report.group(3)}")
+    shutil.rmtree(events_dir, ignore_errors=True)
+    print(f"\nfirst render: median {statistics.median(renders):.0f} ms, max {max(renders)} ms")
+
+
+if __name__ == "__main__":
+    main()
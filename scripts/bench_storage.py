@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Storage benchmark: score-save latency under the old vs the current SQLite profile.
+
+Drives the app's real save path (_write_logged) against a throwaway database
+from several threads at once - bursts of a hole's worth of saves with short
+pauses between, like a busy round - and reports p50 / p99 / max save latency,
+how many saves stalled, how big the WAL file ended up, and how many checkpoints the background
+checkpointer ran. Each profile runs in its own subprocess so per-connection
+PRAGMAs and cached resources can't leak between them.
+
+    python scripts/bench_storage.py [--saves 3000] [--threads 4]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What get_db() used before the storage profile: WAL + synchronous=NORMAL and
+# SQLite's defaults for everything else (checkpointing on the request thread).
+BASELINE_ENV = {
+    'GCUP_SQLITE_CACHE_SIZE': '-2000',
+    'GCUP_SQLITE_MMAP_SIZE': '0',
+    'GCUP_SQLITE_TEMP_STORE': 'DEFAULT',
+    'GCUP_SQLITE_BUSY_TIMEOUT': '10000',   # same as the connect() timeout
+    'GCUP_SQLITE_WAL_AUTOCHECKPOINT': '1000',
+    'GCUP_SQLITE_JOURNAL_SIZE_LIMIT': '-1',
+}
+# Current defaults, with the checkpointer tuned to the benchmark's short pauses.
+PROFILE_ENV = {
+    'GCUP_CHECKPOINT_POLL': '0.02',
+    'GCUP_CHECKPOINT_IDLE': '0.05',
+}
+PROFILES = [("baseline", BASELINE_ENV, False), ("profile", PROFILE_ENV, True)]
+
+BURST = 15            # one hole across all five groups x three teams
+BURST_PAUSE = 0.1     # seconds between bursts, per thread
+STALL_MS = 5          # a save slower than this counts as a stall
+
+
+def _run_child(saves, threads, checkpointer):
+    logging.disable(logging.WARNING)   # bare-mode Streamlit warnings
+    sys.path.insert(0, REPO)
+    import app
+
+    app.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="gcup-bench-"), "bench.db")
+    app.get_db()
+    if checkpointer:
+        app.start_checkpointer(app.DEFAULT_EVENT)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        mine = []
+        for i in range(offset, saves, threads):
+            payload = {'group': app.GROUPS[i % len(app.GROUPS)], 'hole': (i // 15) % 18 + 1,
+                       'team': app.TEAMS[i % len(app.TEAMS)], 'score': 3 + i % 4,
+                       'timestamp': str(i), 'golfer': None, 'expected_version': None}
+            started = time.perf_counter()
+            app._write_logged('day2_score', [payload], 'bench')
+            mine.append(time.perf_counter() - started)
+            if (i // threads) % BURST == BURST - 1:
+                time.sleep(BURST_PAUSE)
+        with lock:
+            latencies.extend(mine)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    wal = app.DB_PATH + "-wal"
+    print(json.dumps({
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'stalls': sum(1 for x in latencies if x * 1000 > STALL_MS),
+        'saves_per_s': len(latencies) / elapsed,
+        'wal_kb': os.path.getsize(wal) / 1024 if os.path.exists(wal) else 0,
+        'checkpoints': app._checkpointer_state(app.DEFAULT_EVENT)['count'],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--saves", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--child", choices=[p[0] for p in PROFILES], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        checkpointer = dict((p[0], p[2]) for p in PROFILES)[args.child]
+        _run_child(args.saves, args.threads, checkpointer)
+        return
+
+    print(f"{args.saves} saves from {args.threads} threads\n")
+    print(f"{'profile':<10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'stalls':>8}{'saves/s':>10}{'WAL KB':>9}{'ckpts':>7}")
+    for name, env, _ in PROFILES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", name, "--saves", str(args.saves),
+             "--threads", str(args.threads)],
+            env=dict(os.environ, **env), capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{name:<10}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}{r['stalls']:>8}"
+              f"{r['saves_per_s']:>10.0f}{r['wal_kb']:>9.0f}{r['checkpoints']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,663 @@
+# -*- coding: utf-8 -*-
+"""
+Differential check: the optimized scoring paths against the original rules.
+
+The reference oracle below is a frozen copy of the scoring the app shipped
+with - the whole-group skins replay and calculate_hole_points_value
+(replay the whole group, ties carry over but are never stored, carryover
+stops at a hole with no result) and calculate_day1_points with its 3-team
+award_points_with_ties. Don't optimize it; it's the yardstick. The
+stableford and match play references have no shipped predecessor; they
+are the rules written out the slow, obvious way (re-add every hole, replay
+every match), and formats.StablefordEngine / MatchPlayEngine must agree
+with them.
+
+Every case is a random field (teams, groups, holes) and a random sequence
+of score edits - new scores, corrections, clears, lots of ties - and every
+candidate engine is fed the same edits in the same order. After each edit
+its skins results, team points and stored (won) skin rows - or match
+results - must equal the oracle's. The first mismatch is shrunk to the fewest edits that still fail
+and printed as JSON; --case re-runs one of those.
+
+    python scripts/check_scoring.py [--cases 20000] [--seed 0] [--workers 4]
+    python scripts/check_scoring.py --app        # the app's own save paths too
+    python scripts/check_scoring.py --case '{"kind": "skins", ...}'
+
+--app also drives app._persist_scores (live engine, stored rows and the
+live data a tab loads after the save) and
+app.calculate_day1_points on the app's configured field (set
+GCUP_FIELD_CONFIG for other field sizes). It runs in-process.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from formats import (MatchPlayEngine, SkinsEngine,              # noqa: E402
+                     StablefordEngine, StrokePlayEngine)
+from scoring import (award_points_with_ties, replay_all_skins,  # noqa: E402
+                     team_points_from_skins)
+
+
+# ---------------------------------------------------------------------------
+# Reference oracle (frozen - do not optimize)
+# ---------------------------------------------------------------------------
+def ref_hole_points_value(skins, scores, group, hole, teams):
+    points_value = 1  # Base value for current hole
+
+    # Look backwards from current hole to count consecutive ties
+    for prev_hole in range(hole - 1, 0, -1):
+        prev_skin_key = f"{group}_{prev_hole}"
+        if prev_skin_key in skins:
+            if skins[prev_skin_key].get('tied', False):
+                points_value += 1  # Add 1 for each consecutive tie
+            else:
+                break  # Stop at first non-tie (someone won, so carryover stops)
+        else:
+            break  # No result for this hole (fewer than 2 scores), stop looking back
+    return points_value
+
+
+def ref_recalculate_group(skins, scores, group, teams, holes):
+    """Replay one group from scratch into `skins` ({"<group>_<hole>": result}, ties included)."""
+    for hole in holes:
+        skins.pop(f"{group}_{hole}", None)
+    for hole in holes:
+        hole_scores = {}
+        for team in teams:
+            score = scores.get(f"{group}_{hole}_{team}")
+            if score and score > 0:
+                hole_scores[team] = score
+        if len(hole_scores) < 2:
+            continue
+        min_score = min(hole_scores.values())
+        winners = [team for team, score in hole_scores.items() if score == min_score]
+        points_value = ref_hole_points_value(skins, scores, group, hole, teams)
+        skins[f"{group}_{hole}"] = {
+            'group': group, 'hole': hole, 'winner': winners[0] if len(winners) == 1 else None,
+            'score': min_score, 'tied': len(winners) != 1, 'points_value': points_value}
+
+
+def ref_award_points_with_ties(scores_dict, point_values):
+    """The original Day 1 award (3 point values, at most 3 teams)."""
+    if not scores_dict:
+        return {}
+    sorted_teams = sorted(scores_dict.items(), key=lambda x: x[1])
+    points_awarded = {}
+    i = 0
+    while i < len(sorted_teams):
+        current_score = sorted_teams[i][1]
+        tied_teams = [team for team, score in sorted_teams[i:] if score == current_score]
+        if i == 0:
+            if len(tied_teams) == 1:
+                points_to_split = point_values[0]
+            elif len(tied_teams) == 2:
+                points_to_split = point_values[0] + point_values[1]
+            else:
+                points_to_split = sum(point_values)
+        elif i == 1:
+            if len(tied_teams) == 1:
+                points_to_split = point_values[1]
+            else:
+                points_to_split = point_values[1] + point_values[2]
+        else:
+            points_to_split = point_values[2]
+        for team in tied_teams:
+            points_awarded[team] = points_to_split / len(tied_teams)
+        i += len(tied_teams)
+    return points_awarded
+
+
+def ref_award_positions(scores_dict, point_values):
+    """Any field size: tied teams split the positions they occupy, and
+    positions past the point table are worth 0. Written out position by position."""
+    ordered = sorted(scores_dict.values())
+    values = list(point_values) + [0] * len(ordered)
+    awarded = {}
+    for team, score in scores_dict.items():
+        positions = [i for i, s in enumerate(ordered) if s == score]
+        awarded[team] = sum(values[i] for i in positions) / len(positions)
+    return awarded
+
+
+def ref_day1_points(cells, teams, holes, point_values):
+    """{'scramble': {team: pts}, 'alt_shot': {...}} - empty until every team has every hole in."""
+    totals = {team: {'scramble': 0, 'alt_shot': 0, 'holes_completed': 0} for team in teams}
+    for (team, hole), (scramble, alt_shot) in cells.items():
+        if scramble and alt_shot:
+            totals[team]['scramble'] += scramble
+            totals[team]['alt_shot'] += alt_shot
+            totals[team]['holes_completed'] += 1
+    if any(totals[team]['holes_completed'] != len(holes) for team in teams):
+        return {'scramble': {}, 'alt_shot': {}}
+    award = (ref_award_points_with_ties if len(point_values) == 3 and len(teams) <= 3
+             else ref_award_positions)
+    return {fmt: award({team: t[fmt] for team, t in totals.items()}, point_values)
+            for fmt in ('scramble', 'alt_shot')}
+
+
+def ref_stableford_points(scores, pars, teams):
+    """{team: points}: every entered score looked up on its own, worse than
+    bogey scores 0, better than albatross counts as albatross."""
+    points = {team: 0 for team in teams}
+    for (unit, hole, team), score in scores.items():
+        if not score or score <= 0:
+            continue
+        to_par = score - pars[hole]
+        if to_par <= -3:
+            points[team] += 5
+        elif to_par == -2:
+            points[team] += 4
+        elif to_par == -1:
+            points[team] += 3
+        elif to_par == 0:
+            points[team] += 2
+        elif to_par == 1:
+            points[team] += 1
+    return points
+
+
+def ref_match_result(scores, unit, pair, holes, win_points):
+    """Replay one match hole by hole: {team: points} once it's decided, else {}."""
+    a, b = pair
+    a_up = played = 0
+    for hole in holes:
+        score_a, score_b = scores.get((unit, hole, a)), scores.get((unit, hole, b))
+        if not (score_a and score_a > 0 and score_b and score_b > 0):
+            continue
+        played += 1
+        if score_a < score_b:
+            a_up += 1
+        elif score_b < score_a:
+            a_up -= 1
+    left = len(holes) - played
+    if a_up > left:
+        return {a: win_points}
+    if -a_up > left:
+        return {b: win_points}
+    if left == 0:
+        return {a: win_points / 2, b: win_points / 2}
+    return {}
+
+
+class SkinsOracle:
+    def __init__(self, case):
+        self.case, self.scores, self.skins = case, {}, {}
+
+    def apply(self, edit):
+        group, hole, team, score = edit
+        self.scores[f"{group}_{hole}_{team}"] = score
+        ref_recalculate_group(self.skins, self.scores, group, self.case['teams'], self.case['holes'])
+
+    def observe(self):
+        skins = {(s['group'], s['hole']): s for s in self.skins.values()}
+        points = {team: 0 for team in self.case['teams']}
+        for s in skins.values():
+            if not s['tied']:
+                points[s['winner']] += s['points_value']
+        return {'skins': skins, 'points': points, 'stored': _won(skins)}
+
+
+class Day1Oracle:
+    def __init__(self, case):
+        self.case, self.cells = case, {}
+
+    def apply(self, edit):
+        team, hole, scramble, alt_shot = edit
+        self.cells[(team, hole)] = (scramble, alt_shot)
+
+    def observe(self):
+        c = self.case
+        return {'points': ref_day1_points(self.cells, c['teams'], c['holes'], c['point_values'])}
+
+
+class StablefordOracle:
+    def __init__(self, case):
+        self.case, self.scores = case, {}
+
+    def apply(self, edit):
+        unit, hole, team, score = edit
+        self.scores[(unit, hole, team)] = score
+
+    def observe(self):
+        pars = {int(hole): par for hole, par in self.case['pars'].items()}
+        return {'points': ref_stableford_points(self.scores, pars, self.case['teams'])}
+
+
+class MatchPlayOracle:
+    def __init__(self, case):
+        self.case, self.scores = case, {}
+
+    def apply(self, edit):
+        unit, hole, team, score = edit
+        self.scores[(unit, hole, team)] = score
+
+    def observe(self):
+        c = self.case
+        results = {int(unit): ref_match_result(self.scores, int(unit), pair, c['holes'], c['win_points'])
+                   for unit, pair in c['pairings'].items()}
+        points = {team: 0 for pair in c['pairings'].values() for team in pair}
+        for result in results.values():
+            for team, pts in result.items():
+                points[team] += pts
+        return {'results': results, 'points': points}
+
+
+def _won(skins):
+    """Stored day2_skins rows: wins only, {(group, hole): (winner, score, points_value)}."""
+    return {key: (s['winner'], s['score'], s['points_value']) for key, s in skins.items() if not s['tied']}
+
+
+# ---------------------------------------------------------------------------
+# Candidates - same apply()/observe() shape; observe() may leave keys out
+# ---------------------------------------------------------------------------
+class SkinsReplay:
+    """scoring.replay_all_skins over every score after each edit."""
+
+    def __init__(self, case):
+        self.case, self.rows = case, {}
+
+    def apply(self, edit):
+        group, hole, team, score = edit
+        self.rows[f"{group}_{hole}_{team}"] = {'group': group, 'hole': hole, 'team': team, 'score': score}
+
+    def observe(self):
+        c = self.case
+        skins = replay_all_skins(self.rows, c['teams'], c['groups'], c['holes'])
+        return {'skins': {(s['group'], s['hole']): s for s in skins.values()},
+                'points': team_points_from_skins(skins, c['teams'])}
+
+
+class SkinsIncremental:
+    """formats.SkinsEngine.update per edit, stored rows kept from engine.changed."""
+
+    def __init__(self, case):
+        self.case, self.engine, self.stored = case, SkinsEngine(case['teams'], case['holes']), {}
+
+    def apply(self, edit):
+        self.engine.update(*edit)
+        for group, hole, result in self.engine.changed:
+            if result and not result['tied']:
+                self.stored[(group, hole)] = (result['winner'], result['score'], result['points_value'])
+            else:
+                self.stored.pop((group, hole), None)
+
+    def observe(self):
+        skins = {(g, h): r for g in self.case['groups'] for h, r in self.engine.results(g).items()}
+        return {'skins': skins, 'points': self.engine.points(), 'stored': dict(self.stored)}
+
+
+class SkinsRescore:
+    """A fresh SkinsEngine per edit, seeded with the previous results and
+    rescored from the edited hole (SkinsEngine.seed + rescore)."""
+
+    def __init__(self, case):
+        self.case, self.scores, self.results = case, {}, {}
+        self.points = {team: 0 for team in case['teams']}
+
+    def apply(self, edit):
+        group, hole, team, score = edit
+        hole_scores = self.scores.setdefault(group, {}).setdefault(hole, {})
+        if score and score > 0:
+            hole_scores[team] = score
+        else:
+            hole_scores.pop(team, None)
+        engine = SkinsEngine(self.case['teams'], self.case['holes'])
+        engine.seed(group, self.scores[group], self.results.get(group, {}))
+        for t, delta in engine.rescore(group, hole).items():
+            self.points[t] += delta
+        self.results[group] = engine.results(group)
+
+    def observe(self):
+        return {'skins': {(g, h): r for g, results in self.results.items() for h, r in results.items()},
+                'points': dict(self.points)}
+
+
+class Day1Incremental:
+    """formats.StrokePlayEngine fed one hole at a time (a hole counts once both scores are in)."""
+
+    def __init__(self, case):
+        self.engine = StrokePlayEngine(case['teams'], case['holes'], case['point_values'])
+
+    def apply(self, edit):
+        team, hole, scramble, alt_shot = edit
+        both = bool(scramble and alt_shot)
+        self.engine.update('scramble', hole, team, scramble if both else None)
+        self.engine.update('alt_shot', hole, team, alt_shot if both else None)
+
+    def observe(self):
+        return {'points': {fmt: self.engine.unit_points(fmt) for fmt in ('scramble', 'alt_shot')}}
+
+
+class Day1Award:
+    """scoring.award_points_with_ties over full totals after each edit."""
+
+    def __init__(self, case):
+        self.case, self.cells = case, {}
+
+    def apply(self, edit):
+        team, hole, scramble, alt_shot = edit
+        self.cells[(team, hole)] = (scramble, alt_shot)
+
+    def observe(self):
+        c = self.case
+        totals = {team: [0, 0, 0] for team in c['teams']}
+        for (team, _), (scramble, alt_shot) in self.cells.items():
+            if scramble and alt_shot:
+                totals[team] = [totals[team][0] + scramble, totals[team][1] + alt_shot, totals[team][2] + 1]
+        if any(t[2] != len(c['holes']) for t in totals.values()):
+            return {'points': {'scramble': {}, 'alt_shot': {}}}
+        return {'points': {fmt: award_points_with_ties({team: t[i] for team, t in totals.items()},
+                                                       c['point_values'])
+                           for i, fmt in enumerate(('scramble', 'alt_shot'))}}
+
+
+class _FormatDeltas:
+    """A formats engine fed update() per edit; points are the running sum of
+    the deltas update() returned, so the delta contract is checked too."""
+
+    def apply(self, edit):
+        for team, delta in self.engine.update(*edit).items():
+            self.deltas[team] = self.deltas.get(team, 0) + delta
+
+    def observe(self):
+        points = {team: 0 for team in self.engine.teams}
+        points.update(self.deltas)
+        return {'points': points}
+
+
+class StablefordIncremental:
+    """formats.StablefordEngine.update per edit, observed through points()."""
+
+    def __init__(self, case):
+        pars = {int(hole): par for hole, par in case['pars'].items()}
+        self.engine = StablefordEngine(case['teams'], case['holes'], pars)
+
+    def apply(self, edit):
+        self.engine.update(*edit)
+
+    def observe(self):
+        return {'points': self.engine.points()}
+
+
+class StablefordDeltas(_FormatDeltas):
+    def __init__(self, case):
+        pars = {int(hole): par for hole, par in case['pars'].items()}
+        self.engine, self.deltas = StablefordEngine(case['teams'], case['holes'], pars), {}
+
+
+class MatchPlayIncremental:
+    """formats.MatchPlayEngine.update per edit, observed through result() and points()."""
+
+    def __init__(self, case):
+        pairings = {int(unit): tuple(pair) for unit, pair in case['pairings'].items()}
+        self.engine = MatchPlayEngine(pairings, case['holes'], case['win_points'])
+
+    def apply(self, edit):
+        self.engine.update(*edit)
+
+    def observe(self):
+        return {'results': {unit: self.engine.result(unit) for unit in self.engine.pairings},
+                'points': self.engine.points()}
+
+
+class MatchPlayDeltas(_FormatDeltas):
+    def __init__(self, case):
+        pairings = {int(unit): tuple(pair) for unit, pair in case['pairings'].items()}
+        self.engine, self.deltas = MatchPlayEngine(pairings, case['holes'], case['win_points']), {}
+
+
+CANDIDATES = {
+    'skins': {'replay': SkinsReplay, 'engine': SkinsIncremental, 'rescore': SkinsRescore},
+    'day1': {'engine': Day1Incremental, 'award': Day1Award},
+    'stableford': {'engine': StablefordIncremental, 'deltas': StablefordDeltas},
+    'match_play': {'engine': MatchPlayIncremental, 'deltas': MatchPlayDeltas},
+}
+ORACLES = {'skins': SkinsOracle, 'day1': Day1Oracle,
+           'stableford': StablefordOracle, 'match_play': MatchPlayOracle}
+KINDS = list(ORACLES)
+
+
+# ---------------------------------------------------------------------------
+# The app's own paths (--app)
+# ---------------------------------------------------------------------------
+def _app():
+    logging.disable(logging.WARNING)   # bare-mode Streamlit warnings
+    os.environ.setdefault('GCUP_EVENTS_DIR', tempfile.mkdtemp(prefix="gcup-check-"))
+    import app
+    return app
+
+
+class AppSession:
+    """app._persist_scores - write log, score rows and the live SkinsEngine's
+    stored skins - observed the way a tab sees it: the shared live data
+    (stored wins plus replayed ties) and the stored rows themselves."""
+    _cases = 0
+
+    def __init__(self, case):
+        self.app = _app()
+        AppSession._cases += 1
+        self.event, self.saves = f"check-session-{AppSession._cases}", 0
+
+    def apply(self, edit):
+        group, hole, team, score = edit
+        self.saves += 1
+        payload = {'group': group, 'hole': hole, 'team': team, 'score': score,
+                   'timestamp': f"{self.saves:08d}", 'golfer': None}
+        self.app._persist_scores(self.event, 'day2_score', [payload], 'check',
+                                 f"{self.event}-{self.saves}", group=group)
+
+    def observe(self):
+        with self.app.event_scope(self.event):
+            data = self.app._shared_live_data(self.event, self.app.data_version())
+        skins = {(s['group'], s['hole']): s for s in data['day2_skins'].values()}
+        points = {team: 0 for team in self.app.TEAMS}
+        points.update(data['team_day2_points'])
+        return {'skins': skins, 'points': points, 'stored': _stored_rows(self.app, self.event)}
+
+
+def _stored_rows(app, event):
+    with app.event_scope(event):
+        conn = app.get_db()
+        with app._db_lock():
+            rows = app.repo.get_group_skins(conn, app.GROUPS)
+    return {(r['group_num'], r['hole']): (r['winner'], r['winning_score'], r['points_value'])
+            for r in rows if r['winner']}
+
+
+class AppDay1:
+    """app.calculate_day1_points on the session-shaped score dict."""
+
+    def __init__(self, case):
+        self.app, self.scores = _app(), {}
+
+    def apply(self, edit):
+        team, hole, scramble, alt_shot = edit
+        self.scores[f"{team}_{hole}"] = {'team': team, 'hole': hole, 'scramble': scramble, 'alt_shot': alt_shot}
+
+    def observe(self):
+        result = self.app.calculate_day1_points(dict(self.scores))
+        return {'points': {'scramble': result['scramble_points'], 'alt_shot': result['alt_shot_points']}}
+
+
+APP_CANDIDATES = {'skins': {'app_session': AppSession}, 'day1': {'app': AppDay1}}
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+def make_case(rng, kind, field=None):
+    """A random field and edit sequence. field: fixed {'teams', 'groups', 'holes'} (--app)."""
+    if kind == 'skins':
+        teams = field['teams'] if field else [f"T{i}" for i in range(rng.randint(2, 5))]
+        groups = field['groups'] if field else list(range(1, rng.randint(1, 3) + 1))
+        holes = field['day2_holes'] if field else list(range(1, rng.randint(1, 18) + 1))
+        # Few distinct scores -> lots of ties and long carryovers; None / 0 clear a score.
+        palette = rng.choice([[3, 4], [3, 4, 5], [2, 3, 4, 5, 6]]) + [None, 0]
+        edits = [[rng.choice(groups), rng.choice(holes), rng.choice(teams), rng.choice(palette)]
+                 for _ in range(rng.randint(1, 4 * len(holes) * len(teams)))]
+        return {'kind': kind, 'teams': teams, 'groups': groups, 'holes': holes, 'edits': edits}
+
+    if kind == 'stableford':
+        teams = [f"T{i}" for i in range(rng.randint(1, 5))]
+        units = list(range(1, rng.randint(1, 3) + 1))
+        holes = list(range(1, rng.randint(1, 18) + 1))
+        # Keys are strings so a case survives the JSON round trip of --case.
+        pars = {str(hole): rng.choice([3, 4, 5]) for hole in holes}
+        edits = []
+        for _ in range(rng.randint(1, 3 * len(holes) * len(teams))):
+            hole = rng.choice(holes)
+            score = rng.choice([pars[str(hole)] + rng.randint(-4, 3), None, 0])
+            edits.append([rng.choice(units), hole, rng.choice(teams), score])
+        return {'kind': kind, 'teams': teams, 'holes': holes, 'pars': pars, 'edits': edits}
+
+    if kind == 'match_play':
+        teams = [f"T{i}" for i in range(rng.randint(2, 4))]
+        pairings = {str(unit): rng.sample(teams, 2) for unit in range(1, rng.randint(1, 3) + 1)}
+        holes = list(range(1, rng.randint(1, 18) + 1))
+        palette = rng.choice([[3, 4], [3, 4, 5]]) + [None, 0]
+        edits = []
+        for _ in range(rng.randint(1, 4 * len(holes))):
+            unit = rng.choice(list(pairings))
+            # Mostly the match's own teams; now and then a team that isn't in it (ignored).
+            team = rng.choice(pairings[unit]) if rng.random() < 0.9 else rng.choice(teams)
+            edits.append([int(unit), rng.choice(holes), team, rng.choice(palette)])
+        return {'kind': kind, 'teams': teams, 'pairings': pairings, 'holes': holes,
+                'win_points': rng.choice([1, 2, 3]), 'edits': edits}
+
+    teams = field['teams'] if field else [f"T{i}" for i in range(rng.randint(2, 6))]
+    holes = field['holes'] if field else list(range(1, rng.randint(1, 6) + 1))
+    point_values = field['point_values'] if field else \
+        sorted(rng.sample(range(1, 30), rng.randint(1, len(teams) + 1)), reverse=True)
+    # Fill every cell in random order (so the round completes), plus corrections and clears.
+    cells = [(team, hole) for team in teams for hole in holes]
+    rng.shuffle(cells)
+    cells += [rng.choice(cells) for _ in range(rng.randint(0, len(cells)))]
+    edits = []
+    for team, hole in cells:
+        scramble, alt_shot = rng.choice([4, 5]), rng.choice([4, 5])
+        if rng.random() < 0.1:
+            scramble, alt_shot = rng.choice([(None, alt_shot), (scramble, None), (0, 0)])
+        edits.append([team, hole, scramble, alt_shot])
+    return {'kind': kind, 'teams': teams, 'holes': holes, 'point_values': point_values, 'edits': edits}
+
+
+def check_case(case, candidates):
+    """None if every candidate agrees with the oracle after every edit, else the first mismatch."""
+    oracle = ORACLES[case['kind']](case)
+    engines = {name: cls(case) for name, cls in candidates.items()}
+    for step, edit in enumerate(case['edits']):
+        edit = tuple(edit)
+        oracle.apply(edit)
+        expected = oracle.observe()
+        for name, engine in engines.items():
+            engine.apply(edit)
+            got = engine.observe()
+            for key, value in got.items():
+                if value != expected[key]:
+                    return {'candidate': name, 'step': step, 'edit': list(edit), 'what': key,
+                            'expected': _jsonable(expected[key]), 'got': _jsonable(value)}
+    return None
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    return value
+
+
+def shrink(case, candidates):
+    """Drop edits one at a time while the case still fails."""
+    edits = list(case['edits'])
+    i = 0
+    while i < len(edits):
+        trial = dict(case, edits=edits[:i] + edits[i + 1:])
+        if trial['edits'] and check_case(trial, candidates):
+            edits = trial['edits']
+        else:
+            i += 1
+    return dict(case, edits=edits)
+
+
+def run_chunk(seed, start, count, kinds, use_app=False):
+    """Check cases start..start+count-1. Returns (checked, edits, failure or None)."""
+    field = None
+    if use_app:
+        app = _app()
+        field = {'teams': list(app.TEAMS), 'groups': list(app.GROUPS), 'day2_holes': list(app.DAY2_HOLES),
+                 'holes': list(app.HOLES), 'point_values': list(app.DAY1_POINT_VALUES)}
+    edits = 0
+    for n in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + n)
+        kind = kinds[n % len(kinds)]
+        case = make_case(rng, kind, field)
+        candidates = dict(CANDIDATES[kind], **(APP_CANDIDATES.get(kind, {}) if use_app else {}))
+        edits += len(case['edits'])
+        failure = check_case(case, candidates)
+        if failure:
+            small = shrink(case, candidates)
+            return n - start + 1, edits, {'case_number': n, 'case': small,
+                                         'mismatch': check_case(small, candidates)}
+    return count, edits, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--kind", choices=KINDS + ['all'], default='all')
+    parser.add_argument("--app", action="store_true", help="also check the app's own save paths")
+    parser.add_argument("--case", help="re-run one case (JSON, as printed on a failure)")
+    args = parser.parse_args()
+    kinds = KINDS if args.kind == 'all' else [args.kind]
+
+    if args.case:
+        case = json.loads(args.case)
+        candidates = dict(CANDIDATES[case['kind']], **(APP_CANDIDATES.get(case['kind'], {}) if args.app else {}))
+        failure = check_case(case, candidates)
+        print(json.dumps(failure, indent=2) if failure else "OK")
+        sys.exit(1 if failure else 0)
+
+    started = time.perf_counter()
+    workers = 1 if args.app else max(1, args.workers)
+    chunk = max(1, min(2000, args.cases // (workers * 4) or 1))
+    starts = range(0, args.cases, chunk)
+    jobs = [(args.seed, s, min(chunk, args.cases - s), kinds, args.app) for s in starts]
+    checked = edits = 0
+    failure = None
+    if workers == 1:
+        results = (run_chunk(*job) for job in jobs)
+    else:
+        pool = ProcessPoolExecutor(workers)
+        results = pool.map(run_chunk, *zip(*jobs))
+    for n, e, fail in results:
+        checked, edits = checked + n, edits + e
+        if fail:
+            failure = fail
+            break
+    if workers > 1:
+        pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"{checked} cases, {edits} edits, {elapsed:.1f}s (seed {args.seed}, {workers} worker(s))")
+    if failure:
+        print(f"MISMATCH in case {failure['case_number']} "
+              f"(shrunk to {len(failure['case']['edits'])} edits):")
+        print(json.dumps(failure['mismatch'], indent=2))
+        print("re-run with:  --case '" + json.dumps(failure['case']) + "'" + (" --app" if args.app else ""))
+        sys.exit(1)
+    print("OK - every candidate matched the reference after every edit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Check: winprob.build_model / simulate only play the field's own holes.
+
+Builds a 9-hole field (Day 1 and Day 2) on the full 18-hole course - what
+GCUP_FIELD_CONFIG with day1_holes / day2_holes: 9 gives the app, e.g. from
+scripts/gen_tournament.py --holes 9 - and enters every one of its scores.
+Nothing is left to play, so the model must hold no unplayed holes and every
+simulated finish must be the same one: each team's expected points exactly
+the hand-scored total, and the winner's probability exactly 1.
+
+    python scripts/check_winprob.py [--sims 20000]
+
+Exits 1 on any failure.
+"""
+
+import argparse
+import os
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import winprob  # noqa: E402
+
+TEAMS = ["A", "B", "C"]
+GROUPS = [1, 2]
+POINT_VALUES = [11, 7.5, 4]
+COURSE = {h: {'par': (3, 4, 5)[h % 3]} for h in range(1, 19)}
+HOLES = list(range(1, 10))
+
+
+def nine_hole_field():
+    """(day1_scores, day2_scores, expected points) with every 9-hole score entered.
+
+    Day 1: A is a stroke better than B, B than C, in both formats. Day 2: B
+    wins every hole of group 1, C every hole of group 2."""
+    day1, day2 = {}, {}
+    for hole in HOLES:
+        par = COURSE[hole]['par']
+        for i, team in enumerate(TEAMS):
+            day1[f"{team}_{hole}"] = {'team': team, 'hole': hole, 'scramble': par + i, 'alt_shot': par + i}
+        for group, winner in ((1, "B"), (2, "C")):
+            for team in TEAMS:
+                score = par - 1 if team == winner else par
+                day2[f"{group}_{hole}_{team}"] = {'group': group, 'hole': hole, 'team': team, 'score': score}
+    expected = {"A": 2 * 11, "B": 2 * 7.5 + len(HOLES), "C": 2 * 4 + len(HOLES)}
+    return day1, day2, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sims", type=int, default=20_000)
+    args = parser.parse_args()
+
+    day1, day2, expected = nine_hole_field()
+    history = {'scramble': [], 'alt_shot': [], 'skins': []}
+    model = winprob.build_model(day1, day2, TEAMS, GROUPS, COURSE, COURSE, POINT_VALUES, history,
+                                HOLES, HOLES)
+    problems = []
+    if model['day2_known'].shape != (len(GROUPS), len(HOLES), len(TEAMS)):
+        problems.append(f"Day 2 grid is {model['day2_known'].shape}, not {len(GROUPS)} groups x 9 holes")
+    if (model['day2_known'] == 0).any():
+        problems.append("Day 2 grid has unplayed holes")
+    if (model['day1_total_cdfs'][:, :, 0] != 1).any():
+        problems.append("Day 1 still has holes left to simulate")
+
+    result = winprob.simulate(model, args.sims, seed=0)
+    winner = max(expected, key=expected.get)
+    for team in TEAMS:
+        got = result[team]
+        if abs(got['expected_points'] - expected[team]) > 1e-9:
+            problems.append(f"{team}: expected points {got['expected_points']}, should be {expected[team]}")
+        if got['win_prob'] != (1.0 if team == winner else 0.0):
+            problems.append(f"{team}: win probability {got['win_prob']}")
+
+    for problem in problems:
+        print(problem)
+    print(("FAILED" if problems else "OK") + f" - 9-hole field, {args.sims} simulations")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
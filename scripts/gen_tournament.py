@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic tournament generator for scale testing.
+
+Writes a realistic tournament of any size - N teams, M skins groups, up to
+18 holes a day - either straight into a tournament database (schema, scores
+with edit churn and per-row versions, write log, stored skins, rosters and
+group assignments) or as history/<year>_results.json files. Hole scores are
+drawn from the to-par spread in the real history files, with a small
+per-team strength, and a tie rate to force carryovers. Same seed, same
+tournament.
+
+    # ~100x a real Cup, as a second event next to the real one
+    python scripts/gen_tournament.py --teams 30 --groups 50 --out /tmp/gcup-synth
+    GCUP_EVENTS_DIR=/tmp/gcup-synth GCUP_EVENTS=synthetic \\
+        GCUP_FIELD_CONFIG=/tmp/gcup-synth/field.json streamlit run app.py
+
+    # ten seasons of history for the history page / win-probability model
+    python scripts/gen_tournament.py --history-dir /tmp/gcup-history --years 10
+
+The database lands at <out>/<event>.db (see "Events" in app.py) together
+with the field.json it needs.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import repository as repo                                    # noqa: E402
+from scoring import (award_points_with_ties, replay_all_skins,  # noqa: E402
+                     team_points_from_skins)
+
+MIN_SCORE, MAX_SCORE = 1, 15
+# Used when the history files have no hole-by-hole data for a format.
+FALLBACK_TO_PAR = [-1, 0, 0, 0, 1, 1, 1, 1, 2, 2, 3]
+
+
+def _course():
+    """The Cup's course pars, {hole: par} (read from app.py's DAY1_COURSE)."""
+    logging.disable(logging.WARNING)   # bare-mode Streamlit warnings
+    import app
+    return {hole: info['par'] for hole, info in app.DAY1_COURSE.items()}
+
+
+def history_to_par(history_dir):
+    """{'scramble'|'alt_shot'|'skins': [strokes to par, ...]} from every history file."""
+    obs = {'scramble': [], 'alt_shot': [], 'skins': []}
+    for name in sorted(os.listdir(history_dir)) if os.path.isdir(history_dir) else []:
+        if not name.endswith("_results.json") or not name[:4].isdigit():
+            continue
+        with open(os.path.join(history_dir, name), encoding="utf-8") as f:
+            data = json.load(f)
+        raw = data.get('raw_data') or {}
+        pars = (data.get('format_notes') or {}).get('course_par_used_for_to_par_stats') or {}
+        for row in raw.get('day1_scores', []):
+            par = pars.get(str(row.get('Hole')))
+            if par and row.get('Scramble_Score') and row.get('Alt_Shot_Score'):
+                obs['scramble'].append(row['Scramble_Score'] - par)
+                obs['alt_shot'].append(row['Alt_Shot_Score'] - par)
+        for row in raw.get('day2_scores', []):
+            par = pars.get(str(row.get('Hole')))
+            if par and row.get('Score'):
+                obs['skins'].append(row['Score'] - par)
+    return {k: v or list(FALLBACK_TO_PAR) for k, v in obs.items()}
+
+
+def generate(teams=3, groups=5, holes=18, day2_holes=18, progress=1.0, churn=0.1,
+             tie_rate=0.1, seed=0, to_par=None, pars=None, start=None):
+    """Build one tournament in memory.
+
+    progress: share of holes already played (0-1); churn: share of scores
+    saved more than once (a wrong value first, then the fix); tie_rate:
+    extra chance a skins hole's low score is shared, forcing a carryover.
+    Returns {'teams', 'groups', 'holes', 'day2_holes', 'pars', 'saves',
+    'day1', 'day2', 'golfers'} - saves is every save in order, day1 / day2
+    are the final rows.
+    """
+    rng = random.Random(seed)
+    to_par = to_par or {k: list(FALLBACK_TO_PAR) for k in ('scramble', 'alt_shot', 'skins')}
+    pars = pars or {h: 4 for h in range(1, 19)}
+    team_names = ["Young Guns", "OGs", "Mids"][:teams] if teams <= 3 else \
+        [f"Team {i + 1:0{len(str(teams))}d}" for i in range(teams)]
+    group_nums = list(range(1, groups + 1))
+    d1_holes, d2_holes = list(range(1, holes + 1)), list(range(1, day2_holes + 1))
+    strength = {t: rng.uniform(-0.3, 0.3) for t in team_names}   # chance per hole of a stroke better/worse
+    clock = start or datetime(2026, 8, 1, 8, 0)
+
+    def draw(fmt, hole, team):
+        score = pars[hole] + rng.choice(to_par[fmt])
+        if rng.random() < abs(strength[team]):
+            score += -1 if strength[team] > 0 else 1
+        return min(max(score, MIN_SCORE), MAX_SCORE)
+
+    saves, day1, day2 = [], {}, {}
+
+    def save(action, key, payload):
+        nonlocal clock
+        clock += timedelta(seconds=rng.randint(5, 90))
+        payload['timestamp'] = clock.isoformat()
+        saves.append((action, payload))
+        rows = day1 if action == 'day1_score' else day2
+        rows[key] = dict(payload, version=rows.get(key, {}).get('version', 0) + 1)
+
+    for team in team_names:
+        for hole in d1_holes[:_played(len(d1_holes), progress, rng)]:
+            final = {'scramble_score': draw('scramble', hole, team),
+                     'alt_shot_score': draw('alt_shot', hole, team)}
+            if rng.random() < churn:
+                save('day1_score', (team, hole), {'team': team, 'hole': hole,
+                                                  'scramble_score': final['scramble_score'] + 1,
+                                                  'alt_shot_score': final['alt_shot_score']})
+            save('day1_score', (team, hole), dict(team=team, hole=hole, **final))
+
+    golfers = {team: [f"{team} #{g}" for g in group_nums] for team in team_names}
+    for group in group_nums:
+        for hole in d2_holes[:_played(len(d2_holes), progress, rng)]:
+            scores = {team: draw('skins', hole, team) for team in team_names}
+            if len(team_names) > 1 and rng.random() < tie_rate:
+                low = min(scores.values())
+                scores[rng.choice([t for t in team_names if scores[t] != low] or team_names)] = low
+            for team, score in scores.items():
+                payload = {'group': group, 'hole': hole, 'team': team, 'score': score,
+                           'golfer': golfers[team][group - 1]}
+                if rng.random() < churn:
+                    save('day2_score', (group, hole, team), dict(payload, score=min(score + 1, MAX_SCORE)))
+                save('day2_score', (group, hole, team), payload)
+
+    return {'teams': team_names, 'groups': group_nums, 'holes': d1_holes, 'day2_holes': d2_holes,
+            'pars': pars, 'saves': saves, 'day1': day1, 'day2': day2, 'golfers': golfers}
+
+
+def _played(n_holes, progress, rng):
+    """Holes played by one team / group: progress of the round, give or take one."""
+    if progress >= 1:
+        return n_holes
+    return max(0, min(n_holes, round(n_holes * progress) + rng.randint(-1, 1)))
+
+
+def _day2_session_rows(t):
+    """Final Day 2 rows in the {"<group>_<hole>_<team>": {...}} shape scoring.py uses."""
+    return {f"{g}_{h}_{team}": {'group': g, 'hole': h, 'team': team, 'score': r['score']}
+            for (g, h, team), r in t['day2'].items()}
+
+
+def write_db(t, path, revealed=True):
+    """Write a generated tournament into a fresh database at `path` (created
+    through app.py, so the schema and migrations are the real ones)."""
+    logging.disable(logging.WARNING)
+    import app
+    if os.path.exists(path):
+        raise SystemExit(f"{path} already exists - pick another --out / --event")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    app.DB_PATH = path
+    conn = app.get_db()
+    with app._db_lock():
+        for log_id, (action, payload) in enumerate(t['saves'], start=1):
+            repo.put_log_entry(conn, log_id, 'synthetic', action, json.dumps(payload),
+                               payload['timestamp'], app.LOG_SYNCED, None)
+        repo.upsert_many(conn, 'day1_scores', [dict(r) for r in t['day1'].values()])
+        repo.upsert_many(conn, 'day2_scores', [
+            {'group_num': r['group'], 'hole': r['hole'], 'team': r['team'], 'score': r['score'],
+             'golfer': r['golfer'], 'timestamp': r['timestamp'], 'version': r['version']}
+            for r in t['day2'].values()])
+        skins = replay_all_skins(_day2_session_rows(t), t['teams'], t['groups'], t['day2_holes'])
+        repo.upsert_many(conn, 'day2_skins', [
+            {'group_num': s['group'], 'hole': s['hole'], 'winner': s['winner'],
+             'winning_score': s['score'], 'points_value': s['points_value']}
+            for s in skins.values() if not s['tied']])
+        repo.upsert_many(conn, 'roster', [{'team': team, 'golfer': g}
+                                          for team, names in t['golfers'].items() for g in names])
+        repo.upsert_many(conn, 'day2_assignments', [
+            {'team': team, 'golfer': g, 'group_num': i + 1}
+            for team, names in t['golfers'].items() for i, g in enumerate(names)])
+        repo.upsert_many(conn, 'day1_roles', [
+            {'team': team, 'slot': slot, 'golfer': g}
+            for team, names in t['golfers'].items() for slot, g in zip(app.DAY1_SLOTS, names)])
+        if revealed:
+            repo.set_meta(conn, 'revealed', '1')
+        conn.commit()
+    return path
+
+
+def field_config(t, point_values=(22, 15, 8)):
+    """The GCUP_FIELD_CONFIG file the app needs to read this tournament."""
+    return {'teams': t['teams'], 'groups': len(t['groups']), 'day1_holes': len(t['holes']),
+            'day2_holes': len(t['day2_holes']), 'day1_point_values': list(point_values)}
+
+
+def history_file(t, year, point_values=(22, 15, 8)):
+    """A history/<year>_results.json document for a finished tournament."""
+    totals = {team: {'scramble': 0, 'alt_shot': 0, 'holes_completed': 0} for team in t['teams']}
+    for r in t['day1'].values():
+        totals[r['team']]['scramble'] += r['scramble_score']
+        totals[r['team']]['alt_shot'] += r['alt_shot_score']
+        totals[r['team']]['holes_completed'] += 1
+    par_total = sum(t['pars'][h] for h in t['holes'])
+    for team_totals in totals.values():
+        team_totals['scramble_to_par'] = team_totals['scramble'] - par_total
+        team_totals['alt_shot_to_par'] = team_totals['alt_shot'] - par_total
+    scramble = award_points_with_ties({k: v['scramble'] for k, v in totals.items()}, point_values)
+    alt_shot = award_points_with_ties({k: v['alt_shot'] for k, v in totals.items()}, point_values)
+    skins = replay_all_skins(_day2_session_rows(t), t['teams'], t['groups'], t['day2_holes'])
+    skins_points = team_points_from_skins(skins, t['teams'])
+    overall = {team: scramble.get(team, 0) + alt_shot.get(team, 0) + skins_points.get(team, 0)
+               for team in t['teams']}
+    won_by = {}
+    for s in skins.values():
+        if not s['tied']:
+            golfer = t['golfers'][s['winner']][s['group'] - 1]
+            won_by[golfer] = won_by.get(golfer, 0) + s['points_value']
+    return {
+        'year': year,
+        'format_notes': {
+            'day1': f"Synthetic: scramble + alternating shot, {len(t['holes'])} holes, "
+                    f"{len(t['teams'])} teams.",
+            'day2': f"Synthetic: individual skins, {len(t['groups'])} groups x "
+                    f"{len(t['day2_holes'])} holes, carryover on ties.",
+            'course_par_used_for_to_par_stats': {str(h): p for h, p in t['pars'].items()},
+            'day1_point_values': list(point_values),
+            'day1_holes': len(t['holes']),
+            'day2_holes': len(t['day2_holes']),
+        },
+        'results': {
+            'day1_team_totals': totals,
+            'day1_scramble_points': scramble,
+            'day1_alt_shot_points': alt_shot,
+            'day2_skins_points': skins_points,
+            'overall_points': overall,
+            'golfer_skins': [{'golfer': g, 'team': g.rsplit(' #', 1)[0], 'skins': n}
+                             for g, n in sorted(won_by.items(), key=lambda kv: -kv[1])],
+            'champion': max(overall, key=overall.get),
+            'supreme_leader': max(won_by, key=won_by.get) if won_by else None,
+        },
+        'raw_data': {
+            'day1_scores': [{'Team': r['team'], 'Hole': r['hole'], 'Scramble_Score': r['scramble_score'],
+                             'Alt_Shot_Score': r['alt_shot_score'], 'Timestamp': r['timestamp'],
+                             'ID': f"{r['team']}_{r['hole']}"} for r in t['day1'].values()],
+            'day2_scores': [{'Group': r['group'], 'Hole': r['hole'], 'Team': r['team'], 'Score': r['score'],
+                             'Golfer': r['golfer'], 'Timestamp': r['timestamp'],
+                             'ID': f"{r['group']}_{r['hole']}_{r['team']}"} for r in t['day2'].values()],
+            'day2_skins': [{'Group': s['group'], 'Hole': s['hole'], 'Winner': s['winner'],
+                            'Winning_Score': s['score'], 'Points_Value': s['points_value']}
+                           for s in skins.values() if not s['tied']],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--teams", type=int, default=3)
+    parser.add_argument("--groups", type=int, default=5)
+    parser.add_argument("--holes", type=int, default=18, help="Day 1 holes (max 18)")
+    parser.add_argument("--day2-holes", type=int, default=18, help="skins holes (max 18)")
+    parser.add_argument("--progress", type=float, default=1.0, help="share of holes played, 0-1")
+    parser.add_argument("--churn", type=float, default=0.1, help="share of scores edited after saving")
+    parser.add_argument("--tie-rate", type=float, default=0.1, help="extra chance of a tied skins hole")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="directory for <event>.db + field.json (default: a temp dir)")
+    parser.add_argument("--event", default="synthetic", help="event id, i.e. the database file name")
+    parser.add_argument("--history-dir", help="write history files here instead of a database")
+    parser.add_argument("--years", type=int, default=1, help="seasons of history to write")
+    args = parser.parse_args()
+    if not (1 <= args.holes <= 18 and 1 <= args.day2_holes <= 18):
+        parser.error("--holes / --day2-holes must be between 1 and 18")
+
+    pars = _course()
+    to_par = history_to_par(os.path.join(REPO, "history"))
+    options = dict(teams=args.teams, groups=args.groups, holes=args.holes, day2_holes=args.day2_holes,
+                   churn=args.churn, tie_rate=args.tie_rate, to_par=to_par, pars=pars)
+    started = time.perf_counter()
+
+    if args.history_dir:
+        os.makedirs(args.history_dir, exist_ok=True)
+        first = datetime.now().year - args.years
+        for i in range(args.years):
+            t = generate(seed=args.seed + i, start=datetime(first + i, 8, 1, 8, 0), **options)
+            path = os.path.join(args.history_dir, f"{first + i}_results.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(history_file(t, first + i), f, indent=2)
+        print(f"{args.years} history file(s) in {args.history_dir} "
+              f"({time.perf_counter() - started:.1f}s)")
+        return
+
+    out = args.out or tempfile.mkdtemp(prefix="gcup-synth-")
+    t = generate(progress=args.progress, seed=args.seed, **options)
+    path = write_db(t, os.path.join(out, f"{args.event}.db"))
+    with open(os.path.join(out, "field.json"), "w", encoding="utf-8") as f:
+        json.dump(field_config(t), f, indent=2)
+    print(f"{len(t['saves'])} saves, {len(t['day1'])} Day 1 rows, {len(t['day2'])} Day 2 rows "
+          f"-> {path} ({time.perf_counter() - started:.1f}s)")
+    print(f"GCUP_EVENTS_DIR={out} GCUP_EVENTS={args.event} "
+          f"GCUP_FIELD_CONFIG={os.path.join(out, 'field.json')} streamlit run app.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Archive rescoring: replay every history year's raw_data through today's engines.
+
+Each year's hole-by-hole rows are streamed out of history/ (via the compact
+sidecars, see archive.py) into formats.StrokePlayEngine (Day 1 scramble and
+alt shot) and formats.SkinsEngine (Day 2), using that year's own format:
+point values, holes and groups come from format_notes - explicit keys
+(day1_point_values, day1_holes, day2_holes) if the file has them, else read
+from its notes ("Points: 11 / 7.5 / 4", "5 groups x 9 holes") and the raw
+rows themselves. Years run in a process pool. The recomputed points are
+diffed against the stored results.
+
+    python scripts/rescore_history.py                 # validate: exit 1 on any diff
+    python scripts/rescore_history.py --rules current # what if this year's rules had applied?
+    python scripts/rescore_history.py --rules rules.json [--json]
+
+--rules takes the app's current field (day1 point values, hole counts) or a
+JSON file with any of day1_point_values / day1_holes / day2_holes - the
+same keys as GCUP_FIELD_CONFIG. Years without raw_data are listed and
+skipped.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import archive                                    # noqa: E402
+from formats import SkinsEngine, StrokePlayEngine  # noqa: E402
+
+HISTORY_DIR = os.path.join(REPO, "history")
+HISTORY_CACHE_DIR = os.environ.get("GCUP_HISTORY_CACHE_DIR", os.path.join(HISTORY_DIR, ".compact"))
+COMPARED = ('day1_scramble_points', 'day1_alt_shot_points', 'day2_skins_points', 'overall_points')
+
+
+def year_format(summary, day1_rows, day2_rows):
+    """{'day1_point_values', 'day1_holes', 'day2_holes', 'teams', 'groups'} for one year."""
+    notes = summary.get('format_notes') or {}
+    day1_text, day2_text = notes.get('day1') or "", notes.get('day2') or ""
+    teams = list(dict.fromkeys([r['Team'] for r in day1_rows] + [r['Team'] for r in day2_rows]))
+
+    point_values = notes.get('day1_point_values')
+    match = re.search(r"Points:\s*([\d.]+(?:\s*/\s*[\d.]+)+)", day1_text)
+    if point_values is None and match:
+        point_values = [float(v) if '.' in v else int(v) for v in re.split(r"\s*/\s*", match.group(1))]
+
+    def holes(key, text, rows, pattern):
+        if notes.get(key):
+            return int(notes[key])
+        found = re.search(pattern, text)
+        if found:
+            return int(found.group(1))
+        return max((r['Hole'] for r in rows), default=0)
+
+    return {'day1_point_values': point_values,
+            'day1_holes': holes('day1_holes', day1_text, day1_rows, r"(\d+) holes"),
+            'day2_holes': holes('day2_holes', day2_text, day2_rows, r"x\s*(\d+)\s*holes"),
+            'teams': teams,
+            'groups': sorted({r['Group'] for r in day2_rows})}
+
+
+def rescore(fmt, day1_rows, day2_rows):
+    """Recomputed results for one year under `fmt`."""
+    teams = fmt['teams']
+    day1 = StrokePlayEngine(teams, range(1, fmt['day1_holes'] + 1), fmt['day1_point_values'] or [])
+    for r in day1_rows:
+        both = bool(r.get('Scramble_Score') and r.get('Alt_Shot_Score'))
+        day1.update('scramble', r['Hole'], r['Team'], r.get('Scramble_Score') if both else None)
+        day1.update('alt_shot', r['Hole'], r['Team'], r.get('Alt_Shot_Score') if both else None)
+
+    skins = SkinsEngine(teams, range(1, fmt['day2_holes'] + 1))
+    won_by = {}
+    for r in day2_rows:
+        if r['Hole'] <= fmt['day2_holes']:
+            skins.update(r['Group'], r['Hole'], r['Team'], r.get('Score'))
+    golfers = {(r['Group'], r['Hole'], r['Team']): r.get('Golfer') for r in day2_rows}
+    for group in fmt['groups']:
+        for result in skins.results(group).values():
+            golfer = golfers.get((group, result['hole'], result['winner']))
+            if golfer and not result['tied']:
+                entry = won_by.setdefault(golfer, {'golfer': golfer, 'team': result['winner'], 'skins': 0})
+                entry['skins'] += result['points_value']
+
+    results = {'day1_scramble_points': day1.unit_points('scramble'),
+               'day1_alt_shot_points': day1.unit_points('alt_shot'),
+               'day2_skins_points': {t: skins.points().get(t, 0) for t in teams}}
+    results['overall_points'] = {t: sum(results[k].get(t, 0) for k in COMPARED[:3]) for t in teams}
+    results['champion'] = max(results['overall_points'], key=results['overall_points'].get) if teams else None
+    if won_by:
+        results['golfer_skins'] = sorted(won_by.values(), key=lambda x: (-x['skins'], x['golfer']))
+    return results
+
+
+def diff(stored, rescored):
+    """[(field, stored, rescored)] for every value that differs."""
+    out = []
+    for key in COMPARED:
+        if key not in stored:
+            continue
+        for team in sorted(set(stored[key]) | set(rescored.get(key, {}))):
+            a, b = stored[key].get(team, 0), rescored.get(key, {}).get(team, 0)
+            if abs(a - b) > 1e-9:
+                out.append((f"{key}.{team}", a, b))
+    if stored.get('champion') and stored['champion'] != rescored.get('champion'):
+        out.append(('champion', stored['champion'], rescored.get('champion')))
+    if stored.get('golfer_skins') and 'golfer_skins' in rescored:
+        before = {g['golfer']: g.get('skins', 0) for g in stored['golfer_skins']}
+        after = {g['golfer']: g['skins'] for g in rescored['golfer_skins']}
+        for golfer in sorted(set(before) | set(after)):
+            if before.get(golfer, 0) != after.get(golfer, 0):
+                out.append((f"golfer_skins.{golfer}", before.get(golfer, 0), after.get(golfer, 0)))
+    return out
+
+
+def rescore_year(path, rules=None):
+    """Rescore one history file. rules: format overrides ('what if'). Runs in a worker process."""
+    logging.disable(logging.WARNING)
+    summary = archive.load_summary(path, HISTORY_CACHE_DIR)
+    day1_rows = list(archive.iter_raw(path, HISTORY_CACHE_DIR, 'day1_scores',
+                                      ('Team', 'Hole', 'Scramble_Score', 'Alt_Shot_Score')))
+    day2_rows = list(archive.iter_raw(path, HISTORY_CACHE_DIR, 'day2_scores',
+                                      ('Group', 'Hole', 'Team', 'Score', 'Golfer')))
+    year = summary.get('year') or int(os.path.basename(path)[:4])
+    if not day1_rows and not day2_rows:
+        return {'year': year, 'skipped': "no raw_data"}
+    fmt = year_format(summary, day1_rows, day2_rows)
+    fmt.update(rules or {})
+    if not fmt['day1_point_values']:
+        return {'year': year, 'skipped': "no Day 1 point values in format_notes"}
+    rescored = rescore(fmt, day1_rows, day2_rows)
+    stored = summary.get('results') or {}
+    return {'year': year, 'format': fmt, 'stored': stored, 'rescored': rescored,
+            'diffs': diff(stored, rescored)}
+
+
+def current_rules():
+    """The app's configured field (GCUP_FIELD_CONFIG or the Cup's defaults)."""
+    logging.disable(logging.WARNING)   # bare-mode Streamlit warnings
+    import app
+    return {'day1_point_values': list(app.DAY1_POINT_VALUES), 'day1_holes': len(app.HOLES),
+            'day2_holes': len(app.DAY2_HOLES)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rules", help="'current' or a JSON file of format overrides (what-if mode)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--history-dir", default=HISTORY_DIR)
+    parser.add_argument("--json", action="store_true", help="print the full results as JSON")
+    args = parser.parse_args()
+
+    rules = None
+    if args.rules == 'current':
+        rules = current_rules()
+    elif args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            rules = {k: v for k, v in json.load(f).items() if k in ('day1_point_values', 'day1_holes', 'day2_holes')}
+
+    paths = sorted(os.path.join(args.history_dir, f) for f in os.listdir(args.history_dir)
+                   if re.match(r"^\d{4}_results\.json$", f))
+    started = time.perf_counter()
+    if args.workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(min(args.workers, len(paths))) as pool:
+            reports = list(pool.map(rescore_year, paths, [rules] * len(paths)))
+    else:
+        reports = [rescore_year(path, rules) for path in paths]
+
+    if args.json:
+        print(json.dumps(reports, indent=2, default=str))
+    for r in reports:
+        if 'skipped' in r:
+            print(f"{r['year']}  skipped ({r['skipped']})")
+            continue
+        overall = ", ".join(f"{t} {p:g}" for t, p in
+                            sorted(r['rescored']['overall_points'].items(), key=lambda kv: -kv[1]))
+        status = "OK" if not r['diffs'] else f"{len(r['diffs'])} difference(s)"
+        print(f"{r['year']}  {status}  - rescored: {overall}")
+        for field, before, after in r['diffs']:
+            print(f"        {field}: stored {before}, rescored {after}")
+    rescored = [r for r in reports if 'skipped' not in r]
+    print(f"{len(rescored)} year(s) rescored in {time.perf_counter() - started:.2f}s"
+          + (f" under {json.dumps(rules)}" if rules else ""))
+    if rules is None and any(r['diffs'] for r in rescored):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo win probabilities for the live leaderboard.
+
+Plays out the rest of the tournament many thousands of times at once with
+NumPy: every unplayed Day 1 hole (scramble + alt shot) and every unplayed
+Day 2 skins score is sampled from a per-par "score to par" distribution built
+from past years' raw_data plus everything entered so far this year. Each
+simulated finish is then scored with the real rules - Day 1 position points
+with tie-splitting, skins with carryover - and we count who wins.
+
+Like scoring.py this has no Streamlit or database dependency, so simulation
+chunks can be farmed out to a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Every sampled hole lands somewhere in this range relative to par.
+TO_PAR_SUPPORT = np.arange(-3, 9)
+
+# Weak prior mixed into every distribution so a par type with little or no
+# data still produces believable scores (mostly par / bogey).
+_PRIOR_SHAPE = {-2: 0.01, -1: 0.08, 0: 0.30, 1: 0.35, 2: 0.17, 3: 0.06, 4: 0.03}
+PRIOR_STRENGTH = 5.0
+
+MIN_SCORE, MAX_SCORE = 1, 15   # same bounds as the score inputs
+DEFAULT_CHUNK = 25_000
+LOOKUP_SIZE = 4096             # skins scores are drawn via a quantile lookup table
+
+
+def _score_cdfs(observations, pars):
+    """observations: iterable of (par, to_par). Returns cdfs of shape (len(pars), len(support))."""
+    par_index = {p: i for i, p in enumerate(pars)}
+    prior = np.array([_PRIOR_SHAPE.get(int(v), 0.0) for v in TO_PAR_SUPPORT])
+    counts = np.tile(prior / prior.sum() * PRIOR_STRENGTH, (len(pars), 1))
+    lo, hi = TO_PAR_SUPPORT[0], TO_PAR_SUPPORT[-1]
+    for par, to_par in observations:
+        if par in par_index:
+            counts[par_index[par], int(min(max(to_par, lo), hi)) - lo] += 1
+    return np.cumsum(counts / counts.sum(axis=1, keepdims=True), axis=1)
+
+
+def _score_at(support_idx, par):
+    """Support index -> actual strokes on a hole of this par (kept inside the input bounds)."""
+    support_idx = np.minimum(support_idx, len(TO_PAR_SUPPORT) - 1)
+    return np.clip(par + TO_PAR_SUPPORT[support_idx], MIN_SCORE, MAX_SCORE)
+
+
+def _hole_pmf(cdf, par):
+    """Probability of each stroke count 0..MAX_SCORE on one hole."""
+    pmf = np.zeros(MAX_SCORE + 1)
+    np.add.at(pmf, _score_at(np.arange(len(TO_PAR_SUPPORT)), par), np.diff(cdf, prepend=0.0))
+    return pmf
+
+
+def history_observations(years_data):
+    """Pull (par, to_par) observations out of every history file's raw_data.
+
+    Uses each year's own course pars (format_notes.course_par_used_for_to_par_stats)
+    since the course has changed over the years. Years without raw_data or
+    without a par table are skipped.
+    """
+    obs = {'scramble': [], 'alt_shot': [], 'skins': []}
+    for data in years_data.values():
+        raw = data.get('raw_data') or {}
+        par_map = (data.get('format_notes') or {}).get('course_par_used_for_to_par_stats') or {}
+        if not raw or not par_map:
+            continue
+        for row in raw.get('day1_scores', []):
+            par = par_map.get(str(row.get('Hole')))
+            if par is None:
+                continue
+            if row.get('Scramble_Score'):
+                obs['scramble'].append((par, row['Scramble_Score'] - par))
+            if row.get('Alt_Shot_Score'):
+                obs['alt_shot'].append((par, row['Alt_Shot_Score'] - par))
+        for row in raw.get('day2_scores', []):
+            par = par_map.get(str(row.get('Hole')))
+            if par is not None and row.get('Score'):
+                obs['skins'].append((par, row['Score'] - par))
+    return obs
+
+
+def build_model(day1_scores, day2_scores, teams, groups, day1_course, day2_course,
+                point_values, history_obs, day1_holes=None, day2_holes=None):
+    """Freeze the current state + score distributions into a picklable dict of arrays.
+
+    day1_holes / day2_holes: the holes the field actually plays (the app's
+    HOLES / DAY2_HOLES); default every hole on the course."""
+    d1_holes = sorted(day1_course) if day1_holes is None else list(day1_holes)
+    d2_holes = sorted(day2_course) if day2_holes is None else list(day2_holes)
+    pars = sorted({day1_course[h]['par'] for h in d1_holes} | {day2_course[h]['par'] for h in d2_holes})
+    par_index = {p: i for i, p in enumerate(pars)}
+    team_index = {t: i for i, t in enumerate(teams)}
+
+    obs = {k: list(v) for k, v in history_obs.items()}
+
+    # Day 1: fixed totals so far + count of unplayed holes per par, per team.
+    day1_fixed = np.zeros((len(teams), 2))
+    day1_remaining = np.zeros((len(teams), len(pars)), dtype=np.int64)
+    played = {t: set() for t in teams}
+    d1_set = set(d1_holes)
+    for row in day1_scores.values():
+        if row['team'] in team_index and row['hole'] in d1_set and row['scramble'] and row['alt_shot']:
+            ti = team_index[row['team']]
+            par = day1_course[row['hole']]['par']
+            day1_fixed[ti] += (row['scramble'], row['alt_shot'])
+            played[row['team']].add(row['hole'])
+            obs['scramble'].append((par, row['scramble'] - par))
+            obs['alt_shot'].append((par, row['alt_shot'] - par))
+    for t in teams:
+        for hole in d1_holes:
+            if hole not in played[t]:
+                day1_remaining[team_index[t], par_index[day1_course[hole]['par']]] += 1
+
+    # Day 2: known skins scores (0 = not entered yet) per group/hole/team.
+    day2_known = np.zeros((len(groups), len(d2_holes), len(teams)), dtype=np.int16)
+    group_index = {g: i for i, g in enumerate(groups)}
+    hole_index = {h: i for i, h in enumerate(d2_holes)}
+    for row in day2_scores.values():
+        score = row.get('score')
+        if score and score > 0 and row['group'] in group_index and row['hole'] in hole_index \
+                and row['team'] in team_index:
+            day2_known[group_index[row['group']], hole_index[row['hole']], team_index[row['team']]] = score
+            par = day2_course[row['hole']]['par']
+            obs['skins'].append((par, score - par))
+
+    # Distribution of each team's remaining strokes per format: the per-hole
+    # score distributions convolved over every hole it still has to play.
+    day1_cdfs = [_score_cdfs(obs['scramble'], pars), _score_cdfs(obs['alt_shot'], pars)]
+    longest = MAX_SCORE * len(d1_holes) + 1
+    day1_total_cdfs = np.ones((len(teams), 2, longest))
+    for ti in range(len(teams)):
+        for fi, cdfs in enumerate(day1_cdfs):
+            pmf = np.array([1.0])
+            for pi, par in enumerate(pars):
+                for _ in range(day1_remaining[ti, pi]):
+                    pmf = np.convolve(pmf, _hole_pmf(cdfs[pi], par))
+            day1_total_cdfs[ti, fi, :len(pmf)] = np.cumsum(pmf)
+
+    skins_cdfs = _score_cdfs(obs['skins'], pars)
+    quantiles = (np.arange(LOOKUP_SIZE) + 0.5) / LOOKUP_SIZE
+    day2_tables = np.stack([
+        _score_at(np.searchsorted(skins_cdfs[pi], quantiles, side='right'), par)
+        for pi, par in enumerate(pars)
+    ]).astype(np.int16)
+
+    return {
+        'teams': list(teams),
+        'pars': np.array(pars),
+        'point_values': np.array(point_values, dtype=float),
+        'day1_fixed': day1_fixed,
+        'day1_total_cdfs': day1_total_cdfs,
+        'day2_known': day2_known,
+        'day2_pars': np.array([day2_course[h]['par'] for h in d2_holes]),
+        'day2_tables': day2_tables,
+    }
+
+
+def position_points(totals, point_values):
+    """Vectorized tie-splitting: totals (n, teams), lowest wins -> points (n, teams).
+
+    A team with `b` teams strictly ahead and `k` teams (itself included) level
+    gets the average of positions b .. b+k-1 - the same as award_points_with_ties.
+    `b` and `k` come from one sort per row plus a binary search, so this stays
+    O(teams log teams) per simulation rather than comparing every pair.
+    """
+    n, n_teams = totals.shape
+    # Shift each row into its own value range so one flat sort/search does every row.
+    span = float(totals.max() - totals.min()) + 1.0 if totals.size else 1.0
+    keyed = (totals - totals.min() if totals.size else totals) + np.arange(n)[:, None] * span
+    flat = np.sort(keyed, axis=1).ravel()
+    row_start = (np.arange(n) * n_teams)[:, None]
+    ahead = np.searchsorted(flat, keyed, side='left') - row_start
+    level = np.searchsorted(flat, keyed, side='right') - row_start - ahead
+    cum = np.concatenate([[0.0], np.cumsum(point_values)])
+    n_pos = len(point_values)
+    return (cum[np.minimum(ahead + level, n_pos)] - cum[np.minimum(ahead, n_pos)]) / level
+
+
+def skins_points(scores, n_groups):
+    """scores (teams, holes, groups * n) all filled in -> skins points (n, teams), with carryover.
+
+    Teams sit on the outer axis so each hole is a handful of flat, contiguous
+    array ops no matter how many simulations are running.
+    """
+    n_teams, n_holes, width = scores.shape
+    gained = np.zeros((n_teams, width), dtype=np.int32)
+    pot = np.ones(width, dtype=np.int32)
+    for h in range(n_holes):
+        hole = scores[:, h, :]
+        low = hole.min(axis=0)
+        is_low = hole == low
+        won = is_low.sum(axis=0, dtype=np.int8) == 1
+        for t in range(n_teams):
+            gained[t] += np.where(is_low[t] & won, pot, 0)
+        pot = np.where(won, 1, pot + 1)
+    return gained.reshape(n_teams, n_groups, -1).sum(axis=1).T
+
+
+def _simulate_chunk(model, n, seed):
+    """Run n simulations. Returns (win credit per team, total points per team)."""
+    rng = np.random.default_rng(seed)
+    n_teams = len(model['teams'])
+
+    # Day 1 - each team's finishing total is drawn in one go from the exact
+    # distribution of "score so far + all its unplayed holes", then position
+    # points are awarded per format.
+    points = np.zeros((n, n_teams))
+    for fi in range(2):
+        totals = np.empty((n, n_teams))
+        for ti in range(n_teams):
+            cdf = model['day1_total_cdfs'][ti, fi]
+            draw = np.minimum(np.searchsorted(cdf, rng.random(n), side='right'), len(cdf) - 1)
+            totals[:, ti] = model['day1_fixed'][ti, fi] + draw
+        points += position_points(totals, model['point_values'])
+
+    # Day 2 - fill in every missing skins score, then replay with carryover.
+    known = model['day2_known']                      # (groups, holes, teams)
+    n_groups, n_holes, _ = known.shape
+    scores = np.empty((n_teams, n_holes, n_groups, n), dtype=np.int16)
+    scores[...] = known.transpose(2, 1, 0)[..., None]
+    tables = model['day2_tables']
+    for pi in range(len(model['pars'])):
+        g_idx, h_idx, t_idx = np.nonzero((known == 0) & (model['day2_pars'][None, :, None] == model['pars'][pi]))
+        if len(g_idx):
+            draws = rng.integers(0, tables.shape[1], size=(len(g_idx), n), dtype=np.uint16)
+            scores[t_idx, h_idx, g_idx, :] = tables[pi][draws]
+    points += skins_points(scores.reshape(n_teams, n_holes, n_groups * n), n_groups)
+
+    best = points.max(axis=1, keepdims=True)
+    leaders = points == best
+    credit = leaders / leaders.sum(axis=1, keepdims=True)  # shared wins split evenly
+    return credit.sum(axis=0), points.sum(axis=0)
+
+
+def simulate(model, n_sims=100_000, seed=None, workers=1, chunk=DEFAULT_CHUNK):
+    """Win probability + expected final points per team.
+
+    Work is split into chunks (bounded memory) with independent random
+    streams, and spread across a process pool when workers > 1.
+    Returns {team: {'win_prob', 'expected_points'}}.
+    """
+    sizes = [chunk] * (n_sims // chunk) + ([n_sims % chunk] if n_sims % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, [model] * len(sizes), sizes, seeds))
+    else:
+        parts = [_simulate_chunk(model, n, s) for n, s in zip(sizes, seeds)]
+
+    credit = sum(p[0] for p in parts)
+    points = sum(p[1] for p in parts)
+    return {
+        team: {'win_prob': float(credit[i] / n_sims), 'expected_points': float(points[i] / n_sims)}
+        for i, team in enumerate(model['teams'])
+    }